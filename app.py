@@ -48,7 +48,16 @@ class Invaders(GameApp):
 
     Attribute input: user input, used to control the ship or resume the game
     Invariant: input is an instance of GInput (inherited from GameApp)
+
+    Labels are made with the method _getLabel, which keeps every label it
+    makes in LABEL_CACHE. Prompts that are shown for many frames in a row
+    are rendered once, instead of once per frame. The lives and wave
+    counters change too often for that, so they are GBitmapLabels that are
+    made once and only have their text changed.
     """
+    # Class attribute for reusing labels (to avoid rendering text every frame)
+    LABEL_CACHE = {}
+
     # HIDDEN ATTRIBUTES:
     # Attribute _state: the current state of the game represented as an int
     # Invariant: _state is one of STATE_INACTIVE, STATE_NEWWAVE, STATE_ACTIVE,
@@ -79,10 +88,10 @@ class Invaders(GameApp):
     # Invarient: _currentWave is an int > 0
     #
     # Attribut _livesLabel: A text label of the current lives of the player
-    # Invarient: _livesLabel is a GLabel object
+    # Invarient: _livesLabel is a GBitmapLabel object
     #
     # Attribute _waveLabel: A text label of what wave the player is on
-    # Invarient: _waveLabel is a GLabel object
+    # Invarient: _waveLabel is a GBitmapLabel object
     #
     # Attribute _score: The score of the player
     # Invarient: _score is an int >= 0
@@ -101,22 +110,25 @@ class Invaders(GameApp):
         This method should make sure that all of the attributes satisfy the
         given invariants. When done, it sets the _state to STATE_INACTIVE and
         create a message (in attribute _text) saying that the user should press
-        to play a game.
-
+        to play a game. It also sets the game to update TICK_RATE times a
+        second, so the game plays at the same speed at any frame rate.
         """
         self._lastkeys = 0
-        self._text = GLabel(text="Press 's' to start",font_size=50, font_name =\
-                                'Arcade.ttf', x=GAME_WIDTH/2, y=GAME_HEIGHT/2)
+        self._text = self._getLabel("Press 's' to start", 'Arcade.ttf', 50,\
+                                                GAME_WIDTH/2, GAME_HEIGHT/2)
         self._state = STATE_INACTIVE
         self._wave = None
         self._currentWave = 1
         self._lives = SHIP_LIVES
-        self._livesLabel = GLabel(text="Lives: "+ str(self._lives),font_size=\
-                30, font_name = 'Arcade.ttf', x=GAME_WIDTH-60, y=GAME_HEIGHT-80)
-        self._waveLabel = GLabel(text="Wave "+ str(self._currentWave),font_size\
-                =30, font_name = 'Arcade.ttf', x=GAME_WIDTH/2, y=GAME_HEIGHT-80)
+        self._livesLabel = GBitmapLabel(text="Lives: "+ str(self._lives),\
+            font_name='Arcade.ttf', font_size=30, x=GAME_WIDTH-60,\
+                                                        y=GAME_HEIGHT-80)
+        self._waveLabel = GBitmapLabel(text="Wave "+ str(self._currentWave),\
+            font_name='Arcade.ttf', font_size=30, x=GAME_WIDTH/2,\
+                                                        y=GAME_HEIGHT-80)
         self._score = 0
         self._result = ''
+        self.tickrate = TICK_RATE
 
     def update(self,dt):
         """
@@ -166,6 +178,9 @@ class Invaders(GameApp):
         You are allowed to add more states if you wish. Should you do so, you should
         describe them here.
 
+        The game is updated TICK_RATE times a second no matter how fast it is
+        drawn (start sets the tickrate), so dt is always 1/TICK_RATE.
+
         Parameter dt: The time in seconds since last update
         Precondition: dt is a number (int or float)
         """
@@ -180,21 +195,21 @@ class Invaders(GameApp):
             self._wave.update(input = self._input, dt= dt)
             self.selfActiveHelper()
         if self._state == STATE_PAUSED:
-            self._text = GLabel(text="Press 's' to continue",font_size=50,\
-                    font_name = 'Arcade.ttf', x=GAME_WIDTH/2, y=GAME_HEIGHT/2)
+            self._text = self._getLabel("Press 's' to continue", 'Arcade.ttf',\
+                                            50, GAME_WIDTH/2, GAME_HEIGHT/2)
         if self._state == STATE_CONTINUE:
             self._wave.setShip(Ship())
             self._state= STATE_ACTIVE
         if self._state == STATE_COMPLETE:
             if self._result == 'win':
-                self._text = GLabel(text="Press 's' for next wave",font_size=50\
-                ,font_name='TimesBoldItalic.ttf',x=GAME_WIDTH/2,y=GAME_HEIGHT/2)
+                self._text = self._getLabel("Press 's' for next wave",\
+                    'TimesBoldItalic.ttf', 50, GAME_WIDTH/2, GAME_HEIGHT/2)
                 self._score = self._wave.getScore()
                 self._scorelabel = self._wave.getScoreLabel()
             else:
-                self._text = GLabel(text="Game over. Press 's' to play again",\
-                font_size=40,font_name='TimesBoldItalic.ttf',x=GAME_WIDTH/2,\
-                                                            y=GAME_HEIGHT/2)
+                self._text = self._getLabel(\
+                    "Game over. Press 's' to play again", \
+                    'TimesBoldItalic.ttf', 40, GAME_WIDTH/2, GAME_HEIGHT/2)
 
     def selfActiveHelper(self):
         """
@@ -207,18 +222,15 @@ class Invaders(GameApp):
         if self._wave.getShip() == None and self._lives >= 2:
             self._state = STATE_PAUSED
             self._lives = self._lives - 1
-            self._livesLabel = GLabel(text="Lives: "+ str(self._lives),font_size\
-            =30, font_name = 'Arcade.ttf', x=GAME_WIDTH-60, y=GAME_HEIGHT-80)
+            self._livesLabel.text = "Lives: "+ str(self._lives)
         elif self._wave.getShip() == None and self._lives == 1:
             self._state = STATE_COMPLETE
             self._result = 'lose'
-        elif Wave.aliensGone(self._wave.getAliens()) == []:
+        elif self._wave.getAliens().isEmpty():
             self._state = STATE_COMPLETE
             self._result = 'win'
             self._currentWave = self._currentWave + 1
-            self._waveLabel = GLabel(text="Wave "+ str(self._currentWave),\
-                    font_size=30, font_name = 'Arcade.ttf', x=GAME_WIDTH/2,\
-                                                            y=GAME_HEIGHT-80)
+            self._waveLabel.text = "Wave "+ str(self._currentWave)
         elif Wave.aliens_below_line(self._wave.getAliens()):
             self._state = STATE_COMPLETE
             self._result = 'lose'
@@ -242,10 +254,10 @@ class Invaders(GameApp):
             if self._result == 'lose':
                 self._wave.getScoreLabel().draw(self.view)
             if self._state== STATE_INACTIVE:
-                GLabel(text="press 'p' to pause",font_size=30, font_name =\
-                'Arcade.ttf',x=GAME_WIDTH/2,y=GAME_HEIGHT/2-40).draw(self.view)
+                self._getLabel("press 'p' to pause", 'Arcade.ttf', 30, \
+                        GAME_WIDTH/2, GAME_HEIGHT/2-40).draw(self.view)
         if self._state == STATE_ACTIVE:
-            self._wave.draw(self.view)
+            self._wave.draw(self.view, self.alpha)
             self._livesLabel.draw(self.view)
             self._waveLabel.draw(self.view)
             self._wave.getScoreLabel().draw(self.view)
@@ -270,15 +282,9 @@ class Invaders(GameApp):
                     self._currentWave = 1
                     self._lives = SHIP_LIVES
                     self._score = 0
-                    self._wave.setScoreLabel(GLabel(text="Score: " +\
-                     str(self._score),font_size=30, font_name = 'Arcade.ttf',\
-                                                    x=80, y=GAME_HEIGHT - 80))
-                    self._livesLabel = GLabel(text="Lives: "+ str(self._lives),\
-                    font_size=30, font_name = 'Arcade.ttf', x=GAME_WIDTH-60,\
-                                                            y=GAME_HEIGHT-80)
-                    self._waveLabel = GLabel(text="Wave "+\
-                    str(self._currentWave),font_size=30, font_name =\
-                    'Arcade.ttf', x=GAME_WIDTH/2, y=GAME_HEIGHT-80)
+                    self._wave.getScoreLabel().text = "Score: "+ str(self._score)
+                    self._livesLabel.text = "Lives: "+ str(self._lives)
+                    self._waveLabel.text = "Wave "+ str(self._currentWave)
                     self._state= STATE_NEWWAVE
                 elif self._result == 'win':
                     self._state = STATE_NEWWAVE
@@ -287,3 +293,33 @@ class Invaders(GameApp):
             self._state=STATE_PAUSED
 
         self._lastkeys = curr_key
+
+    def _getLabel(self, text, font_name, font_size, x, y):
+        """
+        Returns a label with the given text, font and position
+
+        Labels are kept in LABEL_CACHE, keyed by (text, font_name, font_size,
+        (x, y)). If a matching label was made before, that label is returned
+        and no text is rendered. Labels from the cache are shared, so they
+        must not be changed.
+
+        Parameter text: the text of the label
+        Precondition: text is a string
+
+        Parameter font_name: the font file of the label
+        Precondition: font_name is a string naming a file in Fonts
+
+        Parameter font_size: the size of the font in points
+        Precondition: font_size is an int or float > 0
+
+        Parameter x: the x-coordinate of the center of the label
+        Precondition: x is an int or float
+
+        Parameter y: the y-coordinate of the center of the label
+        Precondition: y is an int or float
+        """
+        key = (text, font_name, font_size, (x, y))
+        if not key in Invaders.LABEL_CACHE:
+            Invaders.LABEL_CACHE[key] = GLabel(text=text, font_name=font_name,\
+                                            font_size=font_size, x=x, y=y)
+        return Invaders.LABEL_CACHE[key]
@@ -0,0 +1,232 @@
+"""
+Benchmarks for Alien Invaders
+
+This module times the hot paths of a Wave: the initializer, update, and draw.
+Each scenario builds a Wave in a particular situation and times every frame
+of a scripted run. Drawing goes to a NullView, which accepts the graphics
+instructions but never renders them, so draw measures the cost of building
+and handing over the instructions and not the speed of the GPU.
+
+The results are printed as JSON, with the mean, p50, p99 and max of the
+per-call times (in milliseconds) for each scenario. Save the output of two
+builds and compare them to catch a slow down before it ships.
+
+Like simulate.py, this needs a hidden Kivy window for the textures. Run it
+from the command line like the game itself
+
+    python benchmark.py 5 12 1.0 600
+
+The first three arguments are handled by consts.py and only change the
+'full', 'cleared' and 'storm' scenarios. The fourth argument is the number
+of frames to time in each scenario.
+"""
+from simulate import *
+from simulate import _setpaths
+import json
+import random
+import time
+import numpy as np
+
+
+# The default number of frames to time in each scenario
+BENCH_FRAMES = 600
+# The number of Waves to create when timing the initializer
+BENCH_INITS  = 20
+# The random seed for each scenario, so every build plays the same game
+BENCH_SEED   = 1
+# The number of alien bolts to keep on screen in the bolt storm
+BENCH_STORM  = 200
+# The grids (rows, aliens per row) to time, including some past the limits
+# that consts.py allows on the command line
+BENCH_GRIDS  = ((1,1), (3,4), (5,12), (10,15), (12,20), (15,30))
+# The key script with no firing, so the formation stays whole
+BENCH_IDLE   = ((('right',),)*40) + ((('left',),)*40)
+
+
+class NullView(object):
+    """
+    A stand-in for GView that throws away everything drawn to it.
+
+    GObject.draw only calls the draw method of its view, so that is the only
+    method this class needs (besides clear, to match GameApp._refresh).
+    """
+    # HIDDEN ATTRIBUTES:
+    # Attribute _count: the number of instructions drawn since the last clear
+    # Invariant: _count is an int >= 0
+
+    def __init__(self):
+        """
+        Initializes an empty view
+        """
+        self._count = 0
+
+    def getCount(self):
+        """
+        returns the number of instructions drawn since the last clear
+        """
+        return self._count
+
+    def draw(self, cmd):
+        """
+        Accepts a Kivy graphics instruction and ignores it
+
+        Parameter cmd: the instruction to draw
+        Precondition: cmd is a Kivy graphics instruction
+        """
+        self._count = self._count + 1
+
+    def clear(self):
+        """
+        Forgets everything drawn so far
+        """
+        self._count = 0
+
+
+def _stats(times):
+    """
+    Returns a dictionary with the mean, p50, p99 and max of times, in ms
+
+    Parameter times: the measured times in seconds
+    Precondition: times is a non-empty list of floats
+    """
+    ms = np.array(times)*1000
+    return {'mean': float(ms.mean()), 'p50': float(np.percentile(ms, 50)),
+            'p99': float(np.percentile(ms, 99)), 'max': float(ms.max())}
+
+
+def _newWave(rows, cols):
+    """
+    Returns a new first Wave with the given grid of aliens
+
+    Parameter rows: the number of rows of aliens
+    Precondition: rows is an int > 0
+
+    Parameter cols: the number of aliens in each row
+    Precondition: cols is an int > 0
+    """
+    return Wave(waveNumber = 1, lives = SHIP_LIVES, score = 0, rows = rows, \
+                                                                cols = cols)
+
+
+def _clear(wave):
+    """
+    Kills every alien in wave except the one in row 0, collumn 0
+
+    Parameter wave: the wave to clear
+    Precondition: wave is a Wave object
+    """
+    formation = wave.getAliens()
+    for row in range(formation.getRows()):
+        for col in range(formation.getCols()):
+            if row != 0 or col != 0:
+                formation.kill(row, col)
+
+
+def _storm(wave):
+    """
+    Fires alien bolts from random places at the top of the screen until
+    there are BENCH_STORM bolts on screen
+
+    Parameter wave: the wave to fire in
+    Precondition: wave is a Wave object
+    """
+    bolts = wave.getBolts()
+    while bolts.count(BOLT_ALIEN) < BENCH_STORM:
+        x = random.uniform(BOLT_WIDTH, GAME_WIDTH-BOLT_WIDTH)
+        y = random.uniform(DEFENSE_LINE, GAME_HEIGHT)
+        bolts.fire(x, y, -BOLT_SPEED, BOLT_ALIEN)
+
+
+def run(rows, cols, frames=BENCH_FRAMES, script=SIM_SCRIPT, setup=None,
+                                                            refill=None):
+    """
+    Returns a dictionary of timing statistics for one scenario
+
+    The dictionary has the keys 'init', 'update' and 'draw', and each value
+    is a dictionary from _stats. It also has the key 'instructions', the
+    average number of instructions drawn per frame.
+
+    Parameter rows: the number of rows of aliens
+    Precondition: rows is an int > 0
+
+    Parameter cols: the number of aliens in each row
+    Precondition: cols is an int > 0
+
+    Parameter frames: the number of frames to time
+    Precondition: frames is an int > 0
+
+    Parameter script: the key states for each frame
+    Precondition: script is a non-empty sequence of tuples of strings
+
+    Parameter setup: a function called on the new wave before timing
+    Precondition: setup is None or a function taking a Wave
+
+    Parameter refill: a function called on the wave before each frame
+    Precondition: refill is None or a function taking a Wave
+    """
+    assert type(frames) == int and frames > 0, repr(frames)+' is not valid'
+    random.seed(BENCH_SEED)
+    inits = []
+    for i in range(BENCH_INITS):
+        start = time.perf_counter()
+        wave = _newWave(rows, cols)
+        inits.append(time.perf_counter() - start)
+    if setup != None:
+        setup(wave)
+
+    input = ScriptedInput(script)
+    view = NullView()
+    updates = []
+    draws = []
+    drawn = 0
+    for frame in range(frames):
+        if refill != None:
+            refill(wave)
+        start = time.perf_counter()
+        wave.update(input = input, dt = SIM_DT)
+        updates.append(time.perf_counter() - start)
+        input.advance()
+        if wave.getShip() == None:
+            wave.setShip(Ship())
+        view.clear()
+        start = time.perf_counter()
+        wave.draw(view)
+        draws.append(time.perf_counter() - start)
+        drawn = drawn + view.getCount()
+
+    return {'init': _stats(inits), 'update': _stats(updates),
+            'draw': _stats(draws), 'instructions': drawn/frames}
+
+
+def benchmark(frames=BENCH_FRAMES):
+    """
+    Returns a dictionary of timing statistics for every scenario
+
+    The scenarios are 'full' (a whole formation with no player fire),
+    'cleared' (one alien left), 'storm' (BENCH_STORM alien bolts on screen)
+    and 'grid RxC' for each grid in BENCH_GRIDS. Each value is a dictionary
+    from run.
+
+    Parameter frames: the number of frames to time in each scenario
+    Precondition: frames is an int > 0
+    """
+    _setpaths()
+    results = {}
+    results['full'] = run(ALIEN_ROWS, ALIENS_IN_ROW, frames, BENCH_IDLE)
+    results['cleared'] = run(ALIEN_ROWS, ALIENS_IN_ROW, frames, \
+                                                            setup = _clear)
+    results['storm'] = run(ALIEN_ROWS, ALIENS_IN_ROW, frames, BENCH_IDLE, \
+                                                            refill = _storm)
+    for (rows, cols) in BENCH_GRIDS:
+        results['grid %dx%d' % (rows, cols)] = run(rows, cols, frames)
+    return results
+
+
+# Application code
+if __name__ == '__main__':
+    import sys
+    try:
+        frames = int(sys.argv[4])
+    except:
+        frames = BENCH_FRAMES # Use default value
+    print(json.dumps(benchmark(frames), indent=2, sort_keys=True))
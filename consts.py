@@ -27,7 +27,7 @@ SHIP_WIDTH    = 44
 SHIP_HEIGHT   = 44
 # the distance of the (bottom of the) ship from the bottom
 SHIP_BOTTOM   = 32
-# The number of pixels to move the ship per update
+# The number of pixels to move the ship per update (at MOVE_RATE updates/sec)
 SHIP_MOVEMENT = 5
 # The image file to use for the ship
 SHIP_IMAGE    = 'ship.png'
@@ -71,7 +71,7 @@ ALIEN_SPEED = 1.0
 BOLT_WIDTH  = 4
 # the height of a laser bolt
 BOLT_HEIGHT = 16
-# the number of pixels to move the bolt per update
+# the number of pixels to move the bolt per update (at MOVE_RATE updates/sec)
 BOLT_SPEED  = 10
 # the number of ALIEN STEPS (not frames) between bolts
 BOLT_RATE   = 5
@@ -125,3 +125,20 @@ except:
     pass # Use original value
 
 ### ADD MORE CONSTANTS (PROPERLY COMMENTED) AS NECESSARY ###
+
+# the size of a cell in the spatial hash used for bolt-alien collisions
+ALIEN_CELL = ALIEN_WIDTH+ALIEN_H_SEP
+# the largest number of unused bolts to keep for recycling
+BOLT_POOL_CAP = 64
+# the owner of a bolt fired by the ship
+BOLT_PLAYER = 0
+# the owner of a bolt fired by an alien
+BOLT_ALIEN  = 1
+# the fill color of a bolt, by owner
+BOLT_COLORS = ('blue','red')
+# the number of bolts a BoltArray has room for before it grows
+BOLT_CAPACITY = 16
+# the number of fixed simulation steps per second
+TICK_RATE = 120
+# the frame rate that SHIP_MOVEMENT and BOLT_SPEED were tuned for
+MOVE_RATE = 60
@@ -11,7 +11,12 @@ from .gobject import GObject, GScene
 from .grectangle import GRectangle, GEllipse, GImage, GLabel
 from .gsprite import GSprite
 from .gtile import GTile
+from .gbatch import GBatch
+from .gtext import GlyphAtlas, GBitmapLabel
 from .gpath import GPath, GTriangle, GPolygon
 from .gview import GInput, GView
+from .spatial import SpatialHash, AABBTree
+from .timing import FrameTimer
+from .atlas import TextureAtlas
 from .sound import Sound, SoundLibrary
 from .app import GameApp
\ No newline at end of file
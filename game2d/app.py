@@ -23,6 +23,8 @@ import traceback
 import os.path
 import json
 import sys
+import weakref
+from collections import OrderedDict
 
 # Pull off the band aid
 import numpy as np
@@ -46,8 +48,29 @@ class GameApp(kivy.app.App):
     :meth:`draw`: This method draws all of the objects to the screen.  The only 
     thing you should have in this method are calls to ``self.view.draw()``.
     """
-    # Class attribute for tracking textures (to reduce memory footprint)
-    TEXTURE_CACHE = {}
+    # Class attribute for tracking textures (to reduce memory footprint), oldest use first
+    TEXTURE_CACHE = OrderedDict()
+    
+    # The size in bytes of each texture in the cache
+    TEXTURE_BYTES = {}
+    
+    # The most bytes of textures to cache before unused ones are evicted (None for no limit)
+    TEXTURE_BUDGET = 128*1024*1024
+    
+    # The number of cache hits, misses and evictions, and the bytes cached so far
+    TEXTURE_STATS = {'hits': 0, 'misses': 0, 'evictions': 0, 'bytes': 0}
+    
+    # The file name of the texture each object draws, keyed by object (held weakly)
+    TEXTURE_USERS = weakref.WeakKeyDictionary()
+    
+    # Class attribute for the atlas of the Images folder (to reduce texture switches)
+    ATLAS = None
+    
+    # The width and height of each atlas page
+    ATLAS_SIZE = 1024
+    
+    # The most fixed steps to take in one frame before dropping time
+    MAX_TICKS = 8
     
     
     # MUTABLE ATTRIBUTES
@@ -72,8 +95,73 @@ class GameApp(kivy.app.App):
         self._fps = value
         Clock.schedule_interval(self._refresh,1.0/self._fps)
     
+    @property
+    def tickrate(self):
+        """
+        The number of fixed update steps per second, or None for variable steps
+        
+        If this value is None (the default), :meth:`update` is called once per animation
+        frame with the actual time since the last frame.  Otherwise, the game is updated
+        at this fixed rate no matter how fast it is drawn.  The time since the last frame
+        is added to an accumulator, and :meth:`update` is called with ``1/tickrate`` for
+        each whole step in the accumulator.  So a game ticking at 120 Hz updates twice
+        per frame at 60 FPS, and four times per frame at 30 FPS.
+        
+        To keep a slow machine from falling further and further behind, at most
+        ``MAX_TICKS`` steps are taken in a single frame.  Any time beyond that is dropped
+        and the game slows down instead.
+        
+        **Invariant**: Must be None or an int or float > 0.
+        """
+        return self._tickrate
+    
+    @tickrate.setter
+    def tickrate(self,value):
+        assert value is None or type(value) in [int,float], 'value %s is not a number' % repr(value)
+        assert value is None or value > 0, 'value %s is not positive' % repr(value)
+        self._tickrate = value
+        self._accumulator = 0.0
+        self._alpha = 1.0
+    
+    @property
+    def timer(self):
+        """
+        The frame timer recording where the time goes in each frame, or None
+        
+        Timing is off by default.  To turn it on, set this attribute to a new
+        :class:`FrameTimer`.  The timer then records the duration of each phase of every
+        frame (clearing the view, updating and drawing), along with the ``dt``, the number
+        of updates and the number of commands drawn.  See :class:`FrameTimer` for how to
+        read the results, or how to log them every so many frames.
+        
+        **Invariant**: Must be None or an instance of :class:`FrameTimer`.
+        """
+        return self._timer
+    
+    @timer.setter
+    def timer(self,value):
+        from .timing import FrameTimer
+        assert value is None or isinstance(value,FrameTimer), '%s is not a FrameTimer' % repr(value)
+        self._timer = value
+    
     
     # IMMUTABLE PROPERTIES
+    @property
+    def alpha(self):
+        """
+        The fraction of a fixed step that has passed since the last update
+        
+        When :attr:`tickrate` is not None, the game is usually drawn part of the way
+        between two updates.  Use this value to draw moving objects the same fraction
+        of the way between their positions at the last two updates.  That way the
+        animation is smooth even if the game is drawn less often than it is updated.
+        
+        If :attr:`tickrate` is None, this value is always 1.
+        
+        **Invariant**: Must be a float >= 0 and < 1, or 1.
+        """
+        return self._alpha
+    
     @property
     def width(self):
         """
@@ -192,32 +280,63 @@ class GameApp(kivy.app.App):
         return os.path.exists(os.path.join(cls.json,name))
     
     @classmethod
-    def load_texture(cls,name):
+    def load_texture(cls,name,atlas=True,user=None):
         """
         Returns: The texture for the given file name, or None if it cannot be loaded
         
-        The ``name`` must refer to the file in the **Images** folder.  If the texture
-        has already been loaded, it will return the cached texture.  Otherwise, it will
-        load the texture and cache it before returning it.
+        The ``name`` must refer to the file in the **Images** folder.  If the image is
+        in the atlas (see :meth:`build_atlas`), it will return the region of the atlas
+        holding the image.  If the texture has already been loaded, it will return the 
+        cached texture.  Otherwise, it will load the texture and cache it before 
+        returning it.
+        
+        The cache is a least-recently-used cache with a budget of ``TEXTURE_BUDGET``
+        bytes.  When a new texture puts it over budget, it evicts the textures that
+        have gone unused the longest, as long as no object still uses them (see
+        :meth:`trim_textures`).  An object uses a texture if it loaded it with itself
+        as ``user``.  Each object uses one texture at a time, so loading another one
+        with the same ``user`` stops it from using the first.
+        
+        An atlas region cannot be repeated with ``wrap``.  If you need to do that, set
+        ``atlas`` to False to always get a separate texture.
         
         This method will crash if name is not a valid file.
         
         :param name: The file name
         :type name:  ``str``
+        
+        :param atlas: Whether to return a region of the atlas when possible
+        :type atlas:  ``bool``
+        
+        :param user: The object that will draw the texture, if any
+        :type user:  :class:`GObject` or ``None``
         """
         assert cls.is_image(name), '%s is not an image file' % repr(name)
+        if not user is None:
+            cls.TEXTURE_USERS[user] = name
+        if atlas and not cls.ATLAS is None and name in cls.ATLAS:
+            return cls.ATLAS.get(name)
         if name in cls.TEXTURE_CACHE:
+            cls.TEXTURE_CACHE.move_to_end(name)
+            cls.TEXTURE_STATS['hits'] += 1
             return cls.TEXTURE_CACHE[name]
         
+        cls.TEXTURE_STATS['misses'] += 1
         try:
             from kivy.core.image import Image
-            image = Image(name)
-            image.mipmaps = True
+            # Skip the Kivy cache, as it would keep every texture alive
+            image = Image(name,nocache=True)
             texture = image.texture
-            cls.TEXTURE_CACHE[name] = texture
         except:
-            texture = None
+            return None
         
+        size = texture.width*texture.height*4
+        if texture.mipmap:
+            size = size*4//3
+        cls.TEXTURE_CACHE[name] = texture
+        cls.TEXTURE_BYTES[name] = size
+        cls.TEXTURE_STATS['bytes'] += size
+        cls.trim_textures()
         return texture
     
     @classmethod
@@ -234,12 +353,80 @@ class GameApp(kivy.app.App):
         """
         assert type(name) == str, '%s is not a valid texture name' % repr(name)
         if name in cls.TEXTURE_CACHE:
-            texture = cls.TEXTURE_CACHE[name]
-            del cls.TEXTURE_CACHE[name]
+            texture = cls.TEXTURE_CACHE.pop(name)
+            cls.TEXTURE_STATS['bytes'] -= cls.TEXTURE_BYTES.pop(name)
             return texture
         
         return None
     
+    @classmethod
+    def trim_textures(cls,budget=None):
+        """
+        Evicts unused textures from the cache until it fits in the budget.
+        
+        Textures are evicted oldest use first.  A texture is only evicted if no object
+        uses it, according to ``TEXTURE_USERS`` (see :meth:`load_texture`).  The game2d
+        objects that draw images (like :class:`GImage`, :class:`GSprite` and
+        :class:`GTile`) register themselves, and they stop counting once they are
+        garbage collected.  Textures in use are skipped, so the cache can stay over
+        budget while they are in use.  The texture used most recently is never evicted.
+        This method is called for you whenever a texture is loaded, but you may want to
+        call it after dropping a lot of objects, like when changing levels.
+        
+        If you load a texture without a ``user`` and keep it in your own attribute, the
+        cache does not know about it.  Evicting it does not break your copy, but the
+        next :meth:`load_texture` loads a second copy.
+        
+        :param budget: The most bytes to keep, or None to use ``TEXTURE_BUDGET``
+        :type budget:  ``int`` >= 0 or ``None``
+        """
+        if budget is None:
+            budget = cls.TEXTURE_BUDGET
+        if budget is None:
+            return
+        used = set(cls.TEXTURE_USERS.values())
+        for name in list(cls.TEXTURE_CACHE)[:-1]:
+            if cls.TEXTURE_STATS['bytes'] <= budget:
+                return
+            if not name in used:
+                cls.unload_texture(name)
+                cls.TEXTURE_STATS['evictions'] += 1
+    
+    @classmethod
+    def texture_stats(cls):
+        """
+        Returns: A dictionary of statistics about the texture cache
+        
+        The keys are ``'hits'``, ``'misses'`` and ``'evictions'`` (counted since the
+        game started), ``'bytes'`` and ``'textures'`` (the size of the cache now), and 
+        ``'budget'`` (the current ``TEXTURE_BUDGET``).  Textures from the atlas are
+        not part of the cache, so they do not count as hits.
+        """
+        result = dict(cls.TEXTURE_STATS)
+        result['textures'] = len(cls.TEXTURE_CACHE)
+        result['budget'] = cls.TEXTURE_BUDGET
+        return result
+    
+    @classmethod
+    def build_atlas(cls):
+        """
+        Returns: The atlas of every image in the **Images** folder
+        
+        This method packs all of the images into one or a few large textures, so that
+        drawing them does not need to switch textures.  Once the atlas is built,
+        :meth:`load_texture` returns regions of it instead of separate textures.  The
+        game builds the atlas for you when it starts, unless you turn it off with the 
+        ``atlas`` keyword when you create it.
+        
+        Images that are bigger than ``ATLAS_SIZE`` are left out and still load as 
+        separate textures.
+        """
+        from .atlas import TextureAtlas
+        names = sorted(name for name in os.listdir(cls.images) 
+                       if os.path.splitext(name)[1].lower() in ['.png','.jpg','.jpeg','.bmp','.gif'])
+        GameApp.ATLAS = TextureAtlas.from_files(cls.images,names,cls.ATLAS_SIZE)
+        return GameApp.ATLAS
+    
     @classmethod
     def load_json(cls,name):
         """
@@ -295,11 +482,17 @@ class GameApp(kivy.app.App):
         w = keywords.pop('width', 0.0)
         h = keywords.pop('height', 0.0)
         f = keywords.pop('fps', 60.0)
+        t = keywords.pop('tickrate', None)
+        self.timer = keywords.pop('timer', None)
+        a = keywords.pop('atlas', True)
 
         assert type(w) in [int,float], 'width %s is not a number' % repr(w)
         assert type(h) in [int,float], 'height %s is not a number' % repr(h)
         assert type(f) in [int,float], 'fps %s is not a number' % repr(value)
         assert f > 0, 'fps %s is not positive' % repr(value)
+        assert t is None or type(t) in [int,float], 'tickrate %s is not a number' % repr(t)
+        assert t is None or t > 0, 'tickrate %s is not positive' % repr(t)
+        assert type(a) == bool, 'atlas %s is not a bool' % repr(a)
         
         self._gwidth = w
         self._gheight = h
@@ -307,6 +500,8 @@ class GameApp(kivy.app.App):
         Window.bind(on_request_close=self._exit)
         
         self._fps = f
+        self.tickrate = t
+        self._atlas = a
         
         x = keywords.pop('left', None)
         y = keywords.pop('top', None)
@@ -392,7 +587,8 @@ class GameApp(kivy.app.App):
         
         This method is called 60x a second (depending on the ``fps``) to provide on-screen 
         animation. Any code that moves objects or processes user input (keyboard or mouse)
-        goes in this method.
+        goes in this method.  If :attr:`tickrate` is set, it is instead called that many
+        times a second, with ``dt`` always equal to ``1/tickrate``.
         
         Think of this method as the body of the loop.  You will need to add attributes
         that represent the current animation state, so that they can persist across
@@ -433,6 +629,8 @@ class GameApp(kivy.app.App):
             Clock.schedule_interval(self._refresh,1.0/self.fps)
         else:
             Clock.schedule_interval(self._refresh,0)
+        if self._atlas and GameApp.ATLAS is None:
+            self.build_atlas()
         self.start()
     
     def _refresh(self,dt):
@@ -441,15 +639,54 @@ class GameApp(kivy.app.App):
         
         This method a callback-proxy for the methods `update` and `draw`.  It handles
         important issues behind the scenes, particularly with clearing the window.
+        If :attr:`tickrate` is set, it calls `update` once for every fixed step in the
+        accumulator (possibly not at all) before drawing.
         
         :param dt: time in seconds since last update
         :type dt:  ``int`` or ``float``
         """
+        timer = self._timer
+        if not timer is None:
+            timer.begin(dt)
         self.view.clear()
+        if not timer is None:
+            timer.lap('clear')
+        ticks = 0
+        if self._tickrate is None:
+            self._step(dt,timer)
+            ticks = 1
+        else:
+            step = 1.0/self._tickrate
+            self._accumulator = min(self._accumulator+dt,step*self.MAX_TICKS)
+            while self._accumulator >= step:
+                self._step(step,timer)
+                self._accumulator -= step
+                ticks += 1
+            self._alpha = self._accumulator/step
+        self.draw()
+        if not timer is None:
+            timer.lap('draw')
+            timer.end(self.view.count,ticks)
+    
+    def _step(self,dt,timer):
+        """
+        Processes the input and calls `update` once.
+        
+        :param dt: time in seconds to update by
+        :type dt:  ``int`` or ``float``
+        
+        :param timer: the timer to lap after each phase
+        :type timer:  :class:`FrameTimer` or None
+        """
         self.input._prestep()
+        if not timer is None:
+            timer.lap('prestep')
         self.update(dt)
+        if not timer is None:
+            timer.lap('update')
         self.input._poststep()
-        self.draw()
+        if not timer is None:
+            timer.lap('poststep')
     
     def _setpaths(self):
         """
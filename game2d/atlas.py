@@ -0,0 +1,255 @@
+"""
+Texture atlases for 2D game support.
+
+This module provides a class for packing many small images into a few large textures.
+Drawing from one texture is much faster than switching between many of them, and this
+matters most on software OpenGL drivers.  You should never need this class directly;
+:class:`GameApp` builds an atlas of the **Images** folder when the game starts, and
+:meth:`GameApp.load_texture` hands out regions of it in place of separate textures.
+"""
+import os.path
+import numpy as np
+from kivy.graphics.texture import Texture
+from kivy.logger import Logger
+
+
+class TextureAtlas(object):
+    """
+    A class representing a set of images packed into a few square textures (pages).
+
+    The images are packed with a simple shelf algorithm: they are sorted from tallest
+    to shortest and placed left to right in rows (shelves).  When a page is full, a new
+    page is started.  Images too big to fit on a page are left out, and should be
+    loaded as separate textures.
+
+    Each image is surrounded by a border of ``padding`` pixels copied from its edge.
+    This keeps texture filtering from blending in pixels from the image next door.
+
+    The regions handed out by :meth:`get` are Kivy ``TextureRegion`` objects.  They
+    behave like textures in every way except one: a region cannot be repeated with
+    ``wrap``, since its texture coordinates do not start at 0 and end at 1.
+    """
+    # The pixel formats we know how to convert to rgba, and the order of their channels
+    FORMATS = {'rgba': (0,1,2,3), 'bgra': (2,1,0,3), 'rgb': (0,1,2), 'bgr': (2,1,0)}
+
+    # IMMUTABLE PROPERTIES
+    @property
+    def size(self):
+        """
+        The width and height of each page.
+
+        **Invariant**: Must be an ``int`` > 0
+        """
+        return self._size
+
+    @property
+    def padding(self):
+        """
+        The number of border pixels around each image.
+
+        **Invariant**: Must be an ``int`` >= 0
+        """
+        return self._padding
+
+    @property
+    def pages(self):
+        """
+        The textures holding the packed images.
+
+        **Invariant**: Must be a ``tuple`` of Kivy textures
+        """
+        return tuple(self._pages)
+
+    @property
+    def names(self):
+        """
+        The names of the packed images.
+
+        **Invariant**: Must be a ``tuple`` of ``str``
+        """
+        return tuple(self._regions.keys())
+
+
+    # CLASS METHODS
+    @classmethod
+    def from_files(cls,directory,names,size=1024,padding=2):
+        """
+        Returns a new atlas of the given image files.
+
+        Files that cannot be loaded or are in an unsupported pixel format are skipped.
+
+        :param directory: the folder containing the images
+        :type directory:  ``str``
+
+        :param names: the file names of the images to pack
+        :type names:  iterable of ``str``
+
+        :param size: the width and height of each page
+        :type size:  ``int`` > 0
+
+        :param padding: the number of border pixels around each image
+        :type padding:  ``int`` >= 0
+        """
+        images = []
+        for name in names:
+            pixels = cls._load(os.path.join(directory,name))
+            if not pixels is None:
+                images.append((name,pixels))
+        return cls(images,size,padding)
+
+
+    # BUILT-IN METHODS
+    def __init__(self,images,size=1024,padding=2):
+        """
+        Creates a new atlas from the given images.
+
+        Each image is a name and an array of rgba pixels with shape (height, width, 4),
+        top row first.  Images that are too big for a page are skipped.
+
+        :param images: the images to pack
+        :type images:  iterable of (``str``, ``numpy.ndarray``) pairs
+
+        :param size: the width and height of each page
+        :type size:  ``int`` > 0
+
+        :param padding: the number of border pixels around each image
+        :type padding:  ``int`` >= 0
+        """
+        assert type(size) == int and size > 0, '%s is not a valid size' % repr(size)
+        assert type(padding) == int and padding >= 0, '%s is not a valid padding' % repr(padding)
+        self._size = size
+        self._padding = padding
+        self._pages = []
+        self._regions = {}
+
+        fits = []
+        for (name,pixels) in images:
+            if max(pixels.shape[0],pixels.shape[1])+2*padding > size:
+                Logger.info('TextureAtlas: %s is too big for the atlas.' % repr(name))
+                continue
+            fits.append((name,pixels))
+        self._pack(fits)
+
+    def __len__(self):
+        """
+        :return: The number of images in this atlas.
+        :rtype:  ``int``
+        """
+        return len(self._regions)
+
+    def __contains__(self,name):
+        """
+        :return: True if the image ``name`` is in this atlas.
+        :rtype:  ``bool``
+        """
+        return name in self._regions
+
+
+    # PUBLIC METHODS
+    def get(self,name):
+        """
+        Returns the texture region for the given image, or None if it is not packed.
+
+        :param name: the file name of the image
+        :type name:  ``str``
+
+        :return: the texture region for the image
+        :rtype:  ``TextureRegion`` or ``None``
+        """
+        return self._regions.get(name)
+
+
+    # HIDDEN METHODS
+    @classmethod
+    def _load(cls,path):
+        """
+        Returns the pixels of the given image as an rgba array, top row first
+
+        The array has shape (height, width, 4).  If the image cannot be loaded or has
+        an unsupported format, this returns None.
+        """
+        try:
+            from kivy.core.image import ImageLoader
+            data = ImageLoader.load(path,keep_data=True)._data[0]
+        except:
+            Logger.info('TextureAtlas: Could not load %s.' % repr(path))
+            return None
+
+        if not data.fmt in cls.FORMATS:
+            Logger.info('TextureAtlas: Unsupported format %s for %s.' % (repr(data.fmt),repr(path)))
+            return None
+
+        order = cls.FORMATS[data.fmt]
+        channels = len(order)
+        width  = data.width
+        height = data.height
+        stride = data.rowlength if data.rowlength else width*channels
+        pixels = np.frombuffer(data.data,dtype=np.uint8)[:stride*height]
+        pixels = pixels.reshape(height,stride)[:,:width*channels]
+        pixels = pixels.reshape(height,width,channels)[:,:,order]
+        if channels == 3:
+            alpha = np.full((height,width,1),255,dtype=np.uint8)
+            pixels = np.concatenate((pixels,alpha),axis=2)
+        if not data.flip_vertical:
+            pixels = pixels[::-1]
+        return pixels
+
+    def _pack(self,images):
+        """
+        Packs the images onto as many pages as needed and makes their regions
+
+        :param images: the images to pack
+        :type images:  list of (name, pixel array) pairs
+        """
+        pad  = self._padding
+        size = self._size
+        images.sort(key=lambda item: -item[1].shape[0])
+
+        buffer = None
+        placed = []
+        left = top = shelf = 0
+        for (name,pixels) in images:
+            height = pixels.shape[0]+2*pad
+            width  = pixels.shape[1]+2*pad
+            if buffer is not None and left+width > size:
+                left = 0
+                top += shelf
+                shelf = 0
+            if buffer is not None and top+height > size:
+                self._flush(buffer,placed)
+                buffer = None
+            if buffer is None:
+                buffer = np.zeros((size,size,4),dtype=np.uint8)
+                placed = []
+                left = top = shelf = 0
+            if pad > 0:
+                block = np.pad(pixels,((pad,pad),(pad,pad),(0,0)),mode='edge')
+            else:
+                block = pixels
+            buffer[top:top+height,left:left+width] = block
+            placed.append((name,left+pad,top+pad,pixels.shape[1],pixels.shape[0]))
+            left += width
+            shelf = max(shelf,height)
+        if buffer is not None:
+            self._flush(buffer,placed)
+
+    def _flush(self,buffer,placed):
+        """
+        Turns a full page buffer into a texture and makes the regions on it
+
+        The buffer is stored top row first, like a loaded image.  So the page texture
+        is flipped, and the regions are measured from the bottom of the page.
+
+        :param buffer: the page pixels, top row first
+        :type buffer:  ``numpy.ndarray`` of shape (size, size, 4)
+
+        :param placed: the images on the page
+        :type placed:  list of (name, left, top, width, height) tuples
+        """
+        size = self._size
+        page = Texture.create(size=(size,size),colorfmt='rgba')
+        page.blit_buffer(buffer.tobytes(),colorfmt='rgba',bufferfmt='ubyte')
+        page.flip_vertical()
+        self._pages.append(page)
+        for (name,left,top,width,height) in placed:
+            self._regions[name] = page.get_region(left,size-top-height,width,height)
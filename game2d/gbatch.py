@@ -0,0 +1,252 @@
+"""
+A module to support batched sprites.
+
+A batch is a collection of copies of one image, drawn as a single mesh.  It is useful
+when you have many objects that look the same, like the enemies in a formation.  One
+batch of N images costs the same to draw as one image, while N separate ``GImage``
+objects cost N times as much.
+"""
+from kivy.graphics import *
+from kivy.graphics.instructions import *
+import numpy as np
+from .gobject import GObject, shared_color
+from .app import GameApp
+
+
+class GBatch(GObject):
+    """
+    An class representing many copies of an image, drawn together.
+
+    Each copy is a quad (a rectangle) of size ``quadsize`` centered at one of the
+    ``positions``.  The positions are relative to the batch, so moving, rotating or
+    scaling the batch moves all of the quads at once.  All of the quads are stored in
+    a single Kivy ``Mesh`` sharing one texture, so the whole batch is one draw call.
+
+    Changing ``positions`` or ``mask`` rewrites the vertices of the mesh in place.
+    It does not rebuild the drawing cache, so a batch inside a :class:`GScene` does
+    not need the scene to be rebuilt either.
+
+    The attributes ``width`` and ``height`` are read-only.  As in :class:`GScene`, they
+    are the size of the smallest box centered at (x,y) that contains every quad.
+
+    A mesh can hold at most 65535 vertices, so a batch can have at most ``MAX_QUADS``
+    quads.
+    """
+    # The most quads that fit in one Kivy Mesh (4 vertices each)
+    MAX_QUADS = 65535//4
+
+    # MUTABLE PROPERTIES
+    @property
+    def source(self):
+        """
+        The source file for the image.
+
+        **invariant**. Value be a string refering to a valid file.
+        """
+        return self._source
+
+    @source.setter
+    def source(self,value):
+        assert value is None or GameApp.is_image(value), '%s is not an image file' % repr(value)
+        self._source = value
+        if self._defined:
+            self._invalidate()
+
+    @property
+    def positions(self):
+        """
+        The center of each quad, relative to the batch.
+
+        The value is a copy; changing it will not change the batch.  Assign a new array
+        to move the quads.
+
+        **invariant**: Value must be a float ``numpy`` array of shape (n,2), where n is
+        at most ``MAX_QUADS``.
+        """
+        return self._positions.copy()
+
+    @positions.setter
+    def positions(self,value):
+        value = np.array(value,dtype=float).reshape(-1,2)
+        assert len(value) <= self.MAX_QUADS, '%s has too many quads' % repr(value)
+        self._positions = value
+        if len(self._mask) != len(value):
+            self._mask = np.ones(len(value),dtype=bool)
+        if self._defined:
+            self._update()
+            self._moved()
+
+    @property
+    def mask(self):
+        """
+        Which quads are drawn.
+
+        Quad i is only drawn if ``mask[i]`` is True.  The value is a copy; changing it
+        will not change the batch.  Assign a new array to show or hide quads.
+
+        **invariant**: Value must be a ``bool`` ``numpy`` array with one entry for each
+        position.
+        """
+        return self._mask.copy()
+
+    @mask.setter
+    def mask(self,value):
+        value = np.array(value,dtype=bool).reshape(-1)
+        assert len(value) == len(self._positions), '%s does not match the positions' % repr(value)
+        self._mask = value
+        if self._defined:
+            self._update()
+            self._moved()
+
+    @property
+    def quadsize(self):
+        """
+        The width and height of each quad.
+
+        If this is None, each quad is the size of the image.
+
+        **invariant**: Value must be None or a pair of numbers > 0
+        """
+        return self._quadsize
+
+    @quadsize.setter
+    def quadsize(self,value):
+        assert value is None or (len(value) == 2 and
+               all(type(v) in [int,float] and v > 0 for v in value)), '%s is not a valid size' % repr(value)
+        self._quadsize = None if value is None else (float(value[0]),float(value[1]))
+        if self._defined:
+            self._update()
+            self._moved()
+
+
+    # IMMUTABLE PROPERTIES
+    @property
+    def count(self):
+        """
+        The number of quads that are drawn (the number of True values in ``mask``).
+
+        **invariant**: Value must be an ``int`` >= 0
+        """
+        return int(np.count_nonzero(self._mask))
+
+    @property
+    def width(self):
+        """
+        The horizontal width of this batch.
+
+        The value is the width of the smallest box centered at (x,y) that contains every
+        quad that is drawn.
+
+        **invariant**: Value must be an ``int`` or ``float`` >= 0
+        """
+        points = self._positions[self._mask]
+        if len(points) == 0:
+            return 0
+        return 2*float(np.abs(points[:,0]).max())+self._size()[0]
+
+    @property
+    def height(self):
+        """
+        The vertical height of this batch.
+
+        The value is the height of the smallest box centered at (x,y) that contains every
+        quad that is drawn.
+
+        **invariant**: Value must be an ``int`` or ``float`` >= 0
+        """
+        points = self._positions[self._mask]
+        if len(points) == 0:
+            return 0
+        return 2*float(np.abs(points[:,1]).max())+self._size()[1]
+
+
+    # BUILT-IN METHODS
+    def __init__(self,**keywords):
+        """
+        Creates a new batch of images.
+
+        To use the constructor for this class, you should provide it with a list of
+        keyword arguments that initialize various attributes. For example, to draw
+        three copies of ``alien1.png`` in a row, use the constructor::
+
+            GBatch(source='alien1.png',positions=[(0,0),(50,0),(100,0)])
+
+        This class supports the same keywords as :class:`GImage`, except ``width`` and
+        ``height``, which are read-only.  Use ``quadsize`` to set the size of the quads.
+
+        :param keywords: dictionary of keyword arguments
+        :type keywords:  keys are attribute names
+        """
+        self._defined = False
+        self._texture = None
+        self._mesh = None
+        self._mask = np.ones(0,dtype=bool)
+        self.source = keywords['source'] if 'source' in keywords else None
+        self.quadsize = keywords['quadsize'] if 'quadsize' in keywords else None
+        self.positions = keywords['positions'] if 'positions' in keywords else np.zeros((0,2))
+        if 'mask' in keywords:
+            self.mask = keywords['mask']
+        GObject.__init__(self,**keywords)
+        self._reset()
+        self._defined = True
+
+
+    # HIDDEN METHODS
+    def _size(self):
+        """
+        Returns the (width, height) of a single quad
+        """
+        if not self._quadsize is None:
+            return self._quadsize
+        if self._texture is None:
+            return (0.0,0.0)
+        return (float(self._texture.width),float(self._texture.height))
+
+    def _update(self):
+        """
+        Rewrites the vertices (and if necessary the indices) of the mesh.
+
+        Each vertex is (x, y, u, v), and the corners go counter-clockwise from the bottom
+        left, like the texture coordinates of a Kivy texture.  The texture coordinates
+        come from the texture, so this works for atlas regions as well.
+        """
+        if self._mesh is None:
+            return
+        points = self._positions[self._mask]
+        count  = len(points)
+        width, height = self._size()
+        corners = np.array([[-width,-height],[width,-height],[width,height],[-width,height]])/2.0
+
+        verts = np.empty((count,4,4))
+        verts[:,:,0:2] = points[:,np.newaxis,:]+corners
+        if self._texture is None:
+            verts[:,:,2:4] = 0
+        else:
+            verts[:,:,2:4] = np.array(self._texture.tex_coords).reshape(4,2)
+        self._mesh.vertices = verts.ravel().tolist()
+
+        if count != self._quads:
+            base = np.arange(count)[:,np.newaxis]*4
+            self._mesh.indices = (base+[0,1,2,2,3,0]).ravel().tolist()
+            self._quads = count
+
+    def _reset(self):
+        """
+        Resets the drawing cache.
+        """
+        # Texture must load FIRST
+        if not self._source is None:
+            self._texture = GameApp.load_texture(self._source,user=self)
+        else:
+            self._texture = None
+
+        GObject._reset(self)
+        self._mesh = Mesh(mode='triangles',texture=self._texture)
+        self._quads = 0
+        self._update()
+        if not self._fillcolor is None:
+            self._cache.add(self._fillcolor)
+        else:
+            self._cache.add(shared_color((1.0,1.0,1.0,1.0)))
+        self._cache.add(self._mesh)
+        self._cache.add(PopMatrix())
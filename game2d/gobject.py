@@ -11,6 +11,9 @@ Date:   August 1, 2017 (Python 3 version)
 from kivy.graphics import *
 from kivy.graphics.instructions import *
 from introcs.geom import Point2, Matrix
+from contextlib import contextmanager
+from collections import OrderedDict
+from .spatial import AABBTree
 import introcs
 
 def is_color(c):
@@ -38,6 +41,81 @@ def is_color(c):
     return type(c) == str and (introcs.is_tkcolor(c) or introcs.is_webcolor(c))
 
 
+# The most colors to remember in each of the color caches below (least recently used go first)
+COLOR_CACHE_SIZE = 1024
+
+# The rgba values of the colors parsed so far, keyed by the (hashable) value parsed
+_RGBA_CACHE = OrderedDict()
+
+# The shared Kivy Color instructions, keyed by rgba
+_COLOR_CACHE = OrderedDict()
+
+
+def to_rgba(c):
+    """
+    Returns the rgba values of a color, or None if it is not a color.
+
+    A color is any value accepted by :func:`is_color`.  Strings and sequences are
+    remembered, so parsing the same color name twice only looks it up once.  The
+    colormodel objects are mutable, so they are converted every time.
+
+    :return: The color as a tuple of 4 floats between 0 and 1, or None
+    :rtype:  ``tuple`` or ``None``
+
+    :param c: The value to convert
+    :type c:  any
+    """
+    if type(c) in [introcs.RGB, introcs.HSV]:
+        return tuple(c.glColor())
+
+    key = tuple(c) if type(c) == list else c
+    try:
+        if key in _RGBA_CACHE:
+            _RGBA_CACHE.move_to_end(key)
+            return _RGBA_CACHE[key]
+    except TypeError:
+        return None
+
+    rgba = None
+    if is_color(c):
+        if type(c) == str:
+            if c[0] == '#':
+                rgba = tuple(introcs.RGB.CreateWebColor(c).glColor())
+            else:
+                rgba = tuple(introcs.RGB.CreateName(c).glColor())
+        else:
+            rgba = tuple(float(x) for x in c)+((1.0,) if len(c) == 3 else ())
+
+    if len(_RGBA_CACHE) >= COLOR_CACHE_SIZE:
+        _RGBA_CACHE.popitem(last=False)
+    _RGBA_CACHE[key] = rgba
+    return rgba
+
+
+def shared_color(rgba):
+    """
+    Returns the shared Kivy ``Color`` instruction for the given rgba values.
+
+    Every object with the same color uses the same instruction, so making many objects
+    of one color makes only one instruction.  Because they are shared, these
+    instructions must never be changed.  Only the least recently used colors are
+    forgotten when the cache is full, so a color in steady use keeps its instruction.
+
+    :return: The shared color instruction
+    :rtype:  ``Color``
+
+    :param rgba: The color to look up
+    :type rgba:  ``tuple`` of 4 floats between 0 and 1
+    """
+    if rgba in _COLOR_CACHE:
+        _COLOR_CACHE.move_to_end(rgba)
+        return _COLOR_CACHE[rgba]
+    if len(_COLOR_CACHE) >= COLOR_CACHE_SIZE:
+        _COLOR_CACHE.popitem(last=False)
+    _COLOR_CACHE[rgba] = Color(*rgba)
+    return _COLOR_CACHE[rgba]
+
+
 def is_num_tuple(t,size):
     """
     Checks whether a value is a sequence of numbers.
@@ -72,7 +150,7 @@ def is_gobject_list(g):
     """
     try:
         from functools import reduce
-        return len(g) >= 0 and reduce(lambda x, y: x and y, map(lambda z: isinstance(z,GObject), g))
+        return len(g) >= 0 and reduce(lambda x, y: x and y, map(lambda z: isinstance(z,GObject), g), True)
     except:
         return False
 
@@ -106,6 +184,7 @@ class GObject(object):
         assert type(value) in [int,float], '%s is not a number' % repr(value)
         self._trans.x = float(value)
         self._mtrue = False
+        self._moved()
 
     @property
     def y(self):
@@ -121,6 +200,7 @@ class GObject(object):
         assert type(value) in [int,float], '%s is not a number' % repr(value)
         self._trans.y = float(value)
         self._mtrue = False
+        self._moved()
 
     @property
     def width(self):
@@ -140,7 +220,7 @@ class GObject(object):
         self._width = float(value)
         self._set_width = True
         if self._defined:
-            self._reset()
+            self._invalidate()
 
     @property
     def height(self):
@@ -160,7 +240,7 @@ class GObject(object):
         self._height = float(value)
         self._set_height = True
         if self._defined:
-            self._reset()
+            self._invalidate()
 
     @property
     def scale(self):
@@ -191,6 +271,7 @@ class GObject(object):
             self._scale.x = float(value[0])
             self._scale.y = float(value[1])
         self._mtrue = False
+        self._moved()
 
     @property
     def angle(self):
@@ -211,6 +292,7 @@ class GObject(object):
         self._rotate.angle = float(value)
         if not diff:
             self._mtrue = False
+            self._moved()
 
     @property
     def linecolor(self):
@@ -233,21 +315,11 @@ class GObject(object):
 
     @linecolor.setter
     def linecolor(self,value):
-        import introcs
-        assert value is None or is_color(value), '%s is not a valid color' % repr(value)
-        if type(value) in [tuple, list] and len(value) == 3:
-            value = list(value)+[1.0]
-        elif type(value) in [introcs.RGB, introcs.HSV]:
-            value = value.glColor()
-        elif type(value) == str:
-            if value[0] == '#':
-                value = introcs.RGB.CreateWebColor(value).glColor()
-            else:
-                value = introcs.RGB.CreateName(value).glColor()
-
-        self._linecolor = None if value is None else Color(value[0],value[1],value[2],value[3])
+        rgba = None if value is None else to_rgba(value)
+        assert value is None or not rgba is None, '%s is not a valid color' % repr(value)
+        self._linecolor = None if rgba is None else shared_color(rgba)
         if self._defined:
-            self._reset()
+            self._invalidate()
 
     @property
     def fillcolor(self):
@@ -271,21 +343,11 @@ class GObject(object):
 
     @fillcolor.setter
     def fillcolor(self,value):
-        import introcs
-        assert value is None or is_color(value), '%s is not a valid color' % repr(value)
-        if type(value) in [tuple, list] and len(value) == 3:
-            value = list(value)+[1.0]
-        elif type(value) in [introcs.RGB, introcs.HSV]:
-            value = value.glColor()
-        elif type(value) == str:
-            if value[0] == '#':
-                value = introcs.RGB.CreateWebColor(value).glColor()
-            else:
-                value = introcs.RGB.CreateName(value).glColor()
-
-        self._fillcolor = None if value is None else Color(value[0],value[1],value[2],value[3])
+        rgba = None if value is None else to_rgba(value)
+        assert value is None or not rgba is None, '%s is not a valid color' % repr(value)
+        self._fillcolor = None if rgba is None else shared_color(rgba)
         if self._defined:
-            self._reset()
+            self._invalidate()
 
     @property
     def name(self):
@@ -305,6 +367,27 @@ class GObject(object):
         assert value is None or type(value) == str, '%s is not a valid name' % repr(value)
         self._name = value
 
+    @property
+    def visible(self):
+        """
+        Whether this object is drawn.
+
+        If this value is False, :meth:`draw` does nothing.  If the object has been added
+        to a view with :meth:`GView.add`, it stays in the view but is hidden until this
+        value is True again.  The children of a :class:`GScene` are drawn with the scene,
+        so this value has no effect on them.
+
+        **invariant**: Value must be a ``bool``
+        """
+        return self._visible
+
+    @visible.setter
+    def visible(self,value):
+        assert type(value) == bool, '%s is not a bool' % repr(value)
+        if value != self._visible:
+            self._visible = value
+            self._fill_slot()
+
     # DERIVED PROPERTIES
     @property
     def left(self):
@@ -508,12 +591,20 @@ class GObject(object):
         """
         # Set the properties.
         self._defined = False
+        self._visible = True
+        self._slot = None
+        self._owner = None
+        self._shift = None
+        self._updating = 0
+        self._stale = False
 
         # Create the Kivy transforms for position and size
         self._trans  = Translate(0,0,0)
         self._rotate = Rotate(angle=0,axis=(0,0,1))
         #self._scale  = Scale(1,1,1)
         self._scale  = Scale(1,1,1)
+        self._matrix = None
+        self._mtrue  = False
 
         # Now update these with the keywords; size first
         if 'width' in keywords:
@@ -575,6 +666,53 @@ class GObject(object):
 
 
     # PUBLIC METHODS
+    def begin_update(self):
+        """
+        Starts a batch of attribute changes.
+
+        Changing an attribute like ``fillcolor`` or ``width`` normally rebuilds the
+        drawing cache right away.  Between this method and :meth:`end_update`, those
+        rebuilds are put off, and :meth:`end_update` does at most one.  So setting
+        several attributes in a row only costs a single rebuild.  Until the batch ends,
+        the object is drawn as it was before the batch began.
+
+        Batches may be nested; the cache is only rebuilt when the outermost batch ends.
+        You can also use :meth:`updating` to batch the changes in a ``with`` block.
+        """
+        self._updating += 1
+
+    def end_update(self):
+        """
+        Ends a batch of attribute changes started with :meth:`begin_update`.
+
+        If any change during the batch needed the drawing cache rebuilt, it is rebuilt
+        now (once).
+        """
+        assert self._updating > 0, 'end_update called without begin_update'
+        self._updating -= 1
+        if self._updating == 0 and self._stale:
+            self._stale = False
+            self._invalidate()
+
+    @contextmanager
+    def updating(self):
+        """
+        Returns a context manager that batches attribute changes.
+
+        This is a convenience for :meth:`begin_update` and :meth:`end_update`.  For
+        example, to restyle a rectangle ``rect`` with a single rebuild, write::
+
+            with rect.updating():
+                rect.fillcolor = 'red'
+                rect.linecolor = 'black'
+                rect.width = 100
+        """
+        self.begin_update()
+        try:
+            yield self
+        finally:
+            self.end_update()
+
     def contains(self,point):
         """
         Checks whether this shape contains the point
@@ -619,7 +757,7 @@ class GObject(object):
             return self.inverse.transform(point)
         else:
             assert is_num_tuple(point,2), "%s is not a valid point" % repr(point)
-            p = self.inverse._transform(point[0],point[2])
+            p = tuple(self.inverse._transform(point[0],point[1]))
             return Point2(p[0],p[1])
 
     def draw(self, view):
@@ -631,11 +769,45 @@ class GObject(object):
         :param view: view to draw to
         :type view:  :class:`GView`
         """
+        if not self._visible:
+            return
         try:
             view.draw(self._cache)
         except:
             raise IOError('Cannot draw %s since it was not initialized properly' % repr(self))
 
+    def draw_shifted(self, view, dx, dy):
+        """
+        Draws this shape in the provided view, moved by (dx,dy).
+
+        The shape itself does not move.  The drawing cache is wrapped in a translation
+        that only exists for drawing, so this does not change ``x`` or ``y``, and does
+        not tell the scene holding this shape that it moved.  Use this to draw a shape
+        between two positions, like the last two fixed updates of a game.
+
+        :param view: view to draw to
+        :type view:  :class:`GView`
+
+        :param dx: the horizontal distance to move the drawing
+        :type dx:  ``int`` or ``float``
+
+        :param dy: the vertical distance to move the drawing
+        :type dy:  ``int`` or ``float``
+        """
+        if not self._visible:
+            return
+        if self._shift is None or not self._shifted is self._cache:
+            self._shift = Translate(0,0,0)
+            self._shifted = self._cache
+            self._shiftgroup = InstructionGroup()
+            self._shiftgroup.add(PushMatrix())
+            self._shiftgroup.add(self._shift)
+            self._shiftgroup.add(self._cache)
+            self._shiftgroup.add(PopMatrix())
+        self._shift.x = dx
+        self._shift.y = dy
+        view.draw(self._shiftgroup)
+
     # HIDDEN METHODS
     def _reset(self):
         """
@@ -646,6 +818,107 @@ class GObject(object):
         self._cache.add(self._trans)
         self._cache.add(self._rotate)
         self._cache.add(self._scale)
+        self._fill_slot()
+        if not self._owner is None:
+            self._owner._child_reset(self)
+
+    def _invalidate(self):
+        """
+        Brings the drawing cache up to date after an attribute change.
+
+        The cache is updated in place with :meth:`_update_cache` if possible, and is
+        rebuilt with :meth:`_reset` otherwise.  If a batch of changes is in progress
+        (see :meth:`begin_update`), this is put off until the batch ends.
+        """
+        self._moved()
+        if self._updating > 0:
+            self._stale = True
+        elif not self._update_cache():
+            self._reset()
+
+    def _update_cache(self):
+        """
+        Updates the instructions in the drawing cache in place, if possible.
+
+        Subclasses that keep their instructions should override this method to change
+        them to match the current attributes.  It should return False (and change
+        nothing) if the cache needs a different set of instructions, like a border that
+        was not there before.  By default, this method always returns False.
+
+        :return: True if the cache was updated; False if it must be rebuilt
+        :rtype:  ``bool``
+        """
+        return False
+
+    def _tint(self):
+        """
+        Returns the color that textured objects are drawn with.
+
+        Textured objects use the fill color to tint their texture.  If there is no
+        fill color, the texture is drawn as is (with white).
+
+        :return: the tint color
+        :rtype:  ``tuple`` or ``list`` of 4 floats between 0 and 1
+        """
+        return (1,1,1,1) if self._fillcolor is None else self._fillcolor.rgba
+
+    def _add_ink(self,rgba):
+        """
+        Adds the shared color instruction for the given color to the drawing cache.
+
+        :param rgba: the color to add
+        :type rgba:  sequence of 4 floats between 0 and 1
+
+        :return: the position of the instruction in the cache (for :meth:`_set_ink`)
+        :rtype:  ``int``
+        """
+        pos = self._cache.length()
+        self._cache.add(shared_color(tuple(rgba)))
+        return pos
+
+    def _set_ink(self,pos,rgba):
+        """
+        Replaces the color instruction at the given position of the drawing cache.
+
+        Shared color instructions must never change, so a recolor swaps in the shared
+        instruction for the new color instead.  The instruction is replaced in the list
+        of children directly, since a shared instruction may appear more than once in
+        the cache, and ``InstructionGroup.remove`` would take out the first one.
+
+        :param pos: the position returned by :meth:`_add_ink`
+        :type pos:  ``int``
+
+        :param rgba: the new color
+        :type rgba:  sequence of 4 floats between 0 and 1
+        """
+        ink = shared_color(tuple(rgba))
+        children = self._cache.children
+        if not children[pos] is ink:
+            children[pos] = ink
+            self._cache.flag_update()
+
+    def _moved(self):
+        """
+        Tells the scene holding this object that its bounding box may have changed.
+
+        The scene is the :class:`GScene` that this object is a child of, if any.  It
+        uses this to keep its bounding box tree (see ``indexed``) up to date.
+        """
+        if not self._owner is None:
+            self._owner._child_moved(self)
+
+    def _fill_slot(self):
+        """
+        Puts the drawing cache in the view slot, if this object has one.
+
+        The slot is the group that :meth:`GView.add` keeps in the view for this object.
+        It holds the current drawing cache when the object is visible, and nothing when
+        it is hidden.
+        """
+        if not self._slot is None:
+            self._slot.clear()
+            if self._visible:
+                self._slot.add(self._cache)
     
     def _build_matrix(self):
         """
@@ -679,6 +952,19 @@ class GScene(GObject):
     read-only.  These values are computed from the list of objects stored in the scene.
 
     All objects stored in a ``GScene`` are drawn as if the point (x,y) is the origin.
+
+    A scene with many children can keep a bounding box tree of them (an
+    :class:`AABBTree`) by setting ``indexed`` to True.  The tree is refitted whenever
+    a child moves, turns, scales or changes size, and it makes :meth:`select` and
+    :meth:`query` take time logarithmic in the number of children.  An object should
+    only be a child of one scene at a time, since it only reports its changes to the
+    most recent scene it was added to.
+
+    Each child is drawn from its own slot (a small ``InstructionGroup``) in the drawing
+    cache of the scene.  When a child rebuilds its drawing cache, only its slot is
+    refilled, and the scene and the scenes above it are left alone.  Use :meth:`append`,
+    :meth:`insert` and :meth:`remove` to change one child at a time without touching
+    the slots of the others.
     """
 
     # MUTABLE PROPERTIES
@@ -690,16 +976,64 @@ class GScene(GObject):
         The objects are drawn as if (x,y) is the origin.  Therefore, changing the
         attributes `x` and `y` will shift all of the children on the screen.
 
-        **invariant**: Value must be a list or tuple of :class:`GObject` (possibly empty)
+        Assigning a list that starts with the current children only adds the new ones
+        at the end.  Any other list refills the scene, but it keeps the slots of the
+        children that stay, so none of their drawing caches are rebuilt.
+
+        **invariant**: Value must be a list or tuple of distinct :class:`GObject`
+        (possibly empty)
         """
         return tuple(self._children)
 
     @children.setter
     def children(self,value):
         assert is_gobject_list(value), '%s is not a list of valid objects' % repr(value)
-        self._children = list(value)
-        if self._defined:
-            self._reset()
+        value = list(value)
+        assert len(set(value)) == len(value), '%s has an object more than once' % repr(value)
+        size = len(self._children)
+        if value[:size] == self._children:
+            for child in value[size:]:
+                self.append(child)
+            return
+
+        keep = set(value)
+        for child in self._children:
+            if not child in keep:
+                self._detach(child)
+        self._children = value
+        self._order = None
+        self._body.clear()
+        for child in value:
+            if child in self._slots:
+                self._body.add(self._slots[child])
+            else:
+                self._body.add(self._attach(child))
+        if not self._tree is None:
+            self._fill_tree()
+        self._moved()
+
+    @property
+    def indexed(self):
+        """
+        Whether this scene keeps a bounding box tree of its children.
+
+        The tree holds the bounding box (``left``, ``bottom``, ``right`` and ``top``)
+        of each child, in the coordinates of this scene.  It is only worth keeping for
+        scenes with many children, as every change to a child has to refit it.
+
+        **invariant**: Value must be a ``bool``
+        """
+        return not self._tree is None
+
+    @indexed.setter
+    def indexed(self,value):
+        assert type(value) == bool, '%s is not a bool' % repr(value)
+        if value and self._tree is None:
+            self._tree = AABBTree()
+            self._fill_tree()
+        elif not value:
+            self._tree = None
+            self._dirty.clear()
 
 
     # IMMUTABLE PROPERTIES
@@ -750,13 +1084,22 @@ class GScene(GObject):
             GScene(children=[rect,tri,circ])
 
         This class supports the same keywords as :class:`GObject`, though some of them
-        are unused, as the `width` and `height` attributes are now immutable.
+        are unused, as the `width` and `height` attributes are now immutable.  It also
+        supports the keyword ``indexed``.
 
         :param keywords: dictionary of keyword arguments
         :type keywords:  keys are attribute names
         """
         self._defined = False
+        self._owner = None
+        self._children = []
+        self._slots = {}
+        self._order = {}
+        self._body = InstructionGroup()
+        self._tree = None
+        self._dirty = set()
         self.children = keywords['children'] if 'children' in keywords else []
+        self.indexed = keywords['indexed'] if 'indexed' in keywords else False
         GObject.__init__(self,**keywords)
         self._reset()
         self._defined = True
@@ -769,28 +1112,146 @@ class GScene(GObject):
 
         This function recursively descends the scene graph.  It returns the first child
         it finds that contains ``point``.  If that child is also a ``GScene``, it
-        recursively calls this method.  If not child contains this point, it returns
-        either this object, or ``None`` if the point is completely out of bounds.
+        recursively calls this method.  If no child contains this point, it returns
+        ``None``.
+
+        The point is in the coordinates of the parent of this scene, like the point
+        given to :meth:`contains`.  It is transformed to the coordinates of this scene
+        before it is checked against the children.  If the scene is ``indexed``, only
+        the children whose bounding boxes contain the point are checked.
 
         **Warning**: Using this method on a rotated object may slow down your framerate.
 
         :param point: the point to check
         :type point: :class:`Point2`` or a pair of numbers
         """
-        if not self.contains(point):
-            return None
+        local = self.transform(point)
+        if self._tree is None:
+            if not self.contains(point):
+                return None
+            candidates = self._children
+        else:
+            self._refit_tree()
+            candidates = self._tree.query_point(local.x,local.y)
+            candidates = sorted(candidates,key=self._ranks().__getitem__)
 
-        for child in self._children:
+        for child in candidates:
             result = None
             if isinstance(child,GScene):
-                result = child.select(point)
-            elif child.contains(point):
+                result = child.select(local)
+            elif child.contains(local):
                 result = child
-            if not child is None:
-                return child
+            if not result is None:
+                return result
 
         return None
 
+    def query(self,left,bottom,right,top):
+        """
+        Returns the children whose bounding boxes overlap the given box.
+
+        The box is in the coordinates of the parent of this scene.  If this scene is
+        rotated, the box is turned into the smallest box in the coordinates of this
+        scene that contains it.  Only the bounding boxes of the children are checked,
+        so the result may include children that do not quite touch the box.  The
+        children are returned in the order they appear in ``children``.
+
+        If the scene is ``indexed``, this method takes time logarithmic in the number
+        of children.  Otherwise it checks every child.
+
+        :param left: the left edge of the box
+        :type left:  ``int`` or ``float``
+
+        :param bottom: the bottom edge of the box
+        :type bottom:  ``int`` or ``float``
+
+        :param right: the right edge of the box
+        :type right:  ``int`` or ``float`` >= left
+
+        :param top: the top edge of the box
+        :type top:  ``int`` or ``float`` >= bottom
+
+        :return: The children whose bounding boxes overlap the box
+        :rtype:  ``list`` of :class:`GObject`
+        """
+        corners = [tuple(self.inverse._transform(x,y))[:2]
+                   for (x,y) in ((left,bottom),(right,bottom),(right,top),(left,top))]
+        left   = min(p[0] for p in corners)
+        right  = max(p[0] for p in corners)
+        bottom = min(p[1] for p in corners)
+        top    = max(p[1] for p in corners)
+
+        if self._tree is None:
+            result = []
+            for child in self._children:
+                box = self._bounds(child)
+                if not (box[0] > right or box[2] < left or box[1] > top or box[3] < bottom):
+                    result.append(child)
+            return result
+
+        self._refit_tree()
+        return sorted(self._tree.query(left,bottom,right,top),key=self._ranks().__getitem__)
+
+    def append(self,child):
+        """
+        Adds an object to the end of the children of this scene.
+
+        The object is drawn on top of the other children.  Only the slot for the new
+        child is added to the drawing cache; nothing else is rebuilt.
+
+        :param child: the object to add
+        :type child:  :class:`GObject` not already in this scene
+        """
+        self.insert(len(self._children),child)
+
+    def insert(self,pos,child):
+        """
+        Adds an object to the children of this scene at the given position.
+
+        Only the slot for the new child is added to the drawing cache; nothing else is
+        rebuilt.
+
+        :param pos: the position of the new child in ``children``
+        :type pos:  ``int`` >= 0 and <= the number of children
+
+        :param child: the object to add
+        :type child:  :class:`GObject` not already in this scene
+        """
+        assert isinstance(child,GObject), '%s is not a valid object' % repr(child)
+        assert not child in self._slots, '%s is already in this scene' % repr(child)
+        assert type(pos) == int and 0 <= pos <= len(self._children), \
+                '%s is not a valid position' % repr(pos)
+        self._children.insert(pos,child)
+        self._body.insert(pos,self._attach(child))
+        if pos == len(self._children)-1 and not self._order is None:
+            self._order[child] = pos
+        else:
+            self._order = None
+        if not self._tree is None:
+            self._tree.insert(child,*self._bounds(child))
+        self._moved()
+
+    def remove(self,child):
+        """
+        Removes an object from the children of this scene.
+
+        Only the slot for the child is removed from the drawing cache; nothing else is
+        rebuilt.  This method does nothing if the object is not a child of this scene.
+
+        :param child: the object to remove
+        :type child:  :class:`GObject`
+        """
+        if not child in self._slots:
+            return
+        self._children.remove(child)
+        self._body.remove(self._slots[child])
+        self._detach(child)
+        self._order = None
+        if not self._tree is None:
+            self._tree.remove(child)
+            self._dirty.discard(child)
+        self._moved()
+
 
     # HIDDEN METHODS
     def _reset(self):
@@ -798,6 +1259,107 @@ class GScene(GObject):
         Resets the drawing cache
         """
         GObject._reset(self)
-        for x in self.children:
-            self._cache.add(x._cache)
+        self._cache.add(self._body)
         self._cache.add(PopMatrix())
+
+    def _update_cache(self):
+        """
+        Updates the drawing cache in place.
+
+        The children are drawn from their slots, which are kept up to date as the
+        children change.  So the drawing cache of a scene never needs to be rebuilt.
+
+        :return: True, as the cache never needs to be rebuilt
+        :rtype:  ``bool``
+        """
+        return True
+
+    def _attach(self,child):
+        """
+        Returns a new slot holding the drawing cache of a child.
+
+        This also makes this scene the one the child reports its changes to.
+
+        :param child: the new child
+        :type child:  :class:`GObject`
+        """
+        slot = InstructionGroup()
+        slot.add(child._cache)
+        self._slots[child] = slot
+        child._owner = self
+        return slot
+
+    def _detach(self,child):
+        """
+        Forgets the slot of a child that is leaving this scene.
+
+        :param child: the old child
+        :type child:  :class:`GObject`
+        """
+        del self._slots[child]
+        if child._owner is self:
+            child._owner = None
+
+    def _child_reset(self,child):
+        """
+        Puts the new drawing cache of a child in its slot.
+
+        :param child: the child that rebuilt its drawing cache
+        :type child:  :class:`GObject`
+        """
+        slot = self._slots.get(child)
+        if not slot is None:
+            slot.clear()
+            slot.add(child._cache)
+
+    def _ranks(self):
+        """
+        Returns a dictionary mapping each child to its position in ``children``
+
+        The dictionary is kept until a child is inserted or removed before the end.
+        """
+        if self._order is None:
+            self._order = dict((child,pos) for (pos,child) in enumerate(self._children))
+        return self._order
+
+    def _child_moved(self,child):
+        """
+        Marks the bounding box of a child as out of date.
+
+        The tree is not refitted until the next query, so a child that changes many
+        times between queries is only refitted once.  The change is passed on to the
+        scene holding this one, since the bounding box of this scene changes too.
+
+        :param child: the child that changed
+        :type child:  :class:`GObject`
+        """
+        if not self._tree is None:
+            self._dirty.add(child)
+        self._moved()
+
+    def _fill_tree(self):
+        """
+        Puts every child in the bounding box tree, replacing what was there before.
+        """
+        self._tree.clear()
+        self._dirty.clear()
+        for child in self._children:
+            self._tree.insert(child,*self._bounds(child))
+
+    def _refit_tree(self):
+        """
+        Refits the bounding box tree to every child that changed since the last query.
+        """
+        for child in self._dirty:
+            if child in self._slots:
+                self._tree.insert(child,*self._bounds(child))
+        self._dirty.clear()
+
+    def _bounds(self,child):
+        """
+        Returns the bounding box (left, bottom, right, top) of a child
+
+        :param child: the child to measure
+        :type child:  :class:`GObject`
+        """
+        return (child.left,child.bottom,child.right,child.top)
@@ -10,7 +10,9 @@ Date:   August 1, 2017 (Python 3 version)
 # Lower-level kivy modules to support animation
 from kivy.graphics import *
 from kivy.graphics.instructions import *
-from .gobject import GObject
+from introcs.geom import Point2
+import numpy as np
+from .gobject import GObject, is_num_tuple
 
 
 def same_side(p1, p2, a, b):
@@ -103,6 +105,8 @@ class GPath(GObject):
     are 0.  However, if they are nonzero, then Python will add them to all of the points
     in the path, shifting the path accordingly.
     """
+    # The most point-segment pairs that near_many compares at once
+    NEAR_CHUNK = 1 << 20
     
     # MUTABLE PROPERTIES
     @property
@@ -119,8 +123,10 @@ class GPath(GObject):
     def points(self,value):
         assert is_point_tuple(value,2),'value %s is not a valid list of points' %  repr(value)
         self._points = tuple(value)
+        self._hits = None
+        self._segments = None
         if self._defined:
-            self._reset()
+            self._invalidate()
     
     @property
     def linewidth(self):
@@ -139,7 +145,7 @@ class GPath(GObject):
         assert value >= 0, 'value %s is negative' % repr(value)
         self._linewidth = value
         if self._defined:
-            self._reset()
+            self._invalidate()
     
     
     # IMMUTABLE PROPERTIES
@@ -213,43 +219,261 @@ class GPath(GObject):
         """
         return False
     
-    def near(self,point):
+    def contains_many(self,points):
+        """
+        Checks whether this shape contains each of the given points
+        
+        This is the same as calling :meth:`contains` on each point, but it tests all of
+        the points at once with ``numpy``.  It is much faster when there are many points.
+        
+        :param points: the points to check
+        :type points:  array-like of shape (n,2)
+        
+        :return: an array whose entry i is True if the shape contains point i
+        :rtype:  ``numpy.ndarray`` of ``bool``
+        """
+        points = np.asarray(points,dtype=float).reshape(-1,2)
+        hits = self._hit_cache()
+        result = np.zeros(len(points),dtype=bool)
+        if len(points) == 0 or len(hits[1]) == 0:
+            return result
+        
+        local = self._local_many(points)
+        xmin, ymin, xmax, ymax = hits[0]
+        x = local[:,0]
+        y = local[:,1]
+        inbox = (x >= xmin) & (x <= xmax) & (y >= ymin) & (y <= ymax)
+        if not inbox.any():
+            return result
+        
+        # Broadcast the points in the box against every edge of every triangle
+        tris = hits[2]
+        px = x[inbox][:,np.newaxis,np.newaxis]
+        py = y[inbox][:,np.newaxis,np.newaxis]
+        ex = np.roll(tris[:,:,0],-1,axis=1)-tris[:,:,0]
+        ey = np.roll(tris[:,:,1],-1,axis=1)-tris[:,:,1]
+        cross = ex*(py-tris[:,:,1])-ey*(px-tris[:,:,0])
+        result[inbox] = (cross >= 0).all(axis=2).any(axis=1)
+        return result
+    
+    def near(self,point,distance=None):
         """
         Checks whether this path is near the given point
         
-        To determine if (x,y) is near the path, we compute the minimum distances
-        from (x,y) to the path.  If this distance is less than e-6, we return True.
+        To determine if (x,y) is near the path, we compute the minimum distance from
+        (x,y) to each segment of the path.  If any distance is at most ``distance``, we
+        return True.  If ``distance`` is None, it is half of ``linewidth``, so a point is
+        near the path if the line drawn for the path covers it.  The path of a
+        :class:`GTriangle` or :class:`GPolygon` includes the edge from the last vertex
+        back to the first.
         
         :param point: the point to check
         :type point: :class:`Point2`` or a pair of numbers
         
+        :param distance: how near the point must be
+        :type distance:  ``int`` or ``float`` >= 0, or None
+        
         :return: True if this path is near the give point; False otherwise.
         :rtype:  ``bool``
         """
-        if isinstance(point,Point2):
-            point = (point.x,point.y)
-        assert is_point_tuple(point,1),'value %s is not a valid point' %  repr(point)
+        x, y = self._local(point)
+        limit = self._near_limit(distance)
+        box, segments = self._segment_cache()[0:2]
+        if x < box[0]-limit or x > box[2]+limit or y < box[1]-limit or y > box[3]+limit:
+            return False
+        
+        limit = limit*limit
+        for (ax,ay,dx,dy,length) in segments:
+            t = 0.0 if length == 0 else ((x-ax)*dx+(y-ay)*dy)/length
+            t = min(max(t,0.0),1.0)
+            ex = ax+t*dx-x
+            ey = ay+t*dy-y
+            if ex*ex+ey*ey <= limit:
+                return True
+        return False
+    
+    def near_many(self,points,distance=None):
+        """
+        Checks whether this path is near each of the given points
+        
+        This is the same as calling :meth:`near` on each point, but it tests all of the
+        points against all of the segments at once with ``numpy``.  It is much faster
+        when there are many points.
+        
+        :param points: the points to check
+        :type points:  array-like of shape (n,2)
+        
+        :param distance: how near a point must be
+        :type distance:  ``int`` or ``float`` >= 0, or None
+        
+        :return: an array whose entry i is True if this path is near point i
+        :rtype:  ``numpy.ndarray`` of ``bool``
+        """
+        points = np.asarray(points,dtype=float).reshape(-1,2)
+        limit = self._near_limit(distance)
+        box, segments, starts, deltas, lengths = self._segment_cache()
+        result = np.zeros(len(points),dtype=bool)
+        if len(points) == 0:
+            return result
+        
+        local = self._local_many(points)
+        x = local[:,0]
+        y = local[:,1]
+        inbox = ((x >= box[0]-limit) & (x <= box[2]+limit) &
+                 (y >= box[1]-limit) & (y <= box[3]+limit))
+        index = np.flatnonzero(inbox)
+        
+        # Broadcast points against segments, in chunks to bound the memory used
+        safe  = np.where(lengths == 0,1.0,lengths)
+        chunk = max(1,self.NEAR_CHUNK//len(lengths))
+        for pos in range(0,len(index),chunk):
+            rows  = index[pos:pos+chunk]
+            diffs = local[rows][:,np.newaxis,:]-starts
+            t = np.clip((diffs*deltas).sum(axis=2)/safe,0.0,1.0)
+            gaps = diffs-t[:,:,np.newaxis]*deltas
+            result[rows] = ((gaps*gaps).sum(axis=2) <= limit*limit).any(axis=1)
+        return result
+    
+    
+    # HIDDEN METHODS
+    def _vertices(self):
+        """
+        Returns the points of the path, in order, as a flat tuple
+        
+        Subclasses that are closed shapes override this to repeat the first point at
+        the end.
+        """
+        return self._points
+    
+    def _near_limit(self,distance):
+        """
+        Returns the distance for :meth:`near`, replacing None with half the line width
+        
+        :param distance: how near a point must be
+        :type distance:  ``int`` or ``float`` >= 0, or None
+        """
+        if distance is None:
+            return self._linewidth/2.0
+        assert type(distance) in [int,float] and distance >= 0, '%s is not a valid distance' % repr(distance)
+        return float(distance)
+    
+    def _segment_cache(self):
+        """
+        Returns the precomputed segments for :meth:`near`, computing them if necessary
+        
+        The data is the bounding box (xmin, ymin, xmax, ymax) of the path, a list with
+        one tuple (ax, ay, dx, dy, length) for each segment, where (ax,ay) is the start,
+        (dx,dy) is the vector to the end, and length is the squared length.  The same
+        starts, vectors and squared lengths follow as ``numpy`` arrays.  The data is
+        thrown away whenever ``points`` changes.
+        """
+        if not self._segments is None:
+            return self._segments
+        
+        verts  = np.array(self._vertices(),dtype=float).reshape(-1,2)
+        starts = verts[:-1]
+        deltas = verts[1:]-verts[:-1]
+        lengths = (deltas*deltas).sum(axis=1)
+        segments = [tuple(float(v) for v in row) for row in
+                    np.column_stack((starts,deltas,lengths)).tolist()]
+        box = (verts[:,0].min(),verts[:,1].min(),verts[:,0].max(),verts[:,1].max())
+        self._segments = (tuple(float(v) for v in box),segments,starts,deltas,lengths)
+        return self._segments
+    
+    def _triangles(self):
+        """
+        Returns the triangles that make up the interior of this shape
+        
+        A path has no interior, so this is empty.  Subclasses with an interior override
+        this method.
+        
+        :return: the vertices of each triangle
+        :rtype:  ``list`` of 6-element ``tuple``
+        """
+        return []
+    
+    def _hit_cache(self):
+        """
+        Returns the precomputed data for :meth:`contains`, computing it if necessary
+        
+        The data is the bounding box (xmin, ymin, xmax, ymax) of the triangles, a list
+        with one tuple (ax, ay, ux, uy, bx, by, vx, vy, cx, cy, wx, wy) for each triangle,
+        and the same triangles as a ``numpy`` array of shape (m,3,2).  Each triangle is
+        counter-clockwise, and u, v, w are its edges (b-a, c-b, a-c).  Triangles with no
+        area are left out.  The data is thrown away whenever ``points`` changes.
+        """
+        if not self._hits is None:
+            return self._hits
+        
+        edges = []
+        for t in self._triangles():
+            ax, ay, bx, by, cx, cy = [float(v) for v in t]
+            area = (bx-ax)*(cy-ay)-(by-ay)*(cx-ax)
+            if area == 0:
+                continue
+            if area < 0:
+                bx, by, cx, cy = cx, cy, bx, by
+            edges.append((ax,ay,bx-ax,by-ay,bx,by,cx-bx,cy-by,cx,cy,ax-cx,ay-cy))
+        
+        tris = np.array([(e[0:2],e[4:6],e[8:10]) for e in edges],dtype=float).reshape(-1,3,2)
+        if len(edges) == 0:
+            box = (0.0,0.0,0.0,0.0)
+        else:
+            box = (tris[:,:,0].min(),tris[:,:,1].min(),tris[:,:,0].max(),tris[:,:,1].max())
+        self._hits = (tuple(float(v) for v in box),edges,tris)
+        return self._hits
+    
+    def _hit(self,point):
+        """
+        Returns True if the point (in the coordinates of this shape) is in a triangle
+        
+        This is the scalar fast path.  It checks the bounding box first, and then each
+        triangle with plain arithmetic.
+        
+        :param point: the point to check
+        :type point:  a pair of numbers
+        """
+        box, edges, tris = self._hit_cache()
         x = point[0]
         y = point[1]
-        
-        size = len(self.points)/2
-        epsilon = 1e-6
-        for ii in range(size-1):
-            p = self.points[2*ii  :2*ii+2]
-            q = self.points[2*ii+2:2*ii+4]
-            if p == q:
-                test = np.sqrt((q[0]-x)*(q[0]-x)+(q[1]-y)*(q[1]-y)) < epsilon
-            else:
-                num = abs((q[0]-p[0])*x-(q[1]-p[1])*y+q[0]*p[1]-p[0]*q[1])
-                den = np.sqrt((q[0]-p[0])*(q[0]-p[0])+(q[1]-p[1])*(q[1]-p[1]))
-                test = num/den
-            if test:
+        if x < box[0] or x > box[2] or y < box[1] or y > box[3]:
+            return False
+        for (ax,ay,ux,uy,bx,by,vx,vy,cx,cy,wx,wy) in edges:
+            if (ux*(y-ay) >= uy*(x-ax) and vx*(y-by) >= vy*(x-bx) and
+                wx*(y-cy) >= wy*(x-cx)):
                 return True
+        return False
+    
+    def _local(self,point):
+        """
+        Returns the point in the coordinates of this shape (the coordinates of points)
+        
+        :param point: the point to transform
+        :type point: :class:`Point2`` or a pair of numbers
+        """
+        if isinstance(point,Point2):
+            point = (point.x,point.y)
+        assert is_num_tuple(point,2), "%s is not a valid point" % repr(point)
         
-        return self.contains(point)
+        if self._rotate.angle != 0.0 or self._scale.x != 1.0 or self._scale.y != 1.0:
+            return tuple(self.inverse._transform(point[0],point[1]))[:2]
+        return (point[0]-self.x,point[1]-self.y)
     
+    def _local_many(self,points):
+        """
+        Returns the points in the coordinates of this shape (the coordinates of points)
+        
+        :param points: the points to transform
+        :type points:  ``numpy.ndarray`` of shape (n,2)
+        """
+        if self._rotate.angle != 0.0 or self._scale.x != 1.0 or self._scale.y != 1.0:
+            # The inverse is affine, so three points determine it
+            origin = np.array(tuple(self.inverse._transform(0,0))[:2],dtype=float)
+            xaxis  = np.array(tuple(self.inverse._transform(1,0))[:2],dtype=float)-origin
+            yaxis  = np.array(tuple(self.inverse._transform(0,1))[:2],dtype=float)-origin
+            return origin+points[:,0:1]*xaxis+points[:,1:2]*yaxis
+        return points-(self.x,self.y)
     
-    # HIDDEN METHODS
     def _reset(self):
         """
         Resets the drawing cache
@@ -297,8 +521,10 @@ class GTriangle(GPath):
         assert is_point_tuple(value,3),'value %s is not a valid list of points' %  repr(value)
         assert len(value) == 6, 'value %s does not have the right length'  %  repr(value)
         self._points = tuple(value)
+        self._hits = None
+        self._segments = None
         if self._defined:
-            self._reset()
+            self._invalidate()
     
     
     # BUILT-IN METHODS
@@ -331,7 +557,9 @@ class GTriangle(GPath):
         """
         Checks whether this shape contains the point
         
-        By default, this method just checks the bounding box of the shape.
+        Points on the edge of the triangle are contained in it.  The edges of the triangle
+        are computed once and reused until ``points`` changes.  Use :meth:`contains_many`
+        to check many points at once.
         
         **Warning**: Using this method on a rotated object may slow down your framerate.
         
@@ -341,14 +569,25 @@ class GTriangle(GPath):
         :return: True if the shape contains this point
         :rtype:  ``bool``
         """
-        if isinstance(point,Point2):
-            point = (point.x,point.y)
-        assert is_point_tuple(point,1), "%s is not a valid point" % repr(point)
-        
-        return in_triangle(points,self._points)
+        return self._hit(self._local(point))
     
     
     # HIDDEN METHODS
+    def _triangles(self):
+        """
+        Returns the triangles that make up the interior of this shape (just this one)
+        
+        :return: the vertices of each triangle
+        :rtype:  ``list`` of 6-element ``tuple``
+        """
+        return [self._points]
+    
+    def _vertices(self):
+        """
+        Returns the points of the outline, in order, ending back at the first point
+        """
+        return self._points+self._points[0:2]
+    
     def _reset(self):
         """
         Resets the drawing cache
@@ -416,8 +655,10 @@ class GPolygon(GPath):
     def points(self,value):
         assert is_point_tuple(value,3),'value %s is not a valid list of points' %  repr(value)
         self._points = tuple(value)
+        self._hits = None
+        self._segments = None
         if self._defined:
-            self._reset()
+            self._invalidate()
     
     @property
     def source(self):
@@ -434,7 +675,7 @@ class GPolygon(GPath):
         assert value is None or GameApp.is_image(value), 'value %s is not an image file' % repr(value)
         self._source = value
         if self._defined:
-            self._reset()
+            self._invalidate()
     
     @property
     def source_width(self):
@@ -459,7 +700,7 @@ class GPolygon(GPath):
         assert value is None or type(value) in [int,float], 'value %s is not a valid width' % repr(value)
         self._source_width = None
         if self._defined:
-            self._reset()
+            self._invalidate()
     
     @property
     def source_height(self):
@@ -484,7 +725,7 @@ class GPolygon(GPath):
         assert value is None or _is_num(value), 'value %s is not a valid width' % repr(value)
         self._source_height = None
         if self._defined:
-            self._reset()
+            self._invalidate()
     
     
     # BUILT-IN METHODS
@@ -520,7 +761,10 @@ class GPolygon(GPath):
         """
         Checks whether this shape contains the point
         
-        By default, this method just checks the bounding box of the shape.
+        The polygon is the triangle fan drawn by this object: one triangle from the origin
+        to each pair of adjacent vertices, including the last and first vertex.  Points on
+        an edge are contained in the polygon.  The triangles are computed once and reused
+        until ``points`` changes.  Use :meth:`contains_many` to check many points at once.
         
         **Warning**: Using this method on a rotated object may slow down your framerate.
         
@@ -530,26 +774,35 @@ class GPolygon(GPath):
         :return: True if the shape contains this point
         :rtype:  ``bool``
         """
-        if isinstance(point,Point2):
-            point = (point.x,point.y)
-        assert is_point_tuple(point,1), "%s is not a valid point" % repr(point)
-        
-        found = False
-        for i in xrange(4,len(self._points),2):
-            t = (0,0)+self.points[i-4:i]
-            found = found or in_triangle(point,t)
-        
-        return found
+        return self._hit(self._local(point))
     
     
     # HIDDEN METHODS
+    def _triangles(self):
+        """
+        Returns the triangles of the fan that make up the interior of this polygon
+        
+        :return: the vertices of each triangle
+        :rtype:  ``list`` of 6-element ``tuple``
+        """
+        points = self._points+self._points[0:2]
+        return [(0,0)+points[i:i+4] for i in range(0,len(self._points),2)]
+    
+    def _vertices(self):
+        """
+        Returns the points of the outline, in order, ending back at the first point
+        """
+        return self._points+self._points[0:2]
+    
     def _make_mesh(self):
         """
         Creates the mesh for this polygon
         """
-        size = len(self.points)/2
+        from .app import GameApp
+        size = len(self.points)//2
         try:
-            texture = Image(source=self.source).texture
+            # Repeating needs the whole texture, not an atlas region
+            texture = GameApp.load_texture(self.source,False,self)
             texture.wrap = 'repeat'
             tw = float(texture.width)  if self.source_width is None else self.source_width
             th = float(texture.height) if self.source_height is None else self.source_height
@@ -560,7 +813,7 @@ class GPolygon(GPath):
             # Create the fan.
             for x in range(size):
                 pt = self.points[2*x:2*x+2]
-                self._verts += pt+(pt[0]/tw+0.5,pt[1]/th+0.5)
+                verts += pt+(pt[0]/tw+0.5,pt[1]/th+0.5)
             
             # Come back to the beginning
             pt = self.points[0:2]
@@ -581,7 +834,8 @@ class GPolygon(GPath):
         GObject._reset(self)
         self._make_mesh()
         
-        self._cache.add(self._fillcolor)
+        if not self._fillcolor is None:
+            self._cache.add(self._fillcolor)
         self._cache.add(self._mesh)
         
         if self.linewidth > 0:
@@ -47,7 +47,7 @@ class GRectangle(GObject):
         assert value >= 0, '%s is negative' % repr(value)
         self._linewidth = value
         if self._defined:
-            self._reset()
+            self._invalidate()
     
     
     # BUILT-IN METHODS
@@ -76,26 +76,61 @@ class GRectangle(GObject):
     
     
     # HIDDEN METHODS
+    def _has_line(self):
+        """
+        Returns True if this shape has a border
+        """
+        return not self._linecolor is None and self.linewidth > 0
+    
     def _reset(self):
         """
         Resets the drawing cache
+        
+        The fill and border colors are shared instructions (see :func:`shared_color`).
+        Their positions in the cache are kept, so that :meth:`_update_cache` can swap
+        in a different color.
         """
         GObject._reset(self)
         x = -self.width/2.0
         y = -self.height/2.0
         
+        self._fill = None
         if not self._fillcolor is None:
-            fill = Rectangle(pos=(x,y), size=(self.width, self.height))
-            self._cache.add(self._fillcolor)
-            self._cache.add(fill)
+            self._fill = Rectangle(pos=(x,y), size=(self.width, self.height))
+            self._fillink = self._add_ink(self._fillcolor.rgba)
+            self._cache.add(self._fill)
         
-        if not self._linecolor is None and self.linewidth > 0:
-            line = Line(rectangle=(x,y,self.width,self.height),joint='miter',
-                        close=True,width=self.linewidth)
-            self._cache.add(self._linecolor)
-            self._cache.add(line)
+        self._line = None
+        if self._has_line():
+            self._line = Line(rectangle=(x,y,self.width,self.height),joint='miter',
+                              close=True,width=self.linewidth)
+            self._lineink = self._add_ink(self._linecolor.rgba)
+            self._cache.add(self._line)
         
         self._cache.add(PopMatrix())
+    
+    def _update_cache(self):
+        """
+        Updates the fill and border instructions in place.
+        
+        This returns False if the fill or border has to appear or disappear.
+        """
+        if (self._fill is None) != (self._fillcolor is None):
+            return False
+        if (self._line is None) == self._has_line():
+            return False
+        
+        x = -self.width/2.0
+        y = -self.height/2.0
+        if not self._fill is None:
+            self._fill.pos  = (x,y)
+            self._fill.size = (self.width,self.height)
+            self._set_ink(self._fillink,self._fillcolor.rgba)
+        if not self._line is None:
+            self._line.rectangle = (x,y,self.width,self.height)
+            self._line.width = self.linewidth
+            self._set_ink(self._lineink,self._linecolor.rgba)
+        return True
 
 
 # #mark -
@@ -170,17 +205,42 @@ class GEllipse(GRectangle):
         x = -self.width/2.0
         y = -self.height/2.0
         
+        self._fill = None
         if not self._fillcolor is None:
-            fill = Ellipse(pos=(x,y), size=(self.width,self.height))
-            self._cache.add(self._fillcolor)
-            self._cache.add(fill)
+            self._fill = Ellipse(pos=(x,y), size=(self.width,self.height))
+            self._fillink = self._add_ink(self._fillcolor.rgba)
+            self._cache.add(self._fill)
         
-        if not self._linecolor is None and self.linewidth > 0:
-            line = Line(ellipse=(x,y,self.width,self.height),close=True,width=self.linewidth)
-            self._cache.add(self._linecolor)
-            self._cache.add(line)
+        self._line = None
+        if self._has_line():
+            self._line = Line(ellipse=(x,y,self.width,self.height),close=True,width=self.linewidth)
+            self._lineink = self._add_ink(self._linecolor.rgba)
+            self._cache.add(self._line)
         
         self._cache.add(PopMatrix())
+    
+    def _update_cache(self):
+        """
+        Updates the fill and border instructions in place.
+        
+        This returns False if the fill or border has to appear or disappear.
+        """
+        if (self._fill is None) != (self._fillcolor is None):
+            return False
+        if (self._line is None) == self._has_line():
+            return False
+        
+        x = -self.width/2.0
+        y = -self.height/2.0
+        if not self._fill is None:
+            self._fill.pos  = (x,y)
+            self._fill.size = (self.width,self.height)
+            self._set_ink(self._fillink,self._fillcolor.rgba)
+        if not self._line is None:
+            self._line.ellipse = (x,y,self.width,self.height)
+            self._line.width = self.linewidth
+            self._set_ink(self._lineink,self._linecolor.rgba)
+        return True
 
 
 # #mark -
@@ -220,7 +280,7 @@ class GImage(GRectangle):
         assert value is None or GameApp.is_image(value), '%s is not an image file' % repr(value)
         self._source = value
         if self._defined:
-            self._reset()
+            self._invalidate()
     
     
     # BUILT-IN METHODS
@@ -254,7 +314,7 @@ class GImage(GRectangle):
         Resets the drawing cache.
         """
         # Texture must load FIRST
-        self._texture = GameApp.load_texture(self.source)
+        self._texture = GameApp.load_texture(self.source,user=self)
         if self._texture:
             if not self._set_width:
                 self.width = self._texture.width
@@ -269,19 +329,46 @@ class GImage(GRectangle):
         y = -self.height/2.0
         
         
-        fill = Rectangle(pos=(x,y), size=(self.width, self.height),texture=self._texture)
-        if not self._fillcolor is None:
-            self._cache.add(self._fillcolor)
-        else:
-            self._cache.add(Color(1,1,1))
-        self._cache.add(fill)
+        self._fill = Rectangle(pos=(x,y), size=(self.width, self.height),texture=self._texture)
+        self._fillink = self._add_ink(self._tint())
+        self._cache.add(self._fill)
         
-        if not self._linecolor is None and self.linewidth > 0:
-            line = Line(rectangle=(x,y,self.width,self.height),joint='miter',close=True,width=self.linewidth)
-            self._cache.add(self._linecolor)
-            self._cache.add(line)
+        self._line = None
+        if self._has_line():
+            self._line = Line(rectangle=(x,y,self.width,self.height),joint='miter',close=True,width=self.linewidth)
+            self._lineink = self._add_ink(self._linecolor.rgba)
+            self._cache.add(self._line)
         
         self._cache.add(PopMatrix())
+    
+    def _update_cache(self):
+        """
+        Updates the image and border instructions in place.
+        
+        A new ``source`` is swapped into the existing rectangle, unless the image has
+        to be resized to fit it.  This returns False if that happens, or if the border
+        has to appear or disappear.
+        """
+        if (self._line is None) == self._has_line():
+            return False
+        
+        texture = GameApp.load_texture(self.source,user=self)
+        if not texture is self._texture:
+            if not texture or not (self._set_width and self._set_height):
+                return False
+            self._texture = texture
+            self._fill.texture = texture
+        
+        x = -self.width/2.0
+        y = -self.height/2.0
+        self._fill.pos  = (x,y)
+        self._fill.size = (self.width,self.height)
+        self._set_ink(self._fillink,self._tint())
+        if not self._line is None:
+            self._line.rectangle = (x,y,self.width,self.height)
+            self._line.width = self.linewidth
+            self._set_ink(self._lineink,self._linecolor.rgba)
+        return True
 
 
 # #mark -
@@ -398,7 +485,7 @@ class GLabel(GRectangle):
         self._halign = value
         self._label.halign = value
         if self._defined:
-            self._reset()
+            self._invalidate()
     
     @property
     def valign(self):
@@ -422,7 +509,7 @@ class GLabel(GRectangle):
         self._valign = value
         self._label.valign = value
         if self._defined:
-            self._reset()
+            self._invalidate()
     
     
     # REDEFINED PROPERTIES
@@ -439,6 +526,7 @@ class GLabel(GRectangle):
         assert type(value) in [int,float], 'value %s is not a number' % repr(value)
         self._trans.x = float(value)
         self._mtrue = False
+        self._moved()
         self._hanchor = 'center'
         self._ha = value
     
@@ -455,6 +543,7 @@ class GLabel(GRectangle):
         assert type(value) in [int,float], 'value %s is not a number' % repr(value)
         self._trans.y = float(value)
         self._mtrue = False
+        self._moved()
         self._vanchor = 'center'
         self._hv = value
     
@@ -639,12 +728,18 @@ class GLabel(GRectangle):
                 % (s,repr(self.text),repr(self.x),repr(self.y),repr(self.angle))
     
     # HIDDEN METHODS
+    def _update_cache(self):
+        """
+        Returns False, as a label always rebuilds its drawing cache.
+        """
+        return False
+    
     def _callback(self,instance=None,value=None):
         """
         A workaround to deal with parameter requirements for callbacks
         """
         if self._defined:
-            self._reset()
+            self._invalidate()
     
     def _reset(self):
         """
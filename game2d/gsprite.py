@@ -11,9 +11,20 @@ Date:   November 1, 2017 (Python 3 version)
 """
 from kivy.graphics import *
 from kivy.graphics.instructions import *
+import weakref
 from .grectangle import GRectangle, GObject
 from .app import GameApp
 
+# #mark -
+class _Frames(list):
+    """
+    A list of the frames cut from one filmstrip texture.
+
+    The frame cache holds these weakly, and a tuple cannot be weakly referenced.
+    """
+    pass
+
+
 # #mark -
 class GSprite(GRectangle):
     """
@@ -33,7 +44,14 @@ class GSprite(GRectangle):
     
     If the image supports transparency, then this object can be used to represent irregular 
     shapes.  However, the :meth:`contains` method still treats this shape as a  rectangle.
+    
+    The frames of a filmstrip are cut out once and shared by every sprite with the same
+    ``source`` and ``format`` (see ``FRAME_CACHE``).  Changing the frame only swaps the
+    texture of the rectangle already drawn.  The cache only keeps the frames while some
+    sprite is using them, so it does not stop :class:`GameApp` from evicting the texture.
     """
+    # The frames cut from each filmstrip, keyed by (source, format), held weakly
+    FRAME_CACHE = weakref.WeakValueDictionary()
     
     # MUTABLE PROPERTIES
     @property
@@ -50,7 +68,7 @@ class GSprite(GRectangle):
         assert value is None or GameApp.is_image(value), '%s is not an image file' % repr(value)
         self._source = value
         if self._defined:
-            self._reset()
+            self._invalidate()
     
     @property
     def count(self):
@@ -82,8 +100,10 @@ class GSprite(GRectangle):
         self._format = tuple(value)
         count = value[0]*value[1]
         
-        if self.frame >= count:
-            self.frame = 0
+        if self._frame >= count:
+            self._frame = 0
+        if self._defined:
+            self._invalidate()
     
     @property
     def frame(self):
@@ -127,7 +147,7 @@ class GSprite(GRectangle):
         self._frame  = 0
         self.source = keywords['source'] if 'source' in keywords else None
         self.format = keywords['format'] if 'format' in keywords else (1,1)
-        self._images = [None]*self.count
+        self._images = (None,)*self.count
         self._bounds = None
         self._texture = None
         GRectangle.__init__(self,**keywords)
@@ -146,27 +166,93 @@ class GSprite(GRectangle):
         assert value[0] > 0 and value[1] > 0, '%s does not have valid values' % repr(value)
         self._format = value
     
+    @classmethod
+    def _slice(cls,source,format,user=None):
+        """
+        Returns the frames of the given filmstrip, or None if it cannot be loaded
+        
+        The frames are cut out of the texture the first time, and are then shared.  If
+        the texture for ``source`` has changed since (because it was unloaded, or an
+        atlas was built), the frames are cut out again.
+        
+        :param source: the filmstrip file
+        :type source:  ``str``
+        
+        :param format: the grid size (rows, columns) of the filmstrip
+        :type format:  2-element tuple of ints > 0
+        
+        :param user: the sprite that will draw the frames, if any
+        :type user:  :class:`GSprite` or ``None``
+        
+        :return: the frames, left-to-right, top-to-bottom
+        :rtype:  ``list`` of Kivy texture regions, or None
+        """
+        texture = GameApp.load_texture(source,user=user)
+        if not texture:
+            return None
+        
+        key = (source,format)
+        images = cls.FRAME_CACHE.get(key)
+        if not images is None and images.texture is texture:
+            return images
+        
+        width  = texture.width/format[1]
+        height = texture.height/format[0]
+        images = []
+        ty = 0
+        for row in range(format[0]):
+            tx = 0
+            for col in range(format[1]):
+                images.append(texture.get_region(int(tx),texture.height-int(ty)-int(height),int(width),int(height)))
+                tx += width
+            ty += height
+        images = _Frames(images)
+        images.texture = texture
+        cls.FRAME_CACHE[key] = images
+        return images
+    
+    def _update_cache(self):
+        """
+        Updates the image and border instructions in place.
+        
+        This returns False if the sprite has to be resized to fit new frames, or if the
+        border has to appear or disappear.
+        """
+        if (self._line is None) == self._has_line():
+            return False
+        
+        images = GSprite._slice(self.source,self._format,self)
+        if not images is self._images:
+            if images is None or not (self._set_width and self._set_height):
+                return False
+            self._images = images
+            self._texture = images[self._frame]
+            self._bounds.texture = self._texture
+        
+        x = -self.width/2.0
+        y = -self.height/2.0
+        self._bounds.pos  = (x,y)
+        self._bounds.size = (self.width,self.height)
+        self._set_ink(self._fillink,self._tint())
+        if not self._line is None:
+            self._line.rectangle = (x,y,self.width,self.height)
+            self._line.width = self.linewidth
+            self._set_ink(self._lineink,self._linecolor.rgba)
+        return True
+    
     def _reset(self):
         """
         Resets the drawing cache.
         """
-        # Texture must load FIRST
-        texture = GameApp.load_texture(self.source)
-        if texture:
-            width  = texture.width/self._format[1]
-            height = texture.height/self._format[0]
-            
-            ty = 0
-            for row in range(self._format[0]):
-                tx = 0
-                for col in range(self._format[1]):
-                    self._images[row*self._format[1]+col] = texture.get_region(int(tx),texture.height-int(ty)-int(height),int(width),int(height))
-                    tx += width
-                ty += height
+        # Frames must load FIRST
+        images = GSprite._slice(self.source,self._format,self)
+        if images:
+            texture = GameApp.load_texture(self.source,user=self)
+            self._images = images
             if not self._set_width:
-                self.width = width
+                self.width = texture.width/self._format[1]
             if not self._set_height:
-                self.height = height
+                self.height = texture.height/self._format[0]
         else:
             print('Failed to load',repr(self.source))
         
@@ -177,16 +263,14 @@ class GSprite(GRectangle):
         
         self._texture = self._images[self._frame]
         self._bounds = Rectangle(pos=(x,y), size=(self.width, self.height),texture=self._texture)
-        if not self._fillcolor is None:
-            self._cache.add(self._fillcolor)
-        else:
-            self._cache.add(Color(1,1,1))
+        self._fillink = self._add_ink(self._tint())
         self._cache.add(self._bounds)
         
-        if not self._linecolor is None and self.linewidth > 0:
-            line = Line(rectangle=(x,y,self.width,self.height),joint='miter',close=True,width=self.linewidth)
-            self._cache.add(self._linecolor)
-            self._cache.add(line)
+        self._line = None
+        if self._has_line():
+            self._line = Line(rectangle=(x,y,self.width,self.height),joint='miter',close=True,width=self.linewidth)
+            self._lineink = self._add_ink(self._linecolor.rgba)
+            self._cache.add(self._line)
         
         self._cache.add(PopMatrix())
 
@@ -0,0 +1,394 @@
+"""
+A module to support fast-changing text.
+
+A :class:`GLabel` renders its whole string to a new texture every time the text
+changes.  That is fine for a title, but it is slow for a score that changes many times
+a second.  This module renders each character of a font once, into a shared texture (a
+glyph atlas).  A :class:`GBitmapLabel` lays its string out as one textured quad per
+character, so changing the text only rewrites a few vertices.
+"""
+from kivy.graphics import *
+from kivy.graphics.instructions import *
+import numpy as np
+from .gobject import GObject, shared_color
+from .atlas import TextureAtlas
+from .app import GameApp
+
+
+class GlyphAtlas(object):
+    """
+    A class representing the characters of one font, packed into a single texture.
+
+    Each character is rendered once with the Kivy text provider, so it looks exactly
+    like the same character in a :class:`GLabel`.  The glyphs are white, so they can be
+    tinted to any color.  Every glyph is as tall as a line of text, and as wide as its
+    advance, so laying the glyphs of a string side by side reproduces the string.
+
+    Atlases are shared.  Use :meth:`get` rather than the constructor, and each font and
+    size is only rendered once.
+    """
+    # The characters in every atlas (printable ASCII)
+    CHARACTERS = ''.join(map(chr,range(32,127)))
+    # The atlases made so far, keyed by (font_name, font_size)
+    CACHE = {}
+
+    # IMMUTABLE PROPERTIES
+    @property
+    def font_name(self):
+        """
+        The font file of this atlas, or None for the default Kivy font.
+
+        **Invariant**: Must be a ``str`` or None
+        """
+        return self._font_name
+
+    @property
+    def font_size(self):
+        """
+        The size of the font in points.
+
+        **Invariant**: Must be an ``int`` or ``float`` > 0
+        """
+        return self._font_size
+
+    @property
+    def height(self):
+        """
+        The height of a line of text.
+
+        **Invariant**: Must be an ``int`` >= 0
+        """
+        return self._height
+
+    @property
+    def texture(self):
+        """
+        The texture holding the glyphs.
+
+        **Invariant**: Must be a Kivy texture
+        """
+        return self._texture
+
+
+    # CLASS METHODS
+    @classmethod
+    def get(cls,font_name,font_size):
+        """
+        Returns the shared atlas for the given font, making it if necessary.
+
+        :param font_name: the font file, or None for the default Kivy font
+        :type font_name:  ``str`` or None
+
+        :param font_size: the size of the font in points
+        :type font_size:  ``int`` or ``float`` > 0
+
+        :return: the atlas for the font
+        :rtype:  :class:`GlyphAtlas`
+        """
+        key = (font_name,font_size)
+        if not key in cls.CACHE:
+            cls.CACHE[key] = cls(font_name,font_size)
+        return cls.CACHE[key]
+
+
+    # BUILT-IN METHODS
+    def __init__(self,font_name,font_size):
+        """
+        Creates a new atlas for the given font.
+
+        :param font_name: the font file, or None for the default Kivy font
+        :type font_name:  ``str`` or None
+
+        :param font_size: the size of the font in points
+        :type font_size:  ``int`` or ``float`` > 0
+        """
+        assert font_name is None or GameApp.is_font(font_name), '%s is not a font name' % repr(font_name)
+        assert type(font_size) in [int,float] and font_size > 0, '%s is not a valid size' % repr(font_size)
+        self._font_name = font_name
+        self._font_size = font_size
+
+        images = [(c,self._render(c)) for c in self.CHARACTERS]
+        self._height = max(pixels.shape[0] for (c,pixels) in images)
+
+        # Grow the page until every glyph fits on it
+        area = sum((pixels.shape[0]+2)*(pixels.shape[1]+2) for (c,pixels) in images)
+        size = 64
+        while size*size < area:
+            size *= 2
+        atlas = TextureAtlas(images,size,1)
+        while len(atlas.pages) > 1:
+            size *= 2
+            atlas = TextureAtlas(images,size,1)
+        self._texture = atlas.pages[0]
+
+        self._index = {}
+        self._sizes  = np.zeros((len(images),2))
+        self._coords = np.zeros((len(images),4,2))
+        for (pos,(c,pixels)) in enumerate(images):
+            region = atlas.get(c)
+            self._index[c] = pos
+            self._sizes[pos] = (region.width,region.height)
+            self._coords[pos] = np.array(region.tex_coords).reshape(4,2)
+
+    def __contains__(self,c):
+        """
+        :return: True if the character ``c`` is in this atlas.
+        :rtype:  ``bool``
+        """
+        return c in self._index
+
+
+    # PUBLIC METHODS
+    def layout(self,text):
+        """
+        Returns the glyph sizes and texture coordinates for a string.
+
+        Characters that are not in the atlas are skipped.
+
+        :param text: the string to lay out
+        :type text:  ``str``
+
+        :return: the (width, height) of each glyph, and the texture coordinates of its
+            four corners, counter-clockwise from the bottom left
+        :rtype:  ``numpy.ndarray`` of shape (n,2), ``numpy.ndarray`` of shape (n,4,2)
+        """
+        index = [self._index[c] for c in text if c in self._index]
+        return (self._sizes[index],self._coords[index])
+
+    def measure(self,text):
+        """
+        Returns the width of a string in this font.
+
+        :param text: the string to measure
+        :type text:  ``str``
+
+        :return: the width of the string
+        :rtype:  ``float``
+        """
+        return float(sum(self._sizes[self._index[c],0] for c in text if c in self._index))
+
+
+    # HIDDEN METHODS
+    def _render(self,c):
+        """
+        Returns the pixels of a single character as an rgba array, top row first
+
+        :param c: the character to render
+        :type c:  ``str``
+        """
+        from kivy.core.text import Label as CoreLabel
+        options = {'text': c, 'font_size': self._font_size}
+        if not self._font_name is None:
+            options['font_name'] = self._font_name
+        label = CoreLabel(**options)
+        label.refresh()
+        texture = label.texture
+        pixels = np.frombuffer(texture.pixels,dtype=np.uint8)
+        return pixels.reshape(texture.height,texture.width,4)
+
+
+# #mark -
+class GBitmapLabel(GObject):
+    """
+    A class representing a single line of text drawn from a glyph atlas.
+
+    This object looks like a :class:`GLabel` with the same text and font, but it is
+    much cheaper to change.  Each character is a quad in a single Kivy ``Mesh``, and
+    changing ``text`` rewrites the vertices of that mesh in place.  It does not render
+    any text, and it does not rebuild the drawing cache.  Use it for text that changes
+    often, like a score or a counter.
+
+    The text is centered at (x,y).  As with :class:`GLabel`, ``linecolor`` is the
+    color of the text and ``fillcolor`` is the color of the background.  But there is
+    no background by default.  The attributes ``width`` and ``height`` are read-only;
+    they are the size of the text.
+
+    Only the printable ASCII characters are supported.  Any other character (including
+    '\\n') is skipped.
+    """
+
+    # MUTABLE PROPERTIES
+    @property
+    def text(self):
+        """
+        The text for this label.
+
+        **Invariant**: Must be a string"""
+        return self._text
+
+    @text.setter
+    def text(self,value):
+        assert type(value) == str, 'value %s is not a string' % repr(value)
+        if value == self._text:
+            return
+        self._text = value
+        if self._defined:
+            self._update()
+            self._moved()
+
+    @property
+    def font_name(self):
+        """
+        The file name for the .ttf file to use as a font
+
+        If this is None, the label uses the default Kivy font.
+
+        **Invariant**: Must be None or a string referring to a .ttf file in folder Fonts"""
+        return self._font_name
+
+    @font_name.setter
+    def font_name(self,value):
+        assert value is None or GameApp.is_font(value), 'value %s is not a font name' % repr(value)
+        self._font_name = value
+        if self._defined:
+            self._invalidate()
+
+    @property
+    def font_size(self):
+        """
+        The size of the text font in points.
+
+        **Invariant**: Must be a positive number (int or float)"""
+        return self._font_size
+
+    @font_size.setter
+    def font_size(self,value):
+        assert type(value) in [int,float] and value > 0, 'value %s is not a valid size' % repr(value)
+        self._font_size = value
+        if self._defined:
+            self._invalidate()
+
+
+    # IMMUTABLE PROPERTIES
+    @property
+    def width(self):
+        """
+        The horizontal width of this label (the width of the text).
+
+        **Invariant**: Must be an ``int`` or ``float`` >= 0
+        """
+        if self._atlas is None:
+            return 0
+        return self._atlas.measure(self._text)
+
+    @property
+    def height(self):
+        """
+        The vertical height of this label (the height of a line of text).
+
+        **Invariant**: Must be an ``int`` or ``float`` >= 0
+        """
+        if self._atlas is None:
+            return 0
+        return self._atlas.height
+
+
+    # BUILT-IN METHODS
+    def __init__(self,**keywords):
+        """
+        Creates a new bitmap label.
+
+        To use the constructor for this class, you should provide it with a list of
+        keyword arguments that initialize various attributes.  For example, to create a
+        score label in the Arcade font, use the constructor call::
+
+            GBitmapLabel(text='Score: 0',font_name='Arcade.ttf',font_size=30)
+
+        This class supports the same keywords as :class:`GObject`, except ``width`` and
+        ``height``, as well as ``text``, ``font_name`` and ``font_size``.
+
+        :param keywords: dictionary of keyword arguments
+        :type keywords:  keys are attribute names
+        """
+        self._defined = False
+        self._atlas = None
+        self._mesh = None
+        self._fill = None
+        self._text = ''
+        self.text = keywords['text'] if 'text' in keywords else ''
+        self.font_name = keywords['font_name'] if 'font_name' in keywords else None
+        self.font_size = keywords['font_size'] if 'font_size' in keywords else 15
+
+        sanitized = {}
+        for key in keywords:
+            if not key in ['width','height']:
+                sanitized[key] = keywords[key]
+        GObject.__init__(self,**sanitized)
+        if not 'linecolor' in keywords:
+            self.linecolor = (0,0,0,1)
+        if not 'fillcolor' in keywords:
+            self.fillcolor = None
+        self._reset()
+        self._defined = True
+
+    def __str__(self):
+        """
+        :return: A readable string representation of this object.
+        :rtype:  ``str``
+        """
+        if self.name is None:
+            s = '['
+        else:
+            s = '[name=%s,' % self.name
+        return '%s,text=%s,center=(%s,%s),angle=%s]' \
+                % (s,repr(self.text),repr(self.x),repr(self.y),repr(self.angle))
+
+
+    # HIDDEN METHODS
+    def _update(self):
+        """
+        Rewrites the vertices (and if necessary the indices) of the mesh.
+
+        The glyphs are placed left to right, and the text is centered on whole pixels,
+        the same way a Kivy ``Label`` places its texture.
+        """
+        if self._mesh is None:
+            return
+        sizes, coords = self._atlas.layout(self._text)
+        count = len(sizes)
+        right = np.cumsum(sizes[:,0])
+        total = float(right[-1]) if count else 0.0
+        left  = right-sizes[:,0]+int(-total/2.0)
+        top   = int(-self._atlas.height/2.0)+self._atlas.height
+
+        verts = np.empty((count,4,4))
+        verts[:,0,0] = verts[:,3,0] = left
+        verts[:,1,0] = verts[:,2,0] = left+sizes[:,0]
+        verts[:,0,1] = verts[:,1,1] = top-sizes[:,1]
+        verts[:,2,1] = verts[:,3,1] = top
+        verts[:,:,2:4] = coords
+        self._mesh.vertices = verts.ravel().tolist()
+
+        if not self._fill is None:
+            height = self._atlas.height
+            self._fill.pos  = (-total/2.0,-height/2.0)
+            self._fill.size = (total,height)
+
+        if count != self._quads:
+            base = np.arange(count)[:,np.newaxis]*4
+            self._mesh.indices = (base+[0,1,2,2,3,0]).ravel().tolist()
+            self._quads = count
+
+    def _reset(self):
+        """
+        Resets the drawing cache.
+        """
+        # Atlas must load FIRST
+        self._atlas = GlyphAtlas.get(self._font_name,self._font_size)
+
+        GObject._reset(self)
+        self._fill = None
+        if self.fillcolor:
+            self._fill = Rectangle()
+            self._cache.add(self._fillcolor)
+            self._cache.add(self._fill)
+
+        self._mesh = Mesh(mode='triangles',texture=self._atlas.texture)
+        self._quads = 0
+        self._update()
+        if not self._linecolor is None:
+            self._cache.add(self._linecolor)
+        else:
+            self._cache.add(shared_color((0.0,0.0,0.0,1.0)))
+        self._cache.add(self._mesh)
+        self._cache.add(PopMatrix())
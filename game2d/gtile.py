@@ -5,11 +5,17 @@ A tile is an image that is repeated multiple times horizontally or vertically.
 useful for making things like terrain or highways.  Aside from the repeated textures,
 this is very similar to GImage.
 
+The tile meshes are computed with ``numpy`` and shared, so many tiles of the same size
+cost one computation.  A tile may also repeat its texture on the graphics card, and
+then scrolling it only changes four texture coordinates.
+
 Author: Walker M. White (wmw2)
 Date:   November 1, 2020
 """
 from kivy.graphics import *
 from kivy.graphics.instructions import *
+import numpy as np
+from collections import OrderedDict
 from .grectangle import GRectangle, GObject
 from .app import GameApp
 
@@ -23,7 +29,21 @@ class GTile(GObject):
     **explicitly** with the ``scale`` attribute).  Instead it repeats the image
     to fill in all of the remaining space.  This is ideal for terrain and other
     background features
+    
+    By default, each copy of the image is a separate quad in a Kivy ``Mesh``.  These
+    meshes depend only on the size of the texture and the size of the tile, so they
+    are computed once and shared (see ``MESH_CACHE``).
+    
+    If ``repeat`` is True, the tile is instead a single quad, and the graphics card
+    repeats the texture.  In this mode, ``offset`` scrolls the image inside the tile,
+    and changing it only rewrites the texture coordinates of that quad.  This is the
+    fastest way to draw a scrolling background.  Repeating changes the ``wrap`` of the
+    texture, which is shared with every other object using the same image file.
     """
+    # The tile meshes computed so far, keyed by (texture width, texture height, width, height)
+    MESH_CACHE = OrderedDict()
+    # The most meshes to remember in MESH_CACHE (least recently used go first)
+    MESH_CACHE_SIZE = 64
     
     # MUTABLE PROPERTIES
     @property
@@ -40,7 +60,47 @@ class GTile(GObject):
         assert value is None or GameApp.is_image(value), '%s is not an image file' % repr(value)
         self._source = value
         if self._defined:
-            self._reset()
+            self._invalidate()
+    
+    @property
+    def repeat(self):
+        """
+        Whether the graphics card repeats the texture.
+        
+        If this is True, the tile is drawn as a single quad, and ``offset`` scrolls the
+        image.  Otherwise, each copy of the image is a separate quad.
+        
+        **invariant**. Value is a ``bool``.
+        """
+        return self._repeat
+    
+    @repeat.setter
+    def repeat(self,value):
+        assert type(value) == bool, '%s is not a bool' % repr(value)
+        self._repeat = value
+        if self._defined:
+            self._invalidate()
+    
+    @property
+    def offset(self):
+        """
+        The point of the image (in pixels) at the bottom left corner of the tile.
+        
+        Increasing the offset scrolls the image to the left and down.  The offset wraps
+        around, so it may be any size.  This attribute only has an effect if ``repeat``
+        is True.  Changing it rewrites the texture coordinates of the quad in place,
+        without rebuilding the drawing cache.
+        
+        **invariant**. Value is a pair of numbers.
+        """
+        return self._offset
+    
+    @offset.setter
+    def offset(self,value):
+        assert len(value) == 2 and all(type(v) in [int,float] for v in value), '%s is not a valid offset' % repr(value)
+        self._offset = (float(value[0]),float(value[1]))
+        if self._defined and self._repeat:
+            self._mesh.vertices = self._scroll()
     
     # IMMUTABLE PROPERTIES
     @property
@@ -76,7 +136,8 @@ class GTile(GObject):
             
             GTile(x=0,y=0,width=10,height=10,source='beach-ball.png')
         
-        This class supports the all same keywords as :class:`GImage`.  However, the
+        This class supports the all same keywords as :class:`GImage`, plus ``repeat``
+        and ``offset``.  However, the
         attributes `width` and `height` are **required** (so that the object knows how
         much space to fill).  Leaving out these values will cause a `ValueError`.
         
@@ -85,6 +146,8 @@ class GTile(GObject):
         """
         self._defined = False
         self.source = keywords['source'] if 'source' in keywords else None
+        self.repeat = keywords['repeat'] if 'repeat' in keywords else False
+        self.offset = keywords['offset'] if 'offset' in keywords else (0,0)
         if not 'width' in keywords:
             raise ValueError("The 'width' argument must be specified.")
         if not 'height' in keywords:
@@ -94,49 +157,145 @@ class GTile(GObject):
         self._defined = True
     
     # HIDDEN METHODS
-    def _reset(self):
+    @classmethod
+    def _tiles(cls,tex_width,tex_height,width,height):
         """
-        Resets the drawing cache.
+        Returns the vertices and indices of the mesh for a tile
+        
+        The mesh has one quad for each copy of the texture, centered at the origin.  The
+        copies on the right and top edges are cut short, if the texture does not fit a
+        whole number of times.  Meshes are remembered in ``MESH_CACHE``.
+        
+        :param tex_width: the width of the texture
+        :type tex_width:  ``int`` > 0
+        
+        :param tex_height: the height of the texture
+        :type tex_height:  ``int`` > 0
+        
+        :param width: the width of the tile
+        :type width:  ``float`` > 0
+        
+        :param height: the height of the tile
+        :type height:  ``float`` > 0
+        
+        :return: the vertices (x, y, u, v) and the indices of the mesh
+        :rtype:  pair of ``list``
         """
-        GObject._reset(self)
-        x = -self._width/2.0
-        y = -self._height/2.0
-        
-        self._texture = GameApp.load_texture(self.source)
-        if not self._texture is None and self.width == 0:
-            self.width  = self._texture.width
-        if not self._texture is None and self.height == 0:
-            self.height = self._texture.height
-        
-        grid_x = self._texture.width
-        grid_y = self._texture.height
-        size_x = int(self.width//grid_x)
-        size_y = int(self.height//grid_y)
-        rem_x = self.width-grid_x*size_x
-        rem_y = self.height-grid_y*size_y
+        key = (tex_width,tex_height,width,height)
+        if key in cls.MESH_CACHE:
+            cls.MESH_CACHE.move_to_end(key)
+            return cls.MESH_CACHE[key]
         
+        size_x = int(width//tex_width)
+        size_y = int(height//tex_height)
+        rem_x = width-tex_width*size_x
+        rem_y = height-tex_height*size_y
         rng_x = size_x+1 if rem_x > 0 else size_x
         rng_y = size_y+1 if rem_y > 0 else size_y
         
-        vert = []
-        indx = []
-        pos = 0
-        for ii in range(rng_x):
-            for jj in range(rng_y):
-                ni = 1 if ii < size_x else rem_x/grid_x
-                nj = 1 if jj < size_y else rem_y/grid_y
-                vert.extend([x+ii*grid_x,      y+jj*grid_y,         0, 1])
-                vert.extend([x+(ii+ni)*grid_x, y+jj*grid_y,        ni, 1])
-                vert.extend([x+(ii+ni)*grid_x, y+(jj+nj)*grid_y,   ni, 1-nj])
-                vert.extend([x+ii*grid_x,      y+(jj+nj)*grid_y,    0, 1-nj])
-                indx.extend([pos,pos+1,pos+2,pos+2,pos+3,pos])
-                pos += 4
-        
-        mesh = Mesh(vertices=vert, indices=indx,mode='triangles',texture=self._texture)
-        if not self._fillcolor is None:
-            self._cache.add(self._fillcolor)
+        # The fraction of the texture in each column and row
+        ii = np.arange(rng_x)
+        jj = np.arange(rng_y)
+        ni = np.where(ii < size_x,1.0,rem_x/tex_width)
+        nj = np.where(jj < size_y,1.0,rem_y/tex_height)
+        ii, jj = [a.ravel() for a in np.meshgrid(ii,jj,indexing='ij')]
+        ni, nj = [a.ravel() for a in np.meshgrid(ni,nj,indexing='ij')]
+        
+        x0 = -width/2.0+ii*tex_width
+        y0 = -height/2.0+jj*tex_height
+        x1 = -width/2.0+(ii+ni)*tex_width
+        y1 = -height/2.0+(jj+nj)*tex_height
+        
+        zero = np.zeros(len(ii))
+        one  = np.ones(len(ii))
+        verts = np.empty((len(ii),4,4))
+        verts[:,:,0] = np.stack((x0,x1,x1,x0),axis=1)
+        verts[:,:,1] = np.stack((y0,y0,y1,y1),axis=1)
+        verts[:,:,2] = np.stack((zero,ni,ni,zero),axis=1)
+        verts[:,:,3] = np.stack((one,one,1-nj,1-nj),axis=1)
+        base = np.arange(len(ii))[:,np.newaxis]*4
+        result = (verts.ravel().tolist(),(base+[0,1,2,2,3,0]).ravel().tolist())
+        
+        if len(cls.MESH_CACHE) >= cls.MESH_CACHE_SIZE:
+            cls.MESH_CACHE.popitem(last=False)
+        cls.MESH_CACHE[key] = result
+        return result
+    
+    def _scroll(self):
+        """
+        Returns the vertices of the single quad used when ``repeat`` is True
+        
+        The texture coordinates go past 0..1, and the texture repeats to fill them.  If
+        the texture did not load, there is no quad.
+        """
+        if self._texture is None:
+            return []
+        x = self.width/2.0
+        y = self.height/2.0
+        u0 = self._offset[0]/self._texture.width
+        v0 = 1-self._offset[1]/self._texture.height
+        u1 = u0+self.width/self._texture.width
+        v1 = v0-self.height/self._texture.height
+        return [-x,-y,u0,v0, x,-y,u1,v0, x,y,u1,v1, -x,y,u0,v1]
+    
+    def _geometry(self):
+        """
+        Returns the vertices and indices of the mesh for the current attributes
+        """
+        if self._texture is None:
+            return ([],[])
+        if self._repeat:
+            return (self._scroll(),[0,1,2,2,3,0])
+        return GTile._tiles(self._texture.width,self._texture.height,self.width,self.height)
+    
+    def _load(self):
+        """
+        Returns the texture for ``source``, or None if there is no source
+        
+        The tiles need the whole texture, not an atlas region.
+        """
+        if self.source is None:
+            return None
+        return GameApp.load_texture(self.source,False,self)
+    
+    def _update_cache(self):
+        """
+        Updates the mesh and color instructions in place.
+        
+        This returns False if the texture has changed.
+        """
+        if not self._load() is self._texture:
+            return False
+        if self._repeat and not self._texture is None:
+            self._texture.wrap = 'repeat'
+        
+        vertices, indices = self._geometry()
+        self._mesh.vertices = vertices
+        self._mesh.indices = indices
+        self._set_ink(self._fillink,self._tint())
+        return True
+    
+    def _reset(self):
+        """
+        Resets the drawing cache.
+        """
+        GObject._reset(self)
+        
+        self._texture = self._load()
+        if self._texture is None:
+            print('Failed to load',repr(self.source))
         else:
-            self._cache.add(Color(1,1,1))
-        self._cache.add(mesh)
+            # Fill the attributes directly, as the cache is being rebuilt
+            if self.width == 0:
+                self._width  = float(self._texture.width)
+            if self.height == 0:
+                self._height = float(self._texture.height)
+            if self._repeat:
+                self._texture.wrap = 'repeat'
+        
+        vertices, indices = self._geometry()
+        self._mesh = Mesh(vertices=vertices, indices=indices,mode='triangles',texture=self._texture)
+        self._fillink = self._add_ink(self._tint())
+        self._cache.add(self._mesh)
         
-        self._cache.add(PopMatrix())
\ No newline at end of file
+        self._cache.add(PopMatrix())
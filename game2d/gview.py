@@ -467,12 +467,40 @@ class GView(FloatLayout):
     :class:`GObject` instances to the :meth:`draw` method.  You must do this every
     animation frame, as the game is constantly clearing the window.
 
+    Alternatively, you can :meth:`add` an object to the view once.  Added objects are
+    not cleared at the start of each frame; they stay on screen (below anything drawn
+    with :meth:`draw`) until you :meth:`remove` them.  They still move and change with
+    their attributes, and you hide and show them with their ``visible`` attribute.
+    A frame that adds and removes nothing costs the view no work at all.
+
     **You should never construct an object of this class**.  Creating a new instance
     of this class will not properly display it on the screen.  Instead, you should
     only use the one provided in the `view` attribute of :class:`GameApp`.
     See the documentation of that class for more information.
     """
 
+    # IMMUTABLE PROPERTIES
+    @property
+    def count(self):
+        """
+        The number of graphics commands drawn since the last clear
+
+        This does not include the objects added with :meth:`add`.
+
+        **Invariant**: Must be an ``int`` >= 0
+        """
+        return len(self._contents)
+
+    @property
+    def retained(self):
+        """
+        The objects added to this view, in drawing order
+
+        **Invariant**: Must be a ``tuple`` of :class:`GObject`
+        """
+        return tuple(self._retained)
+
+
     # BUILT-IN METHODS
     def __init__(self):
         """
@@ -484,6 +512,8 @@ class GView(FloatLayout):
         :class:`GameApp`. See the documentation of that class for more information.
         """
         FloatLayout.__init__(self)
+        self._layer = InstructionGroup()
+        self._retained = {}
         self._frame = InstructionGroup()
         self.bind(pos=self._reset)
         self.bind(size=self._reset)
@@ -511,10 +541,46 @@ class GView(FloatLayout):
         Clears the contents of the view.
 
         This method is called for you automatically at the start of the animation
-        frame.  That way, you are not drawing images on top of one another.
+        frame.  That way, you are not drawing images on top of one another.  It does
+        not remove the objects added with :meth:`add`.
+        """
+        if self._contents:
+            self._frame.clear()
+            self._contents.clear()
+
+    def add(self,obj):
+        """
+        Adds the given object to this view until it is removed.
+
+        The object is drawn every frame, on top of the objects added before it, without
+        any further calls to :meth:`draw`.  Adding an object that is already in this
+        view does nothing.  An object may only be in one view at a time.
+
+        :param obj: the object to add
+        :type obj:  :class:`GObject`
+        """
+        from .gobject import GObject
+        assert isinstance(obj,GObject), '%s is not a GObject' % repr(obj)
+        if obj._slot is None:
+            obj._slot = InstructionGroup()
+            obj._fill_slot()
+            self._layer.add(obj._slot)
+            self._retained[obj] = obj._slot
+        else:
+            assert obj in self._retained, '%s is in another view' % repr(obj)
+
+    def remove(self,obj):
+        """
+        Removes the given object from this view.
+
+        This method does nothing if the object was not added to this view.
+
+        :param obj: the object to remove
+        :type obj:  :class:`GObject`
         """
-        self._frame.clear()
-        self._contents.clear()
+        if obj in self._retained:
+            self._layer.remove(self._retained.pop(obj))
+            obj._slot = None
 
     # HIDDEN METHODS
     def _reset(self,obj=None,value=None):
@@ -526,4 +592,5 @@ class GView(FloatLayout):
         self.canvas.add(Rectangle(pos=self.pos,size=self.size))
         # Work-around for Retina Macs
         self.canvas.add(Scale(dp(1),dp(1),dp(1)))
+        self.canvas.add(self._layer)
         self.canvas.add(self._frame)
@@ -0,0 +1,637 @@
+"""
+Spatial indices for 2D game support.
+
+This module provides data structures for finding the objects near a point or a
+rectangle without checking every object on the screen.  They are broadphase tools:
+they return the objects that *might* overlap a region, and you still need to call
+``contains`` (or your own collision test) on the results.
+"""
+import math
+
+
+class SpatialHash(object):
+    """
+    A class representing a uniform grid spatial hash.
+
+    The plane is divided into square cells of size ``cellsize``.  Each item is stored
+    in every cell that its bounding box touches.  A query only looks at the cells that
+    touch the query box, so the cost of a query depends on the number of items near
+    the query, not on the total number of items in the hash.
+
+    Items may be any hashable value (a :class:`GObject`, an index pair, and so on). The
+    hash does not look at the items; it only stores them with the bounding box they
+    were inserted with.  If an item moves, you must remove it and insert it again.  If
+    all of the items move together (like a formation), it is much faster to leave the
+    hash alone and shift the query box in the opposite direction.
+    """
+
+    # IMMUTABLE PROPERTIES
+    @property
+    def cellsize(self):
+        """
+        The width and height of a single cell.
+
+        **Invariant**: Must be an ``int`` or ``float`` > 0
+        """
+        return self._cellsize
+
+
+    # BUILT-IN METHODS
+    def __init__(self,cellsize):
+        """
+        Creates a new, empty spatial hash.
+
+        The best cell size is usually about the size of the items stored in the hash.
+        Cells that are too small store each item many times, while cells that are too
+        large put many items into each cell.
+
+        :param cellsize: the width and height of a single cell
+        :type cellsize:  ``int`` or ``float`` > 0
+        """
+        assert type(cellsize) in [int,float], '%s is not a number' % repr(cellsize)
+        assert cellsize > 0, '%s is not positive' % repr(cellsize)
+        self._cellsize = float(cellsize)
+        self._cells = {}
+        self._items = {}
+
+    def __len__(self):
+        """
+        :return: The number of items in this hash.
+        :rtype:  ``int``
+        """
+        return len(self._items)
+
+    def __contains__(self,item):
+        """
+        :return: True if ``item`` is in this hash.
+        :rtype:  ``bool``
+        """
+        return item in self._items
+
+
+    # PUBLIC METHODS
+    def insert(self,item,left,bottom,right,top):
+        """
+        Adds an item to this hash with the given bounding box.
+
+        If the item is already in the hash, it is moved to the new bounding box.
+
+        :param item: the item to add
+        :type item:  any hashable value
+
+        :param left: the left edge of the bounding box
+        :type left:  ``int`` or ``float``
+
+        :param bottom: the bottom edge of the bounding box
+        :type bottom:  ``int`` or ``float``
+
+        :param right: the right edge of the bounding box
+        :type right:  ``int`` or ``float`` >= left
+
+        :param top: the top edge of the bounding box
+        :type top:  ``int`` or ``float`` >= bottom
+        """
+        if item in self._items:
+            self.remove(item)
+
+        keys = self._keys(left,bottom,right,top)
+        for key in keys:
+            if key in self._cells:
+                self._cells[key].add(item)
+            else:
+                self._cells[key] = {item}
+        self._items[item] = keys
+
+    def remove(self,item):
+        """
+        Removes an item from this hash.
+
+        This method does nothing if the item is not in the hash.
+
+        :param item: the item to remove
+        :type item:  any hashable value
+        """
+        keys = self._items.pop(item,())
+        for key in keys:
+            cell = self._cells[key]
+            cell.discard(item)
+            if not cell:
+                del self._cells[key]
+
+    def clear(self):
+        """
+        Removes all items from this hash.
+        """
+        self._cells.clear()
+        self._items.clear()
+
+    def query(self,left,bottom,right,top):
+        """
+        Returns the set of items whose cells touch the given box.
+
+        The result is a superset of the items whose bounding boxes overlap the query
+        box.  You still need to test each item to see if it really overlaps.
+
+        :param left: the left edge of the query box
+        :type left:  ``int`` or ``float``
+
+        :param bottom: the bottom edge of the query box
+        :type bottom:  ``int`` or ``float``
+
+        :param right: the right edge of the query box
+        :type right:  ``int`` or ``float`` >= left
+
+        :param top: the top edge of the query box
+        :type top:  ``int`` or ``float`` >= bottom
+
+        :return: The items that might overlap the query box
+        :rtype:  ``set``
+        """
+        result = set()
+        for key in self._keys(left,bottom,right,top):
+            if key in self._cells:
+                result.update(self._cells[key])
+        return result
+
+    def query_point(self,x,y):
+        """
+        Returns the set of items whose cells contain the given point.
+
+        :param x: the horizontal coordinate of the point
+        :type x:  ``int`` or ``float``
+
+        :param y: the vertical coordinate of the point
+        :type y:  ``int`` or ``float``
+
+        :return: The items that might contain the point
+        :rtype:  ``set``
+        """
+        key = (math.floor(x/self._cellsize),math.floor(y/self._cellsize))
+        return set(self._cells.get(key,()))
+
+
+    # HIDDEN METHODS
+    def _keys(self,left,bottom,right,top):
+        """
+        Returns the tuple of cell keys touched by the given box.
+        """
+        size = self._cellsize
+        x0 = math.floor(left/size)
+        x1 = math.floor(right/size)
+        y0 = math.floor(bottom/size)
+        y1 = math.floor(top/size)
+        return tuple((cx,cy) for cx in range(x0,x1+1) for cy in range(y0,y1+1))
+
+
+class AABBTree(object):
+    """
+    A class representing a bounding volume hierarchy of axis-aligned boxes.
+
+    Each item is stored in a leaf with its bounding box.  Each inner node has two
+    children and the smallest box that contains both of them.  A query only descends
+    into nodes whose boxes overlap the query box, so for items spread out over the
+    plane a query takes time logarithmic in the number of items.
+
+    Unlike :class:`SpatialHash`, a tree needs no cell size, and it works well when the
+    items are of very different sizes.  A new item is put next to the leaf whose box
+    grows the least to take it in, and a removed item takes its parent node with it.
+    After either change the nodes above are refitted, and rotated as in an AVL tree if
+    one side has grown too deep, so adding or removing an item takes logarithmic time.
+    Moving an item that is already in the tree (with :meth:`insert`) only refits the
+    boxes of its leaf and the nodes above it.  That keeps the shape of the tree, so if
+    items move far from where they started, call :meth:`rebuild` so that the tree fits
+    them well again.
+
+    As with :class:`SpatialHash`, items may be any hashable value, and a query returns
+    the items whose boxes overlap the query box.
+    """
+
+    # BUILT-IN METHODS
+    def __init__(self):
+        """
+        Creates a new, empty tree.
+        """
+        self._items = {}
+        self._stale = False
+        self._root = -1
+        self._boxes = []
+        self._kids = []
+        self._parents = []
+        self._heights = []
+        self._payload = []
+        self._free = []
+        self._leaves = {}
+
+    def __len__(self):
+        """
+        :return: The number of items in this tree.
+        :rtype:  ``int``
+        """
+        return len(self._items)
+
+    def __contains__(self,item):
+        """
+        :return: True if ``item`` is in this tree.
+        :rtype:  ``bool``
+        """
+        return item in self._items
+
+
+    # PUBLIC METHODS
+    def insert(self,item,left,bottom,right,top):
+        """
+        Adds an item to this tree with the given bounding box.
+
+        If the item is already in the tree, it is moved to the new bounding box.  This
+        refits the tree in place, and does not rebuild it.
+
+        :param item: the item to add
+        :type item:  any hashable value
+
+        :param left: the left edge of the bounding box
+        :type left:  ``int`` or ``float``
+
+        :param bottom: the bottom edge of the bounding box
+        :type bottom:  ``int`` or ``float``
+
+        :param right: the right edge of the bounding box
+        :type right:  ``int`` or ``float`` >= left
+
+        :param top: the top edge of the bounding box
+        :type top:  ``int`` or ``float`` >= bottom
+        """
+        box = (left,bottom,right,top)
+        moved = item in self._items
+        self._items[item] = box
+        if self._stale:
+            return
+        if moved:
+            leaf = self._leaves[item]
+            self._boxes[leaf] = box
+            self._fix(self._parents[leaf],False)
+        else:
+            self._attach(item,box)
+
+    def remove(self,item):
+        """
+        Removes an item from this tree.
+
+        This method does nothing if the item is not in the tree.
+
+        :param item: the item to remove
+        :type item:  any hashable value
+        """
+        if item in self._items:
+            del self._items[item]
+            if not self._stale:
+                self._detach(self._leaves.pop(item))
+
+    def clear(self):
+        """
+        Removes all items from this tree.
+        """
+        self._items.clear()
+        self._stale = True
+
+    def bounds(self):
+        """
+        Returns the smallest box containing every item, or None if the tree is empty.
+
+        :return: The box (left, bottom, right, top) around every item
+        :rtype:  ``tuple`` or ``None``
+        """
+        self._build()
+        return self._boxes[self._root] if self._root >= 0 else None
+
+    def rebuild(self):
+        """
+        Rebuilds this tree from scratch to fit the current boxes of the items.
+        """
+        self._stale = True
+        self._build()
+
+    def query(self,left,bottom,right,top):
+        """
+        Returns the set of items whose boxes overlap the given box.
+
+        Boxes that only touch the query box on an edge count as overlapping.
+
+        :param left: the left edge of the query box
+        :type left:  ``int`` or ``float``
+
+        :param bottom: the bottom edge of the query box
+        :type bottom:  ``int`` or ``float``
+
+        :param right: the right edge of the query box
+        :type right:  ``int`` or ``float`` >= left
+
+        :param top: the top edge of the query box
+        :type top:  ``int`` or ``float`` >= bottom
+
+        :return: The items that overlap the query box
+        :rtype:  ``set``
+        """
+        self._build()
+        result = set()
+        if self._root < 0:
+            return result
+
+        boxes = self._boxes
+        kids  = self._kids
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            box = boxes[node]
+            if box[0] > right or box[2] < left or box[1] > top or box[3] < bottom:
+                continue
+            pair = kids[node]
+            if pair is None:
+                result.add(self._payload[node])
+            else:
+                stack.extend(pair)
+        return result
+
+    def query_point(self,x,y):
+        """
+        Returns the set of items whose boxes contain the given point.
+
+        :param x: the horizontal coordinate of the point
+        :type x:  ``int`` or ``float``
+
+        :param y: the vertical coordinate of the point
+        :type y:  ``int`` or ``float``
+
+        :return: The items whose boxes contain the point
+        :rtype:  ``set``
+        """
+        return self.query(x,y,x,y)
+
+
+    # HIDDEN METHODS
+    def _build(self):
+        """
+        Rebuilds the nodes of the tree after :meth:`clear` or :meth:`rebuild`.
+
+        The nodes are stored in parallel lists: their boxes, their children, their
+        parents, their heights and their items.  The children of an inner node are a
+        list of two node indices, and a leaf has None for children.  Nodes that were
+        removed are kept on a free list to be used again.
+        """
+        if not self._stale:
+            return
+        self._stale = False
+        self._boxes = []
+        self._kids = []
+        self._parents = []
+        self._heights = []
+        self._payload = []
+        self._free = []
+        self._leaves = {}
+        self._root = -1
+        if self._items:
+            self._root = self._split(list(self._items.items()),-1)
+
+    def _node(self,box,kids,parent,height,item=None):
+        """
+        Returns a new node, reusing a removed one if possible.
+
+        :param box: the box of the node
+        :type box:  ``tuple`` (left, bottom, right, top)
+
+        :param kids: the two children of the node, or None for a leaf
+        :type kids:  ``list`` or None
+
+        :param parent: the parent of the node, or -1 for the root
+        :type parent:  ``int``
+
+        :param height: the number of levels below the node
+        :type height:  ``int`` >= 0
+
+        :param item: the item in the node, if it is a leaf
+        :type item:  any hashable value
+        """
+        if self._free:
+            node = self._free.pop()
+            self._boxes[node] = box
+            self._kids[node] = kids
+            self._parents[node] = parent
+            self._heights[node] = height
+            self._payload[node] = item
+            return node
+        self._boxes.append(box)
+        self._kids.append(kids)
+        self._parents.append(parent)
+        self._heights.append(height)
+        self._payload.append(item)
+        return len(self._boxes)-1
+
+    def _split(self,entries,parent):
+        """
+        Returns the node holding the given items, making it and the nodes below it.
+
+        :param entries: the items to put under the node
+        :type entries:  non-empty ``list`` of (item, box) pairs
+
+        :param parent: the parent of the node, or -1 for the root
+        :type parent:  ``int``
+        """
+        if len(entries) == 1:
+            item, box = entries[0]
+            node = self._node(box,None,parent,0,item)
+            self._leaves[item] = node
+            return node
+
+        left   = min(e[1][0] for e in entries)
+        bottom = min(e[1][1] for e in entries)
+        right  = max(e[1][2] for e in entries)
+        top    = max(e[1][3] for e in entries)
+        node = self._node((left,bottom,right,top),None,parent,0)
+
+        # Split the items in half at the median center along the longer axis
+        if right-left >= top-bottom:
+            entries.sort(key=lambda e: e[1][0]+e[1][2])
+        else:
+            entries.sort(key=lambda e: e[1][1]+e[1][3])
+        half = len(entries)//2
+        first  = self._split(entries[:half],node)
+        second = self._split(entries[half:],node)
+        self._kids[node] = [first,second]
+        self._heights[node] = 1+max(self._heights[first],self._heights[second])
+        return node
+
+    def _attach(self,item,box):
+        """
+        Adds a leaf for a new item next to the leaf that fits it best.
+
+        :param item: the new item
+        :type item:  any hashable value
+
+        :param box: the box of the item
+        :type box:  ``tuple`` (left, bottom, right, top)
+        """
+        leaf = self._node(box,None,-1,0,item)
+        self._leaves[item] = leaf
+        if self._root < 0:
+            self._root = leaf
+            return
+
+        # Walk down to the child whose box grows the least
+        node = self._root
+        while not self._kids[node] is None:
+            first, second = self._kids[node]
+            if _growth(self._boxes[first],box) <= _growth(self._boxes[second],box):
+                node = first
+            else:
+                node = second
+
+        parent = self._parents[node]
+        branch = self._node(_union(self._boxes[node],box),[node,leaf],parent,1)
+        self._parents[node] = branch
+        self._parents[leaf] = branch
+        if parent < 0:
+            self._root = branch
+        else:
+            self._replace(parent,node,branch)
+        self._fix(parent,True)
+
+    def _detach(self,leaf):
+        """
+        Removes a leaf, putting its sibling in the place of its parent.
+
+        :param leaf: the leaf to remove
+        :type leaf:  ``int``
+        """
+        parent = self._parents[leaf]
+        self._release(leaf)
+        if parent < 0:
+            self._root = -1
+            return
+
+        first, second = self._kids[parent]
+        sibling = second if first == leaf else first
+        grand = self._parents[parent]
+        self._release(parent)
+        self._parents[sibling] = grand
+        if grand < 0:
+            self._root = sibling
+        else:
+            self._replace(grand,parent,sibling)
+            self._fix(grand,True)
+
+    def _release(self,node):
+        """
+        Puts a node on the free list.
+
+        :param node: the node to free
+        :type node:  ``int``
+        """
+        self._kids[node] = None
+        self._payload[node] = None
+        self._free.append(node)
+
+    def _replace(self,parent,old,new):
+        """
+        Replaces one child of a node with another.
+
+        :param parent: the node to change
+        :type parent:  ``int``
+
+        :param old: the child to replace
+        :type old:  ``int``
+
+        :param new: the child to put in its place
+        :type new:  ``int``
+        """
+        kids = self._kids[parent]
+        kids[kids.index(old)] = new
+
+    def _fix(self,node,balance):
+        """
+        Refits the boxes and heights of a node and every node above it.
+
+        :param node: the lowest node to fix, or -1 for none
+        :type node:  ``int``
+
+        :param balance: whether to rotate nodes whose children differ too much in height
+        :type balance:  ``bool``
+        """
+        while node >= 0:
+            if balance:
+                node = self._rotate(node)
+            first, second = self._kids[node]
+            self._boxes[node] = _union(self._boxes[first],self._boxes[second])
+            self._heights[node] = 1+max(self._heights[first],self._heights[second])
+            node = self._parents[node]
+
+    def _rotate(self,node):
+        """
+        Rotates the deeper child of a node up if the node is out of balance.
+
+        This is the rotation of an AVL tree.  If one child is more than one level deeper
+        than the other, that child takes the place of the node.  The node keeps the
+        shallower child, and takes the shallower grandchild from the deeper one.
+
+        :param node: the node to balance
+        :type node:  ``int``
+
+        :return: the node now in the place of ``node``
+        :rtype:  ``int``
+        """
+        kids = self._kids[node]
+        heights = self._heights
+        if heights[node] < 2:
+            return node
+        first, second = kids
+        if abs(heights[second]-heights[first]) <= 1:
+            return node
+
+        # The deep child moves up, and the node takes its place below it
+        side = 1 if heights[second] > heights[first] else 0
+        deep = kids[side]
+        tall, short = self._kids[deep]
+        if heights[tall] < heights[short]:
+            tall, short = short, tall
+
+        parent = self._parents[node]
+        self._kids[deep] = [node,tall]
+        self._parents[deep] = parent
+        self._parents[node] = deep
+        if parent < 0:
+            self._root = deep
+        else:
+            self._replace(parent,node,deep)
+
+        kids[side] = short
+        self._parents[short] = node
+        self._boxes[node] = _union(self._boxes[kids[0]],self._boxes[kids[1]])
+        heights[node] = 1+max(heights[kids[0]],heights[kids[1]])
+        return deep
+
+
+def _union(a,b):
+    """
+    Returns the smallest box containing boxes a and b
+
+    :param a: the first box
+    :type a:  ``tuple`` (left, bottom, right, top)
+
+    :param b: the second box
+    :type b:  ``tuple`` (left, bottom, right, top)
+    """
+    return (min(a[0],b[0]),min(a[1],b[1]),max(a[2],b[2]),max(a[3],b[3]))
+
+
+def _growth(a,b):
+    """
+    Returns how much the perimeter of box a grows if it is stretched to contain box b
+
+    The perimeter is used rather than the area, so that boxes of no width still count.
+
+    :param a: the box to stretch
+    :type a:  ``tuple`` (left, bottom, right, top)
+
+    :param b: the box to take in
+    :type b:  ``tuple`` (left, bottom, right, top)
+    """
+    c = _union(a,b)
+    return (c[2]-c[0])+(c[3]-c[1])-(a[2]-a[0])-(a[3]-a[1])
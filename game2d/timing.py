@@ -0,0 +1,278 @@
+"""
+Frame timing for 2D game support.
+
+This module provides a class for measuring where the time goes in each animation
+frame.  Attach an instance to the ``timer`` attribute of :class:`GameApp` and it will
+record how long each phase of every frame takes.  Timing is off by default, and costs
+nothing when it is off.
+"""
+import time
+import numpy as np
+from kivy.logger import Logger
+
+
+class FrameTimer(object):
+    """
+    A class recording the duration of each phase of the most recent frames.
+
+    A frame is split into phases, like ``'clear'``, ``'update'`` and ``'draw'``.  The
+    timer keeps a running clock, and each call to :meth:`lap` adds the time since the
+    previous lap to the given phase.  When :class:`GameApp` has a timer, it laps after
+    each phase of :meth:`GameApp._refresh`.  If ``update`` runs more than once in a
+    frame (see ``tickrate``), the time of every run is added together.
+
+    You can split a phase further by adding your own phase names when you create the
+    timer, and calling :meth:`lap` yourself.  For example, to see how long it takes to
+    rebuild labels, lap ``'update'`` just before rebuilding them and ``'labels'`` just
+    after.  The time before the first lap goes to ``'update'`` and the rest goes to
+    ``'labels'``.
+
+    The timer also records the ``dt`` of each frame, the number of updates, and the
+    number of graphics commands drawn.  All of this is stored in a ring buffer of fixed
+    size, so the timer only remembers the most recent ``size`` frames.  If ``interval``
+    is set, the timer logs a :meth:`summary` every ``interval`` frames.
+    """
+    # The phases of GameApp._refresh, in order
+    PHASES = ('clear','prestep','update','poststep','draw')
+
+    # MUTABLE PROPERTIES
+    @property
+    def interval(self):
+        """
+        The number of frames between logged summaries, or None to never log
+
+        **Invariant**: Must be None or an ``int`` > 0
+        """
+        return self._interval
+
+    @interval.setter
+    def interval(self,value):
+        assert value is None or type(value) == int, '%s is not an int' % repr(value)
+        assert value is None or value > 0, '%s is not positive' % repr(value)
+        self._interval = value
+
+
+    # IMMUTABLE PROPERTIES
+    @property
+    def size(self):
+        """
+        The number of frames the ring buffer can hold
+
+        **Invariant**: Must be an ``int`` > 0
+        """
+        return len(self._dt)
+
+    @property
+    def phases(self):
+        """
+        The names of the phases timed, in order
+
+        **Invariant**: Must be a ``tuple`` of ``str``
+        """
+        return self._phases
+
+    @property
+    def frames(self):
+        """
+        The number of frames currently in the ring buffer
+
+        **Invariant**: Must be an ``int`` >= 0 and <= size
+        """
+        return min(self._total,self.size)
+
+    @property
+    def total(self):
+        """
+        The number of frames recorded since the timer was created or reset
+
+        **Invariant**: Must be an ``int`` >= 0
+        """
+        return self._total
+
+
+    # BUILT-IN METHODS
+    def __init__(self,size=600,interval=None,phases=()):
+        """
+        Creates a new, empty frame timer.
+
+        :param size: the number of frames to remember
+        :type size:  ``int`` > 0
+
+        :param interval: the number of frames between logged summaries
+        :type interval:  ``int`` > 0 or None
+
+        :param phases: the names of any phases to time besides :const:`PHASES`
+        :type phases:  ``tuple`` of ``str``
+        """
+        assert type(size) == int and size > 0, '%s is not a valid size' % repr(size)
+        assert all(type(p) == str for p in phases), '%s is not a tuple of str' % repr(phases)
+        self._phases = self.PHASES+tuple(p for p in phases if not p in self.PHASES)
+        self._slots = dict((p,i) for (i,p) in enumerate(self._phases))
+        self._times = np.zeros((size,len(self._phases)))
+        self._dt = np.zeros(size)
+        self._ticks = np.zeros(size,dtype=int)
+        self._commands = np.zeros(size,dtype=int)
+        self._current = np.zeros(len(self._phases))
+        self._index = 0
+        self._total = 0
+        self._mark = None
+        self._dtnow = 0
+        self.interval = interval
+
+    def __len__(self):
+        """
+        :return: The number of frames currently in the ring buffer.
+        :rtype:  ``int``
+        """
+        return self.frames
+
+
+    # PUBLIC METHODS
+    def begin(self,dt):
+        """
+        Starts timing a new frame.
+
+        :param dt: the time in seconds since the last frame
+        :type dt:  ``int`` or ``float``
+        """
+        self._current[:] = 0
+        self._dtnow = dt
+        self._mark = time.perf_counter()
+
+    def lap(self,phase):
+        """
+        Adds the time since the last lap (or :meth:`begin`) to the given phase.
+
+        This method does nothing if no frame is being timed.
+
+        :param phase: the phase to add to
+        :type phase:  one of :attr:`phases`
+        """
+        if self._mark is None:
+            return
+        now = time.perf_counter()
+        self._current[self._slots[phase]] += now-self._mark
+        self._mark = now
+
+    def end(self,commands=0,ticks=1):
+        """
+        Finishes timing the current frame and stores it in the ring buffer.
+
+        :param commands: the number of graphics commands drawn this frame
+        :type commands:  ``int`` >= 0
+
+        :param ticks: the number of times ``update`` was called this frame
+        :type ticks:  ``int`` >= 0
+        """
+        i = self._index
+        self._times[i] = self._current
+        self._dt[i] = self._dtnow
+        self._ticks[i] = ticks
+        self._commands[i] = commands
+        self._index = (i+1) % self.size
+        self._total += 1
+        self._mark = None
+        if self._interval and self._total % self._interval == 0:
+            self.log()
+
+    def reset(self):
+        """
+        Forgets every frame recorded so far.
+        """
+        self._index = 0
+        self._total = 0
+        self._mark = None
+
+    def times(self,phase=None):
+        """
+        Returns the recorded durations (in seconds) of a phase, oldest first
+
+        If ``phase`` is None, this returns the duration of each whole frame instead.
+
+        :param phase: the phase to look up
+        :type phase:  one of :attr:`phases` or None
+
+        :return: the duration of the phase in each frame in the buffer
+        :rtype:  ``numpy.ndarray``
+        """
+        rows = self._order()
+        if phase is None:
+            return self._times[rows].sum(axis=1)
+        return self._times[rows,self._slots[phase]]
+
+    def dts(self):
+        """
+        :return: the ``dt`` of each frame in the buffer, oldest first
+        :rtype:  ``numpy.ndarray``
+        """
+        return self._dt[self._order()]
+
+    def ticks(self):
+        """
+        :return: the number of updates in each frame in the buffer, oldest first
+        :rtype:  ``numpy.ndarray``
+        """
+        return self._ticks[self._order()]
+
+    def commands(self):
+        """
+        :return: the number of commands drawn in each frame in the buffer, oldest first
+        :rtype:  ``numpy.ndarray``
+        """
+        return self._commands[self._order()]
+
+    def summary(self):
+        """
+        Returns a dictionary summarizing the frames in the buffer.
+
+        There is one key for each phase, plus ``'frame'`` for whole frames and ``'dt'``
+        for the time between frames.  Each value is a dictionary with the keys
+        ``'mean'``, ``'p50'``, ``'p99'`` and ``'max'``, in milliseconds.  There are also
+        the keys ``'frames'``, ``'ticks'`` (the mean updates per frame) and
+        ``'commands'`` (the mean commands drawn per frame).
+
+        :return: the summary of the frames in the buffer
+        :rtype:  ``dict``
+        """
+        result = {'frames': self.frames}
+        if self.frames == 0:
+            return result
+        for phase in self._phases:
+            result[phase] = self._stats(self.times(phase))
+        result['frame'] = self._stats(self.times())
+        result['dt'] = self._stats(self.dts())
+        result['ticks'] = float(self.ticks().mean())
+        result['commands'] = float(self.commands().mean())
+        return result
+
+    def log(self):
+        """
+        Logs the :meth:`summary` of the frames in the buffer with the Kivy logger.
+        """
+        data = self.summary()
+        if data['frames'] == 0:
+            return
+        Logger.info('FrameTimer: %d frames, %.2f updates and %.1f commands per frame' %
+                    (data['frames'],data['ticks'],data['commands']))
+        for key in ('frame','dt')+self._phases:
+            stats = data[key]
+            Logger.info('FrameTimer: %-8s mean %7.3f  p50 %7.3f  p99 %7.3f  max %7.3f ms' %
+                        (key,stats['mean'],stats['p50'],stats['p99'],stats['max']))
+
+
+    # HIDDEN METHODS
+    def _order(self):
+        """
+        Returns the indices of the frames in the buffer, oldest first
+        """
+        if self._total < self.size:
+            return np.arange(self._total)
+        return np.roll(np.arange(self.size),-self._index)
+
+    def _stats(self,values):
+        """
+        Returns the mean, p50, p99 and max of values (in seconds) in milliseconds
+        """
+        ms = values*1000
+        return {'mean': float(ms.mean()), 'p50': float(np.percentile(ms,50)),
+                'p99': float(np.percentile(ms,99)), 'max': float(ms.max())}
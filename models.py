@@ -7,16 +7,13 @@ the aliens.
 
 Just because something is a model does not mean there has to be a special
 class for it. Unless you need something special for your extra gameplay
-features, Ship and Aliens could just be an instance of GImage that you move
-across the screen. You only need a new class when you add extra features to
-an object. So technically Bolt, which has a velocity, is really the only model
-that needs to have its own class.
+features, Ship could just be an instance of GImage that you move across the
+screen. You only need a new class when you add extra features to an object.
 
-With that said, we have included the subclasses for Ship and Aliens. That is
-because there are a lot of constants in consts.py for initializing the
-objects, and you might want to add a custom initializer.  With that said,
-feel free to keep the pass underneath the class definitions if you do not want
-to do that.
+The aliens do not have a class of their own. Formation keeps all of them in
+NumPy arrays and draws them with sprite batches, and the bolts are stored the
+same way in BoltArray. Ship keeps its subclass because there are a lot of
+constants in consts.py for initializing it.
 
 You are free to add even more models to this module.  You may wish to do this
 when you add new features to your game, such as power-ups.  If you are unsure
@@ -27,6 +24,7 @@ about whether to make a new class or not, please ask on Piazza.
 """
 from consts import *
 from game2d import *
+import numpy as np
 
 # PRIMARY RULE: Models are not allowed to access anything in any module other
 # than consts.py.  If you need extra information from Gameplay, then it should
@@ -46,12 +44,8 @@ class Ship(GImage):
     you want to prevent the player from moving the ship offscreen.  This
     is an ideal thing to do in a method.
 
-    You also MIGHT want to add code to detect a collision with a bolt. We
-    do not require this.  You could put this method in Wave if you wanted to.
-    But the advantage of putting it here is that Ships and Aliens collide
-    with different bolts.  Ships collide with Alien bolts, not Ship bolts.
-    And Aliens collide with Ship bolts, not Alien bolts. An easy way to
-    keep this straight is for this class to have its own collision method.
+    Collisions with bolts are not checked here. Wave tests all of the alien
+    bolts against the ship at once with BoltArray.findHit.
 
     However, there is no need for any more attributes other than those
     inherited by GImage. You would only add attributes if you needed them
@@ -75,75 +69,280 @@ class Ship(GImage):
         super().__init__(x=xi, y=yi, width= SHIP_WIDTH, height= SHIP_HEIGHT,\
                                                             source=sourcei)
 
-    def collidesShip(self,bolt):
+
+class Formation(object):
+    """
+    A class to represent the whole formation of aliens in a wave.
+
+    The positions, types and living status of the aliens are stored in NumPy
+    arrays, with one entry for each (row, collumn) of the formation. Row 0 is
+    the top row.
+
+    The aliens are drawn with one GBatch for each image in ALIEN_IMAGES, so
+    the whole formation takes one draw call per type of alien. The batches
+    are the children of a single GScene. The positions of the aliens (in the
+    batches and in the arrays) are local to that scene and never change.
+    Marching the formation only moves the scene, which is a single Kivy
+    Translate no matter how many aliens there are. To get the screen position
+    of an alien, add the scene offset to its local position.
+    """
+    # HIDDEN ATTRIBUTES:
+    # Attribute _batches: the sprite batch for each type of alien
+    # Invariant: _batches is a list of GBatch objects, one for each image in
+    # ALIEN_IMAGES. Batch k has a quad for every alien with _kind k, in row
+    # major order, and draws exactly the living ones.
+    #
+    # Attribute _scene: the parent node of the alien batches
+    # Invariant: _scene is a GScene whose children are the GBatch objects in
+    # _batches. Its x and y are how far the formation has marched.
+    #
+    # Attribute _x: the local x-coordinate of the center of each alien
+    # Invariant: _x is a float array with shape (rows, cols)
+    #
+    # Attribute _y: the local y-coordinate of the center of each alien
+    # Invariant: _y is a float array with shape (rows, cols)
+    #
+    # Attribute _kind: the type of each alien, as a position in ALIEN_IMAGES
+    # Invariant: _kind is an int array with shape (rows, cols)
+    #
+    # Attribute _alive: whether each alien is still alive
+    # Invariant: _alive is a bool array with shape (rows, cols)
+    #
+    # Attribute _hash: the spatial hash of the living aliens, keyed by their
+    # (row, collumn) in local coordinates
+    # Invariant: _hash is a SpatialHash containing (row, col) tuples
+    #
+    # Attribute _count: the number of living aliens
+    # Invariant: _count is an int >= 0, equal to the number of True in _alive
+    #
+    # Attribute _rowCount: the number of living aliens in each row
+    # Invariant: _rowCount is a list of ints >= 0, one for each row
+    #
+    # Attribute _colCount: the number of living aliens in each collumn
+    # Invariant: _colCount is a list of ints >= 0, one for each collumn
+    #
+    # Attribute _left: the leftmost collumn with a living alien
+    # Invariant: _left is an int, the smallest col with _colCount[col] > 0
+    # (or getCols() if the formation is empty)
+    #
+    # Attribute _right: the rightmost collumn with a living alien
+    # Invariant: _right is an int, the largest col with _colCount[col] > 0
+    # (or -1 if the formation is empty)
+    #
+    # Attribute _bottom: the lowest row with a living alien
+    # Invariant: _bottom is an int, the largest row with _rowCount[row] > 0
+    # (or -1 if the formation is empty)
+    #
+    # The counts and edges are only updated when an alien dies, so checking
+    # the edges of the formation never has to scan it.
+
+    def __init__(self, rows=ALIEN_ROWS, cols=ALIENS_IN_ROW):
         """
-        Returns True if the player bolt collides with this ship
+        Initializes a full formation of aliens at the top of the screen
 
-        Parameter bolt: The laser bolt to check
-        Precondition: bolt is of class Bolt
+        Parameter rows: the number of rows in the formation
+        Precondition: rows is an int > 0
+
+        Parameter cols: the number of collumns in the formation
+        Precondition: cols is an int > 0
+        """
+        r = np.arange(rows)
+        c = np.arange(cols)
+        yval = GAME_HEIGHT-(ALIEN_CEILING+(r+1/2)*ALIEN_HEIGHT+r*ALIEN_V_SEP)
+        xval = ALIEN_H_SEP*(c+1)+ALIEN_WIDTH*(c+1/2)
+        self._x = np.tile(xval.astype(float), (rows, 1))
+        self._y = np.tile(yval.astype(float)[:, np.newaxis], (1, cols))
+        # One row of ALIEN_IMAGES[0], then two rows each of [1], [2] and [0]
+        self._kind = np.tile((((r+1)%6)//2)[:, np.newaxis], (1, cols))
+        self._alive = np.ones((rows, cols), dtype=bool)
+        self._count = rows*cols
+        self._rowCount = [cols]*rows
+        self._colCount = [rows]*cols
+        self._left = 0
+        self._right = cols-1
+        self._bottom = rows-1
+
+        self._hash = SpatialHash(ALIEN_CELL)
+        for row in range(rows):
+            for col in range(cols):
+                x = float(self._x[row, col])
+                y = float(self._y[row, col])
+                self._hash.insert((row, col), x-ALIEN_WIDTH/2, \
+                        y-ALIEN_HEIGHT/2, x+ALIEN_WIDTH/2, y+ALIEN_HEIGHT/2)
+        self._batches = []
+        for kind in range(len(ALIEN_IMAGES)):
+            where = self._kind == kind
+            self._batches.append(GBatch(source = ALIEN_IMAGES[kind], \
+                    quadsize = (ALIEN_WIDTH, ALIEN_HEIGHT), positions = \
+                    np.stack((self._x[where], self._y[where]), axis=1)))
+        self._scene = GScene(children = self._batches)
+
+    def getRows(self):
         """
-        if self.contains((bolt.x + BOLT_WIDTH/2, bolt.y + BOLT_HEIGHT/2)):
-            return True
-        elif self.contains((bolt.x + BOLT_WIDTH/2, bolt.y - BOLT_HEIGHT/2)):
-            return True
-        elif self.contains((bolt.x - BOLT_WIDTH/2, bolt.y + BOLT_HEIGHT/2)):
-            return True
-        elif self.contains((bolt.x - BOLT_WIDTH/2, bolt.y - BOLT_HEIGHT/2)):
-            return True
-        return False
+        returns the number of rows in the formation
+        """
+        return self._alive.shape[0]
 
+    def getCols(self):
+        """
+        returns the number of collumns in the formation
+        """
+        return self._alive.shape[1]
 
-class Alien(GImage):
-    """
-    A class to represent a single alien.
+    def getSource(self, row, col):
+        """
+        returns the image file of the alien at (row, col)
 
-    At the very least, you want a __init__ method to initialize the alien
-    dimensions. These dimensions are all specified in consts.py.
+        Parameter row: the row of the alien
+        Precondition: row is an int >= 0 and < getRows()
 
-    You also MIGHT want to add code to detect a collision with a bolt. We
-    do not require this.  You could put this method in Wave if you wanted to.
-    But the advantage of putting it here is that Ships and Aliens collide
-    with different bolts.  Ships collide with Alien bolts, not Ship bolts.
-    And Aliens collide with Ship bolts, not Alien bolts. An easy way to
-    keep this straight is for this class to have its own collision method.
+        Parameter col: the collumn of the alien
+        Precondition: col is an int >= 0 and < getCols()
+        """
+        return ALIEN_IMAGES[self._kind[row, col]]
 
-    However, there is no need for any more attributes other than those
-    inherited by GImage. You would only add attributes if you needed them
-    for extra gameplay features (like giving each alien a score value).
-    """
+    def getCount(self):
+        """
+        returns the number of living aliens
+        """
+        return self._count
 
-    def __init__(self, xi, yi, sourcei):
+    def isEmpty(self):
+        """
+        returns True if every alien has been destroyed
         """
-        Initializes an alien object
+        return self._count == 0
 
-        Parameter xi: the x value of the alien
-        Precondition: xi is a number > 0
+    def isColAlive(self, col):
+        """
+        returns True if the collumn col has at least one living alien
 
-        Parameter yi: the y value of the alien
-        Precondition: yi is a number > 0
+        Parameter col: the collumn to check
+        Precondition: col is an int >= 0 and < getCols()
+        """
+        return self._colCount[col] > 0
 
-        Parameter sourcei: the alien image
-        Precondition: sourci is a png file
+    def isRowAlive(self, row):
+        """
+        returns True if the row has at least one living alien
+
+        Parameter row: the row to check
+        Precondition: row is an int >= 0 and < getRows()
+        """
+        return self._rowCount[row] > 0
+
+    def getMinX(self):
+        """
+        returns the x-coordinate of the center of the leftmost living alien
+
+        The formation must not be empty.
+        """
+        return float(self._x[0, self._left]) + self._scene.x
+
+    def getMaxX(self):
+        """
+        returns the x-coordinate of the center of the rightmost living alien
+
+        The formation must not be empty.
+        """
+        return float(self._x[0, self._right]) + self._scene.x
+
+    def getMinY(self):
+        """
+        returns the y-coordinate of the center of the lowest living alien
+
+        The formation must not be empty.
+        """
+        return float(self._y[self._bottom, 0]) + self._scene.y
+
+    def getLowest(self, col):
+        """
+        returns the (x, y) center of the lowest living alien in collumn col
+
+        Parameter col: the collumn to check
+        Precondition: col is an int >= 0 and < getCols(), and isColAlive(col)
+        """
+        row = np.flatnonzero(self._alive[:, col])[-1]
+        return (float(self._x[row, col]) + self._scene.x, \
+                                    float(self._y[row, col]) + self._scene.y)
+
+    def step(self, dx, dy):
+        """
+        Moves every alien in the formation by (dx, dy)
+
+        Parameter dx: the horizontal distance to move
+        Precondition: dx is an int or float
+
+        Parameter dy: the vertical distance to move
+        Precondition: dy is an int or float
+        """
+        self._scene.x = self._scene.x + dx
+        self._scene.y = self._scene.y + dy
+
+    def kill(self, row, col):
+        """
+        Destroys the alien at (row, col)
+
+        Parameter row: the row of the alien
+        Precondition: row is an int >= 0 and < getRows()
+
+        Parameter col: the collumn of the alien
+        Precondition: col is an int >= 0 and < getCols()
+        """
+        self._alive[row, col] = False
+        self._hash.remove((row, col))
+        kind = self._kind[row, col]
+        self._batches[kind].mask = self._alive[self._kind == kind]
+
+        # Only move an edge when its last alien dies
+        self._count = self._count - 1
+        self._rowCount[row] = self._rowCount[row] - 1
+        self._colCount[col] = self._colCount[col] - 1
+        while self._left < self.getCols() and self._colCount[self._left] == 0:
+            self._left = self._left + 1
+        while self._right >= 0 and self._colCount[self._right] == 0:
+            self._right = self._right - 1
+        while self._bottom >= 0 and self._rowCount[self._bottom] == 0:
+            self._bottom = self._bottom - 1
+
+    def collide(self, x, y):
         """
-        super().__init__(x=xi, y=yi, width= ALIEN_WIDTH, height= ALIEN_HEIGHT,\
-                                                                source=sourcei)
+        returns the (row, col) of a living alien hit by a bolt at (x, y), or
+        None if the bolt does not hit any alien
+
+        The bolt is moved into the local coordinates of the formation with the
+        transform of the scene. Then only the aliens that share a cell of the
+        spatial hash with the bolt are tested.
 
-    def collidesAlien(self,bolt):
+        Parameter x: the x-coordinate of the center of the bolt
+        Precondition: x is an int or float
+
+        Parameter y: the y-coordinate of the center of the bolt
+        Precondition: y is an int or float
+        """
+        center = self._scene.transform((x, y))
+        left = center.x - BOLT_WIDTH/2
+        bottom = center.y - BOLT_HEIGHT/2
+        candidates = self._hash.query(left, bottom, left + BOLT_WIDTH, \
+                                                        bottom + BOLT_HEIGHT)
+        for (row, col) in sorted(candidates):
+            # A corner of the bolt is inside the alien
+            dx = min(abs(center.x + BOLT_WIDTH/2 - self._x[row, col]), \
+                            abs(center.x - BOLT_WIDTH/2 - self._x[row, col]))
+            dy = min(abs(center.y + BOLT_HEIGHT/2 - self._y[row, col]), \
+                            abs(center.y - BOLT_HEIGHT/2 - self._y[row, col]))
+            if dx < ALIEN_WIDTH/2 and dy < ALIEN_HEIGHT/2:
+                return (row, col)
+        return None
+
+    def draw(self, view):
         """
-        Returns True if the player bolt collides with this alien
+        Draws the living aliens
 
-        Parameter bolt: The laser bolt to check
-        Precondition: bolt is of class Bolt
+        Parameter view: the game view, used in drawing
+        Precondition: view is an instance of GView
         """
-        if self.contains((bolt.x + BOLT_WIDTH/2, bolt.y + BOLT_HEIGHT/2)):
-            return True
-        elif self.contains((bolt.x + BOLT_WIDTH/2, bolt.y - BOLT_HEIGHT/2)):
-            return True
-        elif self.contains((bolt.x - BOLT_WIDTH/2, bolt.y + BOLT_HEIGHT/2)):
-            return True
-        elif self.contains((bolt.x - BOLT_WIDTH/2, bolt.y - BOLT_HEIGHT/2)):
-            return True
-        return False
+        self._scene.draw(view)
 
 
 class Bolt(GRectangle):
@@ -171,6 +370,9 @@ class Bolt(GRectangle):
     # INSTANCE ATTRIBUTES:
     # Attribute _velocity: the velocity in y direction
     # Invariant: _velocity is an int or float
+    #
+    # Attribute _color: the name of the fill color of the bolt
+    # Invariant: _color is a string naming a valid color
 
     def __init__(self, xi, yi, widthi, heighti, fillcolori = 'blue'):
         """
@@ -192,3 +394,423 @@ class Bolt(GRectangle):
                                                     fillcolor = fillcolori)
 
         self._velocity = BOLT_SPEED
+        self._color = fillcolori
+
+    def getVelocity(self):
+        """
+        returns the velocity of the bolt in the y direction
+        """
+        return self._velocity
+
+    def getColor(self):
+        """
+        returns the name of the fill color of the bolt
+        """
+        return self._color
+
+    def reset(self, xi, yi, velocityi, fillcolori):
+        """
+        Reuses this bolt as if it had just been fired
+
+        The fill color is only changed if it is different, since changing it
+        rebuilds the drawing cache of the bolt.
+
+        Parameter xi: the x value of the bolt
+        Precondition: xi is a number > 0
+
+        Parameter yi: the y value of the bolt
+        Precondition: yi is a number > 0
+
+        Parameter velocityi: the velocity of the bolt in the y direction
+        Precondition: velocityi is an int or float
+
+        Parameter fillcolori: the name of the fill color of the bolt
+        Precondition: fillcolori is a string naming a valid color
+        """
+        self.x = xi
+        self.y = yi
+        self._velocity = velocityi
+        if fillcolori != self._color:
+            self.fillcolor = fillcolori
+            self._color = fillcolori
+
+
+class BoltPool(object):
+    """
+    A class to recycle Bolt objects instead of making new ones.
+
+    Every Bolt is a GRectangle with its own Kivy instructions, so creating
+    one for every shot (and throwing it away when it leaves the screen) makes
+    a lot of garbage during heavy firing. Instead, bolts are released to this
+    pool when they are done, and acquired from it when a new bolt is fired.
+
+    Free bolts are kept separately for each color, so that a recycled bolt
+    never has to rebuild its drawing cache. At most cap free bolts are kept;
+    any bolt released beyond that is left for the garbage collector.
+
+    The pool counts a hit every time it hands out a recycled bolt and a miss
+    every time it has to create a new one.
+    """
+    # HIDDEN ATTRIBUTES:
+    # Attribute _free: the free bolts, by the name of their color
+    # Invariant: _free is a dictionary of strings to lists of Bolt objects
+    #
+    # Attribute _size: the total number of free bolts
+    # Invariant: _size is an int >= 0 and <= _cap
+    #
+    # Attribute _cap: the largest number of free bolts to keep
+    # Invariant: _cap is an int >= 0
+    #
+    # Attribute _hits: the number of bolts handed out from the pool
+    # Invariant: _hits is an int >= 0
+    #
+    # Attribute _misses: the number of bolts created because the pool was empty
+    # Invariant: _misses is an int >= 0
+
+    def getCap(self):
+        """
+        returns the largest number of free bolts the pool keeps
+        """
+        return self._cap
+
+    def setCap(self, value):
+        """
+        sets the largest number of free bolts the pool keeps
+
+        If there are more free bolts than the new cap, the extras are dropped.
+
+        Parameter value: the new cap
+        Precondition: value is an int >= 0
+        """
+        assert type(value) == int and value >= 0, repr(value)+' is not valid'
+        self._cap = value
+        for color in self._free:
+            while self._size > self._cap and len(self._free[color]) > 0:
+                self._free[color].pop()
+                self._size = self._size - 1
+
+    def getHits(self):
+        """
+        returns the number of bolts handed out from the pool
+        """
+        return self._hits
+
+    def getMisses(self):
+        """
+        returns the number of bolts created because the pool was empty
+        """
+        return self._misses
+
+    def getSize(self):
+        """
+        returns the number of free bolts in the pool
+        """
+        return self._size
+
+    def __init__(self, cap=BOLT_POOL_CAP):
+        """
+        Initializes an empty bolt pool
+
+        Parameter cap: the largest number of free bolts to keep
+        Precondition: cap is an int >= 0
+        """
+        self._free = {}
+        self._size = 0
+        self._cap = 0
+        self._hits = 0
+        self._misses = 0
+        self.setCap(cap)
+
+    def acquire(self, xi, yi, velocityi, fillcolori = 'blue'):
+        """
+        returns a bolt at (xi, yi) with the given velocity and color
+
+        The bolt is recycled from the pool if possible, and is new otherwise.
+
+        Parameter xi: the x value of the bolt
+        Precondition: xi is a number > 0
+
+        Parameter yi: the y value of the bolt
+        Precondition: yi is a number > 0
+
+        Parameter velocityi: the velocity of the bolt in the y direction
+        Precondition: velocityi is an int or float
+
+        Parameter fillcolori: the name of the fill color of the bolt
+        Precondition: fillcolori is a string naming a valid color
+        """
+        free = self._free.get(fillcolori)
+        if free:
+            bolt = free.pop()
+            self._size = self._size - 1
+            self._hits = self._hits + 1
+            bolt.reset(xi, yi, velocityi, fillcolori)
+            return bolt
+
+        self._misses = self._misses + 1
+        bolt = Bolt(xi = xi, yi = yi, widthi = BOLT_WIDTH, \
+                                heighti = BOLT_HEIGHT, fillcolori = fillcolori)
+        bolt._velocity = velocityi
+        return bolt
+
+    def release(self, bolt):
+        """
+        Returns a bolt that is no longer on screen to the pool
+
+        The bolt must not be used again until it is acquired from the pool.
+
+        Parameter bolt: the bolt to release
+        Precondition: bolt is a Bolt object
+        """
+        if self._size < self._cap:
+            color = bolt.getColor()
+            if color in self._free:
+                self._free[color].append(bolt)
+            else:
+                self._free[color] = [bolt]
+            self._size = self._size + 1
+
+
+class BoltArray(object):
+    """
+    A class to represent all of the laser bolts on screen.
+
+    The bolts are stored as a structure of arrays: one NumPy array each for
+    the x and y coordinates, the velocity, the owner (BOLT_PLAYER or
+    BOLT_ALIEN) and an active flag. The first getSize() entries are the bolts
+    in play, in the order they were fired. Moving the bolts and removing the
+    ones that leave the screen are each a single vectorized pass, so hundreds
+    of bolts cost about the same as a few.
+
+    Each bolt also has a Bolt sprite, acquired from a BoltPool when the bolt
+    is fired and released back to it when the bolt is removed. The sprites
+    are only moved to match the arrays when the bolts are drawn, so all the
+    game logic must use the arrays and never the sprite positions.
+
+    The arrays also remember where each bolt was before the last move. This
+    lets draw place the sprites part of the way between the last two moves,
+    so the bolts look smooth when the game is drawn less often than it is
+    updated.
+    """
+    # HIDDEN ATTRIBUTES:
+    # Attribute _x: the x-coordinate of each bolt
+    # Invariant: _x is a float array with one entry per slot
+    #
+    # Attribute _y: the y-coordinate of each bolt
+    # Invariant: _y is a float array with one entry per slot
+    #
+    # Attribute _py: the y-coordinate of each bolt before the last move
+    # Invariant: _py is a float array with one entry per slot
+    #
+    # Attribute _v: the velocity in the y direction of each bolt
+    # Invariant: _v is a float array with one entry per slot
+    #
+    # Attribute _owner: who fired each bolt
+    # Invariant: _owner is an int array with one entry per slot, each
+    # BOLT_PLAYER or BOLT_ALIEN
+    #
+    # Attribute _active: whether each bolt is still in play
+    # Invariant: _active is a bool array with one entry per slot. It is only
+    # False in the first _size entries between a removal and _compact.
+    #
+    # Attribute _size: the number of slots in use
+    # Invariant: _size is an int >= 0 and <= len(_x)
+    #
+    # Attribute _sprites: the sprite for each bolt in play
+    # Invariant: _sprites is a list of Bolt objects of length _size
+    #
+    # Attribute _pool: the pool to acquire and release sprites
+    # Invariant: _pool is a BoltPool object
+
+    def __init__(self, pool, capacity=BOLT_CAPACITY):
+        """
+        Initializes an empty set of bolts
+
+        Parameter pool: the pool to acquire and release sprites
+        Precondition: pool is a BoltPool object
+
+        Parameter capacity: the number of bolts to make room for
+        Precondition: capacity is an int > 0
+        """
+        self._x = np.zeros(capacity)
+        self._y = np.zeros(capacity)
+        self._py = np.zeros(capacity)
+        self._v = np.zeros(capacity)
+        self._owner = np.zeros(capacity, dtype=int)
+        self._active = np.zeros(capacity, dtype=bool)
+        self._size = 0
+        self._sprites = []
+        self._pool = pool
+
+    def getSize(self):
+        """
+        returns the number of bolts in play
+        """
+        return self._size
+
+    def count(self, owner):
+        """
+        returns the number of bolts in play fired by owner
+
+        Parameter owner: who fired the bolts
+        Precondition: owner is BOLT_PLAYER or BOLT_ALIEN
+        """
+        n = self._size
+        return int(np.count_nonzero(self._active[:n] & \
+                                                (self._owner[:n] == owner)))
+
+    def fire(self, x, y, velocity, owner):
+        """
+        Adds a new bolt at (x, y)
+
+        Parameter x: the x value of the bolt
+        Precondition: x is an int or float
+
+        Parameter y: the y value of the bolt
+        Precondition: y is an int or float
+
+        Parameter velocity: the velocity of the bolt in the y direction
+        Precondition: velocity is an int or float
+
+        Parameter owner: who fired the bolt
+        Precondition: owner is BOLT_PLAYER or BOLT_ALIEN
+        """
+        if self._size == len(self._x):
+            self._grow()
+        i = self._size
+        self._x[i] = x
+        self._y[i] = y
+        self._py[i] = y
+        self._v[i] = velocity
+        self._owner[i] = owner
+        self._active[i] = True
+        self._sprites.append(self._pool.acquire(xi = x, yi = y, \
+                        velocityi = velocity, fillcolori = BOLT_COLORS[owner]))
+        self._size = i + 1
+
+    def move(self, scale=1.0):
+        """
+        Moves every bolt by its velocity and removes those off the screen
+
+        Parameter scale: the fraction of the velocity to move by
+        Precondition: scale is an int or float >= 0
+        """
+        n = self._size
+        self._py[:n] = self._y[:n]
+        self._y[:n] += self._v[:n]*scale
+        self._active[:n] &= (self._y[:n] - BOLT_HEIGHT/2 <= GAME_HEIGHT) & \
+                                            (self._y[:n] + BOLT_HEIGHT/2 >= 0)
+        self._compact()
+
+    def remove(self, i):
+        """
+        Removes the bolt at position i
+
+        The bolts after i move down one position.
+
+        Parameter i: the position of the bolt
+        Precondition: i is an int >= 0 and < getSize()
+        """
+        self._active[i] = False
+        self._compact()
+
+    def findHit(self, x, y, width, height, owner):
+        """
+        returns the position of the first bolt fired by owner that has a
+        corner inside the given rectangle, or None if there is no such bolt
+
+        Parameter x: the x-coordinate of the center of the rectangle
+        Precondition: x is an int or float
+
+        Parameter y: the y-coordinate of the center of the rectangle
+        Precondition: y is an int or float
+
+        Parameter width: the width of the rectangle
+        Precondition: width is an int or float > 0
+
+        Parameter height: the height of the rectangle
+        Precondition: height is an int or float > 0
+
+        Parameter owner: who fired the bolts to check
+        Precondition: owner is BOLT_PLAYER or BOLT_ALIEN
+        """
+        n = self._size
+        bx = self._x[:n]
+        by = self._y[:n]
+        dx = np.minimum(np.abs(bx + BOLT_WIDTH/2 - x), \
+                                            np.abs(bx - BOLT_WIDTH/2 - x))
+        dy = np.minimum(np.abs(by + BOLT_HEIGHT/2 - y), \
+                                            np.abs(by - BOLT_HEIGHT/2 - y))
+        hits = np.flatnonzero(self._active[:n] & (self._owner[:n] == owner) & \
+                                        (dx < width/2) & (dy < height/2))
+        if len(hits) == 0:
+            return None
+        return int(hits[0])
+
+    def getPositions(self, owner):
+        """
+        returns a list of (i, x, y) for every bolt in play fired by owner
+
+        Parameter owner: who fired the bolts
+        Precondition: owner is BOLT_PLAYER or BOLT_ALIEN
+        """
+        n = self._size
+        return [(int(i), float(self._x[i]), float(self._y[i])) for i in \
+            np.flatnonzero(self._active[:n] & (self._owner[:n] == owner))]
+
+    def draw(self, view, alpha=1.0):
+        """
+        Moves the sprites to match the bolts and draws them
+
+        Each sprite is placed alpha of the way from where its bolt was before
+        the last move to where it is now.
+
+        Parameter view: the game view, used in drawing
+        Precondition: view is an instance of GView
+
+        Parameter alpha: how far to place the sprites between the last moves
+        Precondition: alpha is an int or float >= 0 and <= 1
+        """
+        n = self._size
+        y = self._py[:n] + (self._y[:n] - self._py[:n])*alpha
+        for i in range(n):
+            sprite = self._sprites[i]
+            sprite.y = float(y[i])
+            sprite.draw(view)
+
+    def _compact(self):
+        """
+        Removes every inactive bolt, keeping the rest in order
+
+        The sprites of the removed bolts are released to the pool.
+        """
+        n = self._size
+        keep = np.flatnonzero(self._active[:n])
+        k = len(keep)
+        if k == n:
+            return
+        for i in np.flatnonzero(~self._active[:n]):
+            self._pool.release(self._sprites[i])
+        self._sprites = [self._sprites[i] for i in keep]
+        self._x[:k] = self._x[keep]
+        self._y[:k] = self._y[keep]
+        self._py[:k] = self._py[keep]
+        self._v[:k] = self._v[keep]
+        self._owner[:k] = self._owner[keep]
+        self._active[:k] = True
+        self._active[k:n] = False
+        self._size = k
+
+    def _grow(self):
+        """
+        Doubles the number of slots in the arrays
+        """
+        extra = len(self._x)
+        self._x = np.concatenate((self._x, np.zeros(extra)))
+        self._y = np.concatenate((self._y, np.zeros(extra)))
+        self._py = np.concatenate((self._py, np.zeros(extra)))
+        self._v = np.concatenate((self._v, np.zeros(extra)))
+        self._owner = np.concatenate((self._owner, \
+                                            np.zeros(extra, dtype=int)))
+        self._active = np.concatenate((self._active, \
+                                            np.zeros(extra, dtype=bool)))
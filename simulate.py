@@ -0,0 +1,165 @@
+"""
+Headless simulation driver for Alien Invaders
+
+This module drives a Wave from a plain Python loop instead of the Kivy Clock.
+It replaces GInput with a scripted input object and uses a fixed time step,
+so the game runs as fast as the CPU allows. This is intended for soak tests,
+balancing runs and CI benchmarks on machines with no GPU.
+
+The Kivy window is still created (GImage needs an OpenGL context to load its
+textures), but it is hidden and never drawn to. A software renderer like
+Mesa llvmpipe is enough.
+
+Run it from the command line like the game itself
+
+    python simulate.py 5 12 1.0 10000
+
+The first three arguments are the rows, aliens per row and alien speed, and
+are handled by consts.py. The fourth argument is the number of frames to
+simulate.
+"""
+import os
+os.environ.setdefault('KIVY_NO_ARGS', '1')
+
+from kivy.config import Config
+Config.set('graphics', 'window_state', 'hidden')
+
+from consts import *
+from game2d import *
+from wave import *
+import time
+
+
+# The default number of frames to simulate
+SIM_FRAMES = 10000
+# The fixed time step (in seconds) of a single simulated frame
+SIM_DT     = 1/60
+# The default key script: sweep right and left while firing
+SIM_SCRIPT = ((('right', 'up'),)*40) + ((('left', 'up'),)*40)
+
+
+class ScriptedInput(object):
+    """
+    A stand-in for GInput that replays a scripted sequence of key states.
+
+    The script is a sequence of frames, where each frame is a tuple of the
+    names of the keys held down during that frame. The script loops when it
+    reaches the end. Wave only ever asks is_key_down, so that is the only
+    query this class needs to answer.
+    """
+    # HIDDEN ATTRIBUTES:
+    # Attribute _script: the key states for each frame
+    # Invariant: _script is a non-empty tuple of tuples of strings
+    #
+    # Attribute _frame: the index of the current frame in the script
+    # Invariant: _frame is an int >= 0 and < len(_script)
+
+    def __init__(self, script=SIM_SCRIPT):
+        """
+        Initializes the scripted input at the start of its script
+
+        Parameter script: the key states for each frame
+        Precondition: script is a non-empty sequence of tuples of strings
+        """
+        assert len(script) > 0, repr(script)+' is an empty script'
+        self._script = tuple(tuple(keys) for keys in script)
+        self._frame = 0
+
+    def is_key_down(self, key):
+        """
+        Returns True if key is held down this frame, otherwise returns False
+
+        If key is the empty string, returns True if any key is held down.
+
+        Parameter key: the key to test
+        Precondition: key is a string
+        """
+        keys = self._script[self._frame]
+        if key != '':
+            return key in keys
+        return len(keys) > 0
+
+    def advance(self):
+        """
+        Moves the script forward one frame, looping at the end
+        """
+        self._frame = (self._frame + 1) % len(self._script)
+
+
+def _setpaths():
+    """
+    Sets the GameApp resource paths to the application directory.
+
+    This mirrors GameApp._setpaths, which we cannot use because we never
+    construct the application.
+    """
+    import kivy.resources
+    path = os.path.dirname(os.path.abspath(__file__))
+    GameApp.json   = str(os.path.join(path, 'Data'))
+    GameApp.fonts  = str(os.path.join(path, 'Fonts'))
+    GameApp.sounds = str(os.path.join(path, 'Sounds'))
+    GameApp.images = str(os.path.join(path, 'Images'))
+    kivy.resources.resource_add_path(GameApp.fonts)
+    kivy.resources.resource_add_path(GameApp.sounds)
+    kivy.resources.resource_add_path(GameApp.images)
+
+
+def simulate(frames=SIM_FRAMES, dt=SIM_DT, script=SIM_SCRIPT):
+    """
+    Returns a dictionary of statistics after simulating the given frames.
+
+    The simulation plays waves back to back. When the ship is destroyed it is
+    replaced immediately (like STATE_CONTINUE in Invaders), and when a wave is
+    cleared or the aliens cross the defense line a new wave is started. The
+    dictionary has the keys 'frames', 'seconds', 'fps', 'waves', 'deaths',
+    and the bolt pool counters 'poolhits' and 'poolmisses'.
+
+    Parameter frames: the number of frames to simulate
+    Precondition: frames is an int > 0
+
+    Parameter dt: the fixed time step of a single frame
+    Precondition: dt is a number (int or float) >= 0
+
+    Parameter script: the key states for each frame
+    Precondition: script is a non-empty sequence of tuples of strings
+    """
+    assert type(frames) == int and frames > 0, repr(frames)+' is not valid'
+    _setpaths()
+    input = ScriptedInput(script)
+    waves = 1
+    deaths = 0
+    wave = Wave(waveNumber = waves, lives = SHIP_LIVES, score = 0)
+
+    start = time.perf_counter()
+    for frame in range(frames):
+        wave.update(input = input, dt = dt)
+        input.advance()
+        if wave.getShip() == None:
+            deaths = deaths + 1
+            wave.setShip(Ship())
+        if wave.getAliens().isEmpty() or \
+                                Wave.aliens_below_line(wave.getAliens()):
+            waves = waves + 1
+            wave = Wave(waveNumber = waves, lives = SHIP_LIVES, \
+                                                    score = wave.getScore())
+    seconds = time.perf_counter() - start
+
+    return {'frames': frames, 'seconds': seconds, 'fps': frames/seconds,
+            'waves': waves, 'deaths': deaths,
+            'poolhits': Wave.BOLT_POOL.getHits(),
+            'poolmisses': Wave.BOLT_POOL.getMisses()}
+
+
+# Application code
+if __name__ == '__main__':
+    import sys
+    try:
+        frames = int(sys.argv[4])
+    except:
+        frames = SIM_FRAMES # Use default value
+    stats = simulate(frames)
+    print('%d frames in %.3fs: %.1f fps (%d waves, %d deaths)' % \
+            (stats['frames'], stats['seconds'], stats['fps'], stats['waves'],
+                                                            stats['deaths']))
+    print('bolt pool: %d hits, %d misses' % \
+                                (stats['poolhits'], stats['poolmisses']))
@@ -49,16 +49,24 @@ class Wave(object):
     Only add the getters and setters that you need for Invaders. You can keep
     everything else hidden.
 
+    Bolts are acquired from and released to the pool BOLT_POOL, which is
+    shared by every wave so that bolts are recycled from one wave to the next.
     """
+    # Class attribute for recycling bolts (to reduce allocation during firing)
+    BOLT_POOL = BoltPool(BOLT_POOL_CAP)
+
     # HIDDEN ATTRIBUTES:
     # Attribute _ship: the player ship to control
     # Invariant: _ship is a Ship object or None
     #
-    # Attribute _aliens: the 2d list of aliens in the wave
-    # Invariant: _aliens is a rectangular 2d list containing Alien objects or None
+    # Attribute _shipX: the x-coordinate of the ship before the last update
+    # Invariant: _shipX is an int or float, or None if _ship is None
+    #
+    # Attribute _aliens: the formation of aliens in the wave
+    # Invariant: _aliens is a Formation object
     #
     # Attribute _bolts: the laser bolts currently on screen
-    # Invariant: _bolts is a list of Bolt objects, possibly empty
+    # Invariant: _bolts is a BoltArray object, possibly empty
     #
     # Attribute _dline: the defensive line being protected
     # Invariant : _dline is a GPath object
@@ -86,7 +94,8 @@ class Wave(object):
     # Invarient: _score is an int >= 0
     #
     # Attribute _scorelabel: the label for the score that goes on the screen
-    # Invarient: _scorelabel is a GLabel object
+    # Invarient: _scorelabel is a GBitmapLabel object, so changing the score
+    # only changes its text and does not render a new label
     #
     # You may change any attribute above, as long as you update the invariant
     # You may also add any new attributes as long as you document them.
@@ -104,13 +113,20 @@ class Wave(object):
         newship is a ship object
         """
         self._ship = newship
+        self._shipX = None if newship == None else newship.x
 
     def getAliens(self):
         """
-        return the 2D list of aliens
+        return the formation of aliens
         """
         return self._aliens
 
+    def getBolts(self):
+        """
+        returns the bolts on the screen
+        """
+        return self._bolts
+
     def getScore(self):
         """
         returns the players score"
@@ -135,7 +151,8 @@ class Wave(object):
         """
         self._scorelabel = newscorelabel
 
-    def __init__(self, waveNumber, lives, score):
+    def __init__(self, waveNumber, lives, score, rows=ALIEN_ROWS, \
+                                                    cols=ALIENS_IN_ROW):
         """
         Initializes each of the elements of the gmae
 
@@ -144,12 +161,19 @@ class Wave(object):
 
         Parameter lives: the number of lives the player has
         Precondition: lives is an integer >= 0 or <= 3
+
+        Parameter rows: the number of rows of aliens
+        Precondition: rows is an int > 0
+
+        Parameter cols: the number of aliens in each row
+        Precondition: cols is an int > 0
         """
         self._time = 0
-        self._bolts = []
-        self._aliens = self.init_helper()
+        self._bolts = BoltArray(Wave.BOLT_POOL)
+        self._aliens = Formation(rows, cols)
         self._counter = 0
         self._ship = Ship()
+        self._shipX = self._ship.x
         self._dline = GPath(points = [0,DEFENSE_LINE,GAME_WIDTH,DEFENSE_LINE],\
                                             linewidth = 2, linecolor= 'black')
         self._stepsToBolt = random.randint(1, BOLT_RATE)
@@ -157,58 +181,38 @@ class Wave(object):
         self._lives = lives
         self._speed = ALIEN_SPEED*(0.75)**(waveNumber-1)
         self._score = score
-        self._scorelabel = GLabel(text="Score: "+ str(self._score),\
+        self._scorelabel = GBitmapLabel(text="Score: "+ str(self._score),\
             font_size=30, font_name = 'Arcade.ttf', x=80, y=GAME_HEIGHT - 80)
 
-    def init_helper(self, row=ALIEN_ROWS, col=ALIENS_IN_ROW):
-        """
-        Creates a 2D list of aliens
-
-        Parameter row: the number of rows in the list
-        Precondition: row is an int > 0
-
-        Parameter col: the number of collumns in the list
-        Precondition: col is an int > 0
-        """
-        answer = []
-        for r in range(row):
-            rowanswer = []
-            yval = GAME_HEIGHT-(ALIEN_CEILING+(r+1/2)*\
-                        (ALIEN_HEIGHT)+r*(ALIEN_V_SEP))
-            for c in range(col):
-                xval = (ALIEN_H_SEP)*(c+1)+(ALIEN_WIDTH)*(c+1/2)
-                if r%6==1 or r%6==2:
-                    rowanswer.append(Alien(xval, yval, ALIEN_IMAGES[1]))
-                elif r%6==3 or r%6==4:
-                    rowanswer.append(Alien(xval, yval, ALIEN_IMAGES[2]))
-                elif r%6==5 or r%6==0:
-                    rowanswer.append(Alien(xval, yval, ALIEN_IMAGES[0]))
-            answer.append(rowanswer)
-        return answer
-
     def update(self, input, dt=0):
         """
         Gets called each animation frame to update all of the elements on the
         screen
 
+        The ship and the bolts move SHIP_MOVEMENT and BOLT_SPEED pixels for
+        every 1/MOVE_RATE seconds of dt, so the game plays at the same speed
+        no matter how often it is updated.
+
         Parameter input: used to detect what button a player presses
         Precondition: input is a GInput object
 
         Parameter dt: The time in seconds since last update
         Precondition: dt is a number (int or float)
         """
+        scale = dt*MOVE_RATE
         #moves the ship
+        if self._ship != None:
+            self._shipX = self._ship.x
         if input.is_key_down('left') and self._ship != None:
             if self._ship.x >= SHIP_WIDTH/2:
-                self._ship.x= self._ship.x - SHIP_MOVEMENT
+                self._ship.x= self._ship.x - SHIP_MOVEMENT*scale
         if input.is_key_down('right') and self._ship != None:
             if self._ship.x <= GAME_WIDTH-SHIP_WIDTH/2:
-                self._ship.x= self._ship.x + SHIP_MOVEMENT
+                self._ship.x= self._ship.x + SHIP_MOVEMENT*scale
         #keeps track of the time
         self._time = self._time + dt
         #moves the aliens
-        self._aliens = Wave.aliensGone(self._aliens)
-        if self._time > self._speed and len(self._aliens) != 0 and \
+        if self._time > self._speed and not self._aliens.isEmpty() and \
                             not Wave.aliens_below_line(self._aliens):
             if self._counter%4 == 0:
                 self._move_alien_right()
@@ -218,16 +222,15 @@ class Wave(object):
                 self._move_alien_left()
         #shoots a bolt if up arrow is pressed
         if input.is_key_down('up') and self._ship != None:
-            if Wave._numPlayerBolts(self._bolts) == 0:
-                newbolt = Bolt(xi = self._ship.x, yi = SHIP_BOTTOM+SHIP_HEIGHT,\
-                                    widthi = BOLT_WIDTH, heighti = BOLT_HEIGHT)
-                self._bolts.append(newbolt)
+            if self._bolts.count(BOLT_PLAYER) == 0:
+                self._bolts.fire(self._ship.x, SHIP_BOTTOM+SHIP_HEIGHT, \
+                                                    BOLT_SPEED, BOLT_PLAYER)
         #updates to check for collisions and moves bolts
-        if len(self._bolts) > 0:
-            self._moveBolt()
+        if self._bolts.getSize() > 0:
+            self._bolts.move(scale)
             self._checkAlienCollision()
             if Wave._checkShipCollision(ship = self._ship,\
-                boltlist = self._bolts, lives= self._lives):
+                bolts = self._bolts, lives= self._lives):
                 self._ship = None
                 self._lives = self._lives-1
         #causes aliens to shoot bolts
@@ -237,23 +240,23 @@ class Wave(object):
         """
         causes an alien to shoot
         """
-        if self._numSteps == self._stepsToBolt:
-            newbolt = Wave._randAlien(self._aliens)
-            self._bolts.append(newbolt)
+        if self._numSteps == self._stepsToBolt and \
+                                            not self._aliens.isEmpty():
+            x, y = Wave._randAlien(self._aliens)
+            self._bolts.fire(x, y, -BOLT_SPEED, BOLT_ALIEN)
             self._numSteps = 0
             self._stepsToBolt = random.randint(1, BOLT_RATE)
 
-    def aliens_below_line(alienlist):
+    def aliens_below_line(formation):
         """
         returns True if the aliens pass the line, otherwise returns False
 
-        Parameter alienlist: the list of aliens to be checked
-        Precondition: alienlist is a 2D list of Alien objects or None if the
-        alien has been deleted
+        Parameter formation: the formation of aliens to be checked
+        Precondition: formation is a Formation object
         """
-        bottomRow = Wave._alien_bottom_row(alienlist)
-        alien = Wave._alien_from_row(bottomRow)
-        if (alien.y - ALIEN_HEIGHT/2) < DEFENSE_LINE:
+        if formation.isEmpty():
+            return False
+        if (formation.getMinY() - ALIEN_HEIGHT/2) < DEFENSE_LINE:
             return True
         return False
 
@@ -262,15 +265,9 @@ class Wave(object):
         """
         A method that moves all of the aliens to the right
         """
-        # rightAlien = Wave.pickRightEdge(self._aliens)
-        rightAlien = Wave._alien_from_right_col(self._aliens)
-        if rightAlien.x < (GAME_WIDTH-ALIEN_H_SEP-ALIEN_WIDTH):
-            for row in range(ALIEN_ROWS):
-                for alien in range(ALIENS_IN_ROW):
-                    curalien = self._aliens[row][alien]
-                    if not curalien == None:
-                        curalien.x = curalien.x + ALIEN_H_SEP
-                    self._time = 0
+        if self._aliens.getMaxX() < (GAME_WIDTH-ALIEN_H_SEP-ALIEN_WIDTH):
+            self._aliens.step(ALIEN_H_SEP, 0)
+            self._time = 0
             self._numSteps = self._numSteps + 1
         else:
             self._counter = self._counter + 1
@@ -279,15 +276,9 @@ class Wave(object):
         """
         A method that moves all of the aliens to the left
         """
-        # leftAlien = Wave.pickLeftEdge(self._aliens)
-        leftAlien = Wave._alien_from_left_col(self._aliens)
-        if leftAlien.x > (ALIEN_H_SEP + (ALIEN_WIDTH)):
-            for row in range(ALIEN_ROWS):
-                for alien in range(ALIENS_IN_ROW):
-                    curalien = self._aliens[row][alien]
-                    if not curalien == None:
-                        curalien.x = curalien.x - ALIEN_H_SEP
-                    self._time = 0
+        if self._aliens.getMinX() > (ALIEN_H_SEP + (ALIEN_WIDTH)):
+            self._aliens.step(-ALIEN_H_SEP, 0)
+            self._time = 0
             self._numSteps = self._numSteps + 1
         else:
             self._counter = self._counter + 1
@@ -296,36 +287,19 @@ class Wave(object):
         """
         A method that moves all of the aliens down
         """
-        for row in range(ALIEN_ROWS):
-            for alien in range(ALIENS_IN_ROW):
-                curalien = self._aliens[row][alien]
-                if not curalien == None:
-                    curalien.y = curalien.y - ALIEN_V_SEP
-                self._time = 0
+        self._aliens.step(0, -ALIEN_V_SEP)
+        self._time = 0
         self._numSteps = self._numSteps + 1
         self._counter = self._counter + 1
 
-    def _moveBolt(self):
-        """
-        Moves all the bolts and deletes them when they go off the screen
-        """
-        #moves each ship bolt up
-        for bolt in range(len(self._bolts)):
-            self._bolts[bolt].y = self._bolts[bolt].y + \
-                            self._bolts[bolt]._velocity
-        #deletes a bolt when it goes off the screen
-        i = 0
-        while i < len(self._bolts):
-            if (self._bolts[i].y - BOLT_HEIGHT/2) > GAME_HEIGHT or\
-                            (self._bolts[i].y + BOLT_HEIGHT/2) < 0:
-                del self._bolts[i]
-            else:
-                i += 1
-
-    def draw(self, view):
+    def draw(self, view, alpha=1.0):
         """
         Draws a single wave and the ship.
 
+        The ship and the bolts are drawn alpha of the way from where they were
+        before the last update to where they are now. The aliens march in
+        whole steps, so they are always drawn where they are.
+
         Many of the GObjects (such as the ships, aliens, and bolts) are
         attributes in Wave. In order to draw them, you either need to add
         getters for these attributes or you need to add a draw method to
@@ -334,268 +308,74 @@ class Wave(object):
 
         Parameter view: the game view, used in drawing
         Invariant: view is an instance of GView (inherited from GameApp)
+
+        Parameter alpha: how far to draw between the last two updates
+        Precondition: alpha is an int or float >= 0 and <= 1
         """
-        for row in range(ALIEN_ROWS):
-            for alien in range(ALIENS_IN_ROW):
-                if not self._aliens[row][alien] == None:
-                    self._aliens[row][alien].draw(view)
+        self._aliens.draw(view)
         if not self._ship == None:
-            self._ship.draw(view)
+            dx = (self._shipX - self._ship.x)*(1-alpha)
+            self._ship.draw_shifted(view, dx, 0)
         self._dline.draw(view)
-        for i in range(len(self._bolts)):
-            self._bolts[i].draw(view)
+        self._bolts.draw(view, alpha)
 
     # HELPER METHODS FOR COLLISION DETECTION
-    def _isPlayerBolt(objbolt):
+    def _randAlien(formation):
         """
-        checks a bolt to see if it has come from the ship
-
-        Parameter objbolt: the bolt that is being checked
-        Precondition: objbolt is a Bolt object
-        """
-        if objbolt._velocity > 0:
-            return True
-        return False
+        chooses a random alien from the bottom of a collumn of formation and
+        returns the (x, y) position where its bullet starts
 
-    def _numPlayerBolts(boltlist):
+        Parameter formation: the formation of aliens to choose from
+        Precondition: formation is a Formation object with at least one alien
         """
-        Returns the number of bolts that exist in the boltlist
+        #causes an alien to shoot a bolt
+        randomcollumn = random.randint (0, formation.getCols()-1)
+        while not formation.isColAlive(randomcollumn):
+            randomcollumn = random.randint (0, formation.getCols()-1)
+        x, y = formation.getLowest(randomcollumn)
+        return (x, y - ALIEN_HEIGHT)
 
-        Parameter boltlist: the boltlist that will be checked
-        Precondition: boltlist is a list of Bolt objects
+    def _checkAlienCollision(self):
         """
-        num = 0
-        for bolt in range(len(boltlist)):
-            if Wave._isPlayerBolt(boltlist[bolt]):
-                num = num + 1
-        return num
-
-    def _randAlien(alienlist):
+        checks the player bolts for a collision with an alien. If there is one,
+        it deletes the alien and bolt involved and returns true to stop the loop
         """
-        chooses a random alien from the bottom row of alienlist and causes it to
-        fire a bullet
+        for (aBolt, x, y) in self._bolts.getPositions(BOLT_PLAYER):
+            hit = self._aliens.collide(x, y)
+            if hit != None:
+                row, col = hit
+                self._bolts.remove(aBolt)
+                if self._aliens.getSource(row, col) == ALIEN_IMAGES[0]:
+                    self._score = self._score + 30
+                elif self._aliens.getSource(row, col) == ALIEN_IMAGES[1]:
+                    self._score = self._score + 20
+                else:
+                    self._score = self._score + 10
+                self._scorelabel.text = "Score: "+ str(self._score)
+                self._aliens.kill(row, col)
+                return True
 
-        Parameter alienlist: a list of aliens to choose from
-        Precondition: alienlist is a 2D list of Alien objects or None is the
-        alien has been deleted
+    def _checkShipCollision(ship, bolts, lives):
         """
-        #causes an alien to shoot a bolt
-        randomcollumn = random.randint (0, ALIENS_IN_ROW-1)
-        while alienlist[0][randomcollumn] == None:
-            randomcollumn = random.randint (0, ALIENS_IN_ROW-1)
-        randomAlien = alienlist[ALIEN_ROWS-1][randomcollumn]
-        x = 2
-        while randomAlien == None:
-            randomAlien = alienlist[ALIEN_ROWS-x][randomcollumn]
-            x = x + 1
-        newbolt = Bolt(xi = randomAlien.x, yi = randomAlien.y - ALIEN_HEIGHT,\
-                widthi = BOLT_WIDTH, heighti = BOLT_HEIGHT, fillcolori = 'red')
-        newbolt._velocity = -BOLT_SPEED
-        return newbolt
+        returns True when an alien bolt collides with the ship
 
-    def _checkAlienCollision(self):
-        """
-        takes in an alien list and checks for a collision. If there is one, it
-        deletes the alien and bolt involved and returns true to stop the loop
-
-        Parameter alienlist: the list of aliens to be checked
-        Precondition: alienlist is a 2D list of Alien objects or None if the
-        alien has been deleted
-
-        Parameter boltlist: the list of bolts to check from
-        Precondition: boltlist is a list of Bolt objects
-        """
-        for aBolt in range(len(self._bolts)):
-            for row in range(ALIEN_ROWS):
-                for col in range(ALIENS_IN_ROW):
-                    if not (self._aliens[row][col] == None):
-                        if Wave._isPlayerBolt(self._bolts[aBolt]):
-                            if self._aliens[row][col].collidesAlien(self._bolts\
-                                                                    [aBolt]):
-                                del self._bolts[aBolt]
-                                if self._aliens[row][col].source == ALIEN_IMAGES[0]:
-                                    self._score = self._score + 30
-                                    self._scorelabel = GLabel(text="Score: "+\
-                                     str(self._score),font_size=30, font_name =\
-                                     'Arcade.ttf', x=80, y=GAME_HEIGHT - 80)
-                                elif self._aliens[row][col].source == \
-                                                        ALIEN_IMAGES[1]:
-                                    self._score = self._score +20
-                                    self._scorelabel = GLabel(text="Score: "+\
-                                     str(self._score),font_size=30, font_name =\
-                                      'Arcade.ttf', x=80, y=GAME_HEIGHT - 80)
-                                else:
-                                    self._score = self._score + 10
-                                    self._scorelabel = GLabel(text="Score: "+\
-                                     str(self._score),font_size=30, font_name =\
-                                      'Arcade.ttf', x=80, y=GAME_HEIGHT - 80)
-                                self._aliens[row][col] = None
-                                return True
-
-    def _checkShipCollision(ship, boltlist, lives):
-        """
-        returns True when a bolt collides with the ship
+        All of the alien bolts are tested against the ship at once. A bolt
+        hits if one of its corners is in the ship.
 
         Parameter ship: the players ship
-        Precondition: ship is a Ship() object
+        Precondition: ship is a Ship() object or None
 
-        Parameter boltlist: the list of bolts to check
-        Precondition: boltlist is a list of Bolt objects
+        Parameter bolts: the bolts to check
+        Precondition: bolts is a BoltArray object
 
         Parameter lives: the number of lives the player has left
         Precondition: lives is an int >= 0 and <= 3
         """
-        for aBolt in range(len(boltlist)):
-            if ship != None:
-                if ship.collidesShip(boltlist[aBolt]):
-                    del boltlist[aBolt]
-                    if lives > 0:
-                        lives = lives - 1
-                    return True
-
-    def _lowest_aliens(alienlist):
-        """
-        returns a 1D list of the lowest aliens in each non-empty collumn
-
-        Parameter alienlist: the list of aliens to be checked
-        Precondition: alienlist is a 2D list of Alien objects or None if the
-        alien has been deleted
-        """
-        answer = []
-        for col in range(ALIENS_IN_ROW):
-            i = col + 1
-            for row in range(ALIEN_ROWS):
-                if alienlist[row][-i] != None:
-                    answer.append(alienlist[row][-i])
-
-#Helper functions to find the rightmost and leftmost collumns
-    def _alienColList(alienlist):
-        """
-        returns a list of 0's and 1's. A 0 means there are no aliens left in the
-        collumn
-
-        Parameter alienlist: the list of aliens to be checked
-        Precondition: alienlist is a 2D list of Alien objects or None if the
-        alien has been deleted
-        """
-        collumns = []
-        for col in range(ALIENS_IN_ROW):
-            x = 0
-            for row in range(ALIEN_ROWS):
-                if alienlist[row][col] != None:
-                    x = x + 1
-            if x != 0:
-                collumns.append(1)
-            else:
-                collumns.append(0)
-        return collumns
-
-    def _aliens_left_collumn(alienlist):
-        """
-        find the number of the collumn of aliens furthest to the left
-
-        Parameter alienlist: the list of aliens to be checked
-        Precondition: alienlist is a 2D list of Alien objects or None if the
-        alien has been deleted
-        """
-        collumns = Wave._alienColList(alienlist)
-        for x in range(len(collumns)):
-            if collumns[x] == 1:
-                return x
-
-    def _aliens_right_collumn(alienlist):
-        """
-        returns the number of the rightmost collumn that has at least one Alien
-        object. If the collums started with the number 1 from the rightmost
-        collumn and counted up as you move left.
-
-        Parameter alienlist: the list of aliens to be checked
-        Precondition: alienlist is a 2D list of Alien objects or None if the
-        alien has been deleted
-        """
-        collumns = Wave._alienColList(alienlist)
-        for x in range(len(collumns)):
-            x = x + 1
-            if collumns[-x] == 1:
-                return x
-
-    def _alien_from_left_col(alienlist):
-        """
-        returns an Alien from the leftmost collumn. Used to see if the alien
-        wave reaches the edge of the screen
-
-        Parameter alienlist: the list of aliens to be checked
-        Precondition: alienlist is a 2D list of Alien objects or None if the
-        alien has been deleted
-        """
-        for row in range(ALIEN_ROWS):
-            col = Wave._aliens_left_collumn(alienlist)
-            if alienlist[row][col] != None:
-                return alienlist[row][col]
-
-    def _alien_from_right_col(alienlist):
-        """
-        returns an Alien from the rightmost collumn. Used to see if the alien
-        wave reaches the edge of the screen
-
-        Parameter alienlist: the list of aliens to be checked
-        Precondition: alienlist is a 2D list of Alien objects or None if the
-        alien has been deleted
-        """
-        for row in range(ALIEN_ROWS):
-            col = Wave._aliens_right_collumn(alienlist)
-            if alienlist[row][-col] != None:
-                return alienlist[row][-col]
-
-    def aliensGone(alienlist):
-        """
-        returns an empty list if all of the aliens have been set to None,
-        otherwise returns the given list
-
-        Parameter alienlist: the list of aliens to be checked
-        Precondition: alienlist is a 2D list of Alien objects or None if the
-        alien has been deleted
-        """
-        for row in range(ALIEN_ROWS):
-            for col in range(ALIENS_IN_ROW):
-                if alienlist[row][col] != None:
-                    return alienlist
-        return []
-#Helper methods to find the bottom row
-
-    def _alien_row_empty(alienrow):
-        """
-        returns True if all aliens in a row are None
-
-        Parameter alienrow: The alien row to be examined
-        Precondition: alienrow is a list of aliens
-        """
-        for x in alienrow:
-            if x != None:
-                return False
-        return True
-
-    def _alien_bottom_row(alienlist):
-        """
-        returns the bottom row of the alien list that has at least one alien
-
-        Parameter alienlist: the list of aliens to be checked
-        Precondition: alienlist is a 2D list of Alien objects or None if the
-        alien has been deleted
-        """
-        x = ALIEN_ROWS-1
-        while Wave._alien_row_empty(alienlist[x]):
-            x = x - 1
-        return alienlist[x]
-
-    def _alien_from_row(alienrow):
-        """
-        returns the first non-None Alien object in a row
-
-        Parameter alienrow: The alien row to be examined
-        Precondition: alienrow is a list of aliens
-        """
-        x = 0
-        while alienrow[x] == None:
-            x = x + 1
-        return alienrow[x]
+        if ship != None:
+            aBolt = bolts.findHit(ship.x, ship.y, SHIP_WIDTH, SHIP_HEIGHT, \
+                                                                BOLT_ALIEN)
+            if aBolt != None:
+                bolts.remove(aBolt)
+                if lives > 0:
+                    lives = lives - 1
+                return True